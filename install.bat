@@ -26,6 +26,19 @@ if errorlevel 1 (
     pip install --user pillow
 )
 
+:: Generar el atlas de sprites (assets/atlas) para acelerar los cambios de estado
+echo Generando atlas de sprites...
+python -m modules.sprite_atlas
+
+:: Empaquetar assets/ en un unico archivo (assets.pack) para leerlo con mmap
+echo Empaquetando recursos...
+python -m modules.asset_pack
+
+:: Convertir los sonidos a WAV normalizado (.cache/audio); si no hay miniaudio
+:: ni ffmpeg se omite con un aviso y el juego usa los originales
+echo Convirtiendo sonidos a WAV...
+python -m modules.audio_cache
+
 echo.
 echo ==========================================
 echo    + Instalacion completada
@@ -27,6 +27,19 @@ else
     pip3 install --user pillow
 fi
 
+# Generar el atlas de sprites (assets/atlas) para acelerar los cambios de estado
+echo "Generando atlas de sprites..."
+python3 -m modules.sprite_atlas
+
+# Empaquetar assets/ en un único archivo (assets.pack) para leerlo con mmap
+echo "Empaquetando recursos..."
+python3 -m modules.asset_pack
+
+# Convertir los sonidos a WAV normalizado (.cache/audio); si no hay miniaudio
+# ni ffmpeg se omite con un aviso y el juego usa los originales
+echo "Convirtiendo sonidos a WAV..."
+python3 -m modules.audio_cache
+
 echo ""
 echo "=========================================="
 echo "   + Instalación completada"
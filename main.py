@@ -6,8 +6,24 @@ import threading
 import os
 import json
 import math
+from typing import Optional
 from modules.config import *
+from modules.animation_clock import animation_clock
 from modules.roulette import Roulette
+from modules.image_cache import image_cache
+from modules.backgrounds import background_service, victory_background_paths, DEFAULT_BRIGHTNESS
+from modules.prewarm import IdlePrewarmer
+from modules.sprite_atlas import SPRITES_DIR, SpriteAtlas, find_sprite_sources
+from modules.asset_manifest import asset_manifest, IMAGE_EXTENSIONS
+from modules.disk_cache import load_frames
+from modules.gif_animator import GifAnimator
+from modules.sprite_prefetch import SpritePrefetcher
+from modules.startup_loader import StartupLoader
+from modules import tk_bridge
+from modules.tk_sprites import DECODERS, load_tk_frames, sprite_decoder
+from modules.frame_store import pack_frames, tk_frames
+from modules.sprite_watcher import SpriteWatcher
+from modules.transitions import render_crossfade
 from minigames.math_quiz import MathQuiz
 from minigames.memory_game import MemoryGame
 from minigames.stroop_game import StroopGame
@@ -36,136 +52,22 @@ from minigames.blackjack_game import BlackjackGame
 import webbrowser
 import threading
 import os
-try:
-    # playsound es una librería sencilla para reproducir clips de audio. Si no
-    # está disponible, los sonidos simplemente no se reproducen.
-    from playsound import playsound  # type: ignore
-except Exception:
-    playsound = None
-
-
-# Utilidad de reproducción de audio.
-
-# Implementación simple para reproducir sonido en varias plataformas sin abrir
-# un reproductor gráfico.  Esta función intenta usar bibliotecas o
-# utilidades del sistema para reproducir archivos de audio de forma
-# asíncrona.  Es una alternativa a la librería ``playsound`` cuando esta no
-# está disponible.
-def simple_play_sound(file_path: str) -> None:
-    import platform
-    import subprocess
-    import os
-    system = platform.system()
-    try:
-        if system == 'Windows':
-            # En Windows, usa winsound para WAV y la API MCI para otros
-            ext = os.path.splitext(file_path)[1].lower()
-            try:
-                import winsound  # type: ignore
-                if ext == '.wav':
-                    winsound.PlaySound(file_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
-                    return
-            except Exception:
-                pass
-            # Para otros formatos (MP3, OGG, etc.), utiliza mciSendString
-            try:
-                import ctypes
-                from ctypes import wintypes  # type: ignore
-                # Construir comando open.  Utiliza alias único para evitar
-                # conflictos; se usa el nombre base del archivo como alias.
-                alias = 'media'
-                # Cerrar previamente cualquier alias con el mismo nombre
-                try:
-                    ctypes.windll.winmm.mciSendStringW(f'close {alias}', None, 0, None)
-                except Exception:
-                    pass
-                cmd_open = f'open "{file_path}" alias {alias}'
-                ctypes.windll.winmm.mciSendStringW(cmd_open, None, 0, None)
-                # Reproducir desde el principio de forma asíncrona
-                cmd_play = f'play {alias} from 0'
-                ctypes.windll.winmm.mciSendStringW(cmd_play, None, 0, None)
-                return
-            except Exception:
-                pass
-        elif system == 'Darwin':
-            # macOS incluye afplay para reproducir audio
-            subprocess.Popen(['afplay', file_path])
-            return
-        else:
-            # En sistemas Linux se puede utilizar aplay o paplay
-            # Intentar con aplay primero
-            try:
-                subprocess.Popen(['aplay', file_path])
-                return
-            except FileNotFoundError:
-                pass
-            # Intentar con paplay si aplay no existe
-            try:
-                subprocess.Popen(['paplay', file_path])
-                return
-            except FileNotFoundError:
-                pass
-    except Exception:
-        pass
-    # Si todo falla, no hacemos nada.  El llamador puede intentar con
-    # métodos alternativos o abrir el archivo en un reproductor.
-    return
-# Busca archivos con extensión .mp3, .wav u .ogg en la carpeta indicada y
-# reproduce uno al azar en un hilo aparte. Si no hay archivos o no está
-# disponible la biblioteca playsound, la función no hace nada.
+from modules.audio import audio_service
+from modules.mixer import mixer
+from modules.process_pool import process_pool
+
+
+# Reproduce un sonido al azar de la carpeta indicada a través del servicio
+# de audio compartido (modules/audio.py), que tiene su propio hilo, limita
+# las voces simultáneas y agrupa las peticiones repetidas.
 def play_random_sound(folder: str) -> None:
     """
-    Reproduce un sonido aleatorio de una carpeta.  Se buscan archivos con
-    extensiones .mp3, .wav u .ogg.  Si la biblioteca playsound está
-    disponible, se utiliza para reproducir el sonido en un hilo
-    independiente.  En caso contrario, se intenta abrir el archivo
-    con el reproductor predeterminado del sistema operativo.
+    Reproduce un sonido aleatorio de una carpeta (.mp3, .wav u .ogg).  La
+    petición se encola en ``audio_service`` y la función vuelve al momento;
+    si no hay archivos o ningún reproductor disponible, no suena nada.
     """
     try:
-        # Determinar carpeta absoluta relativa a este archivo, si es relativa
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        full_folder = folder if os.path.isabs(folder) else os.path.join(base_dir, folder)
-        files = [f for f in os.listdir(full_folder) if f.lower().endswith((".mp3", ".wav", ".ogg"))]
-        if not files:
-            return
-        file_path = os.path.join(full_folder, random.choice(files))
-        def _play() -> None:
-            # Usar playsound si está disponible
-            # 1) Usar playsound si está disponible
-            if playsound is not None:
-                try:
-                    playsound(file_path)
-                    return
-                except Exception:
-                    pass
-            # 2) Usar nuestra implementación simple basada en utilidades del sistema
-            try:
-                simple_play_sound(file_path)
-                return
-            except Exception:
-                pass
-            # 3) Abrir el archivo con el reproductor predeterminado (sólo si las
-            # opciones anteriores fallan).  Esto puede abrir una ventana del
-            # navegador, pero sirve como último recurso.
-            try:
-                import subprocess
-                import sys
-                if sys.platform.startswith('win'):
-                    os.startfile(file_path)  # type: ignore[attr-defined]
-                elif sys.platform == 'darwin':
-                    subprocess.Popen(['open', file_path])
-                else:
-                    subprocess.Popen(['xdg-open', file_path])
-                return
-            except Exception:
-                pass
-            # 4) Último recurso: abrir en navegador
-            try:
-                import webbrowser
-                webbrowser.open('file://' + file_path)
-            except Exception:
-                pass
-        threading.Thread(target=_play, daemon=True).start()
+        audio_service.play_random(folder)
     except Exception:
         pass
 
@@ -178,9 +80,14 @@ except:
     HAS_PIL = False
     print("Pillow no instalado - usando sprite simple")
 
+# Umbrales de las estadísticas que separan los estados emocionales en
+# ``MiniDiego._get_emotional_state``.  Se usan para predecir a qué estados
+# puede pasar la mascota y precargar sus sprites.
+STATE_THRESHOLDS = (10, 30, 40, 60, 80, 90)
+
 class PetOverlay:
     """MASCOTA FLOTANTE que se sobrepone a TODO el sistema"""
-    def __init__(self, parent_app):
+    def __init__(self, parent_app, loader=None):
         self.app = parent_app
         self.window = tk.Toplevel()
         self.window.title("")
@@ -195,7 +102,7 @@ class PetOverlay:
         screen_height = self.window.winfo_screenheight()
         
         # Tamaño del sprite
-        self.size = 150
+        self.size = PET_SIZE
         
         # Posición inicial (centro de pantalla)
         x = screen_width // 2 - self.size // 2
@@ -207,13 +114,53 @@ class PetOverlay:
                                highlightthickness=0, width=self.size, height=self.size)
         self.canvas.pack()
 
-        # Atributos para animaciones GIF
-        self.gif_frames: list[ImageTk.PhotoImage] | None = None  # tipo: ignore
-        self.gif_index: int = 0
-        self.gif_animation_id: str | None = None
-        
-        # Cargar sprite
-        self.load_sprite()
+        # Animador de GIF: un único elemento de imagen en el canvas cuyo
+        # fotograma se cambia con ``itemconfig`` (ver modules/gif_animator.py)
+        self.animator = GifAnimator(self.canvas, self.size//2, self.size//2)
+
+        # Caché de fotogramas ya decodificados y reescalados, indexada por
+        # ("sprite", estado, tamaño).  Cambiar a un estado ya visto sólo
+        # requiere volver a dibujar el canvas, sin abrir ni reescalar el
+        # archivo.  Es la caché LRU compartida con los fondos, así que los
+        # estados que no se muestran desde hace tiempo se acaban descartando.
+        # Lo que está en pantalla se fija para que no se descarte mientras
+        # el animador lo sigue usando (ver ``_pin_shown``).
+        self.sprite_cache = image_cache
+        self._pinned_keys: list = []
+        self.current_state: str | None = None
+        # "pil" o "tk" (ver ``modules/tk_sprites.py``).  Con "tk" los sprites
+        # se leen con el lector de GIF de Tk en el hilo de Tk, sin atlas,
+        # precarga ni fundidos, que necesitan Pillow.
+        self.decoder = sprite_decoder()
+        # Cargador de arranque (ver ``modules/startup_loader.py``): los
+        # estados cuya decodificación inicial sigue en marcha, y el estado
+        # que se mostrará en cuanto llegue la suya
+        self.startup_loader = loader
+        self._startup_pending: set = set()
+        self.pending_state: str | None = None
+        # Atlas de sprites (ver ``modules/sprite_atlas.py``).  Si se ha
+        # generado, todos los estados se recortan de una única imagen que se
+        # carga una sola vez al arrancar (en el cargador de arranque, si lo hay).
+        self.atlas = SpriteAtlas.load(self.size) if self.decoder == "pil" and loader is None else None
+        # Precargador en segundo plano de los estados vecinos al actual (sólo
+        # con PIL: sin él las imágenes sólo pueden crearse en el hilo de Tk)
+        self.prefetcher = SpritePrefetcher(self._prepare_sprite_frames) if HAS_PIL else None
+        # Fundidos entre el estado actual y sus vecinos, preparados en otro
+        # hilo con la misma mecánica pero con claves (origen, destino)
+        self.transitions = (SpritePrefetcher(self._render_transition)
+                            if HAS_PIL and PET_TRANSITIONS else None)
+        # Recarga en caliente de los sprites modificados (ver
+        # ``modules/sprite_watcher.py``)
+        self.watcher = SpriteWatcher(self.window, self.reload_sprites)
+        if SPRITE_HOT_RELOAD:
+            self.watcher.start()
+        
+        # Cargar sprite: con cargador de arranque, la decodificación se hace
+        # en sus hilos y la ventana responde desde el principio
+        if self.startup_loader is not None and self.decoder == "pil":
+            self.queue_startup(self.startup_loader)
+        else:
+            self.load_sprite()
         
         # Hacer arrastrable
         self.canvas.bind("<Button-1>", self._start_drag)
@@ -226,114 +173,263 @@ class PetOverlay:
         """
         Carga un sprite según el estado emocional.
 
+        Los fotogramas se obtienen de ``self.sprite_cache``; sólo la primera
+        vez que se muestra un estado se decodifica el archivo (ver
+        ``_decode_sprite``).  El animador reproduce los fotogramas con la
+        duración propia de cada uno; si no existe ninguna imagen para el
+        estado se dibuja un sprite simple de colores.  Si ya hay preparado
+        un fundido desde el estado anterior, se reproduce antes.
+        """
+        self.pending_state = None
+        frames, delays = self._get_sprite_frames(state)
+        previous = self.current_state
+        self.current_state = state
+        self.canvas.delete("simple_sprite")
+        if frames:
+            clip = self._get_transition(previous, state)
+            shown = [("sprite", state, self.size)]
+            if clip:
+                shown.append(("transition", previous, state, self.size))
+                self.animator.play(*clip, then=lambda: self.animator.play(frames, delays))
+            else:
+                self.animator.play(frames, delays)
+            self._pin_shown(shown)
+        else:
+            self.animator.hide()
+            self._draw_simple_sprite(state)
+        if self.startup_loader is not None:
+            self.startup_loader.mark_first_frame()
+
+    def _pin_shown(self, keys: list) -> None:
+        """Fija en la caché las entradas de ``keys`` y suelta las mostradas antes."""
+        for key in keys:
+            self.sprite_cache.pin(key)
+        for key in self._pinned_keys:
+            if key not in keys:
+                self.sprite_cache.unpin(key)
+        self._pinned_keys = keys
+
+    def _get_sprite_frames(self, state: str) -> tuple:
+        """
+        Devuelve ``(fotogramas, duraciones)`` listos para el canvas de ``state``.
+
+        El resultado se guarda en la caché incluso cuando no existe sprite
+        (listas vacías), para no volver a sondear el disco en cada cambio.
+        Si el precargador ya decodificó el estado en segundo plano, aquí
+        sólo se crean los ``PhotoImage``.
+        """
+        key = ("sprite", state, self.size)
+        entry = self.sprite_cache.get(key)
+        if entry is None:
+            prefetched = self.prefetcher.take(state) if self.prefetcher and self.decoder == "pil" else None
+            if prefetched is not None:
+                frames, delays = prefetched
+                entry = tk_frames(frames), delays
+            else:
+                entry = self._decode_sprite(state)
+            self.sprite_cache.put(key, entry)
+        return entry
+
+    def prefetch_states(self, states) -> None:
+        """
+        Pide al precargador los estados indicados que aún no están en caché,
+        y los fundidos desde el estado actual hacia cada uno de ellos.
+        """
+        if self.prefetcher is None or self.decoder != "pil":
+            return
+        missing = [st for st in states if ("sprite", st, self.size) not in self.sprite_cache]
+        if missing:
+            self.prefetcher.request(missing)
+        current = self.current_state
+        if self.transitions is not None and current is not None and self._has_sprite(current):
+            pairs = [(current, st) for st in states
+                     if ("transition", current, st, self.size) not in self.sprite_cache
+                     and self._has_sprite(st)]
+            if pairs:
+                self.transitions.request(pairs)
+
+    def queue_startup(self, loader, state: str = "normal") -> None:
+        """
+        Encola en ``loader`` el atlas y los sprites de todos los estados,
+        ``state`` el primero.  ``state`` se muestra en cuanto llega, salvo
+        que para entonces se haya pedido otro (ver ``update_state``).
+        """
+        loader.add("atlas", lambda: SpriteAtlas.load(self.size), self._set_atlas)
+        states = [state] + [st for st in find_sprite_sources() if st != state]
+        self._startup_pending.update(states)
+        self.pending_state = state
+        for st in states:
+            loader.add(f"sprite {st}", lambda st=st: self._prepare_sprite_frames(st),
+                       lambda decoded, st=st: self._startup_sprite_ready(st, decoded))
+
+    def _set_atlas(self, atlas) -> None:
+        if self.atlas is None:
+            self.atlas = atlas
+
+    def _startup_sprite_ready(self, state: str, decoded: tuple) -> None:
+        self._startup_pending.discard(state)
+        self.warm_sprite(state, *decoded)
+        if state == self.pending_state:
+            self.load_sprite(state)
+
+    def warm_sprite(self, state: str, frames, delays: list) -> None:
+        """
+        Guarda en caché fotogramas ya decodificados fuera del hilo de Tk
+        (el resultado de ``_prepare_sprite_frames``).
+        """
+        key = ("sprite", state, self.size)
+        if self.decoder == "pil" and key not in self.sprite_cache:
+            self.sprite_cache.put(key, (tk_frames(frames), delays))
+
+    def set_sprite_decoder(self, name: str) -> None:
+        """
+        Cambia en caliente el decodificador de sprites (``"pil"``, ``"tk"``
+        o ``"auto"``): descarta los fotogramas en caché y vuelve a mostrar
+        el estado actual con el nuevo.
+        """
+        decoder = sprite_decoder(name)
+        if decoder == self.decoder:
+            return
+        self.decoder = decoder
+        self.sprite_cache.invalidate_where(lambda key: key[0] in ("sprite", "transition"))
+        if self.prefetcher is not None:
+            self.prefetcher.clear()
+        if self.transitions is not None:
+            self.transitions.clear()
+        print(f"Decodificador de sprites: {decoder}")
+        if self.current_state is not None:
+            self.load_sprite(self.current_state)
+
+    def _get_transition(self, src: Optional[str], dst: str):
+        """
+        Devuelve ``(fotogramas, duraciones)`` del fundido de ``src`` a
+        ``dst`` si ya está preparado, o ``None``.  Nunca se calcula aquí:
+        sólo se envuelven en ``PhotoImage`` los fotogramas ya mezclados.
+        """
+        if self.transitions is None or self.decoder != "pil" or src is None or src == dst:
+            return None
+        key = ("transition", src, dst, self.size)
+        entry = self.sprite_cache.get(key)
+        if entry is None:
+            ready = self.transitions.take((src, dst))
+            if ready is None:
+                return None
+            images, delays = ready
+            entry = [ImageTk.PhotoImage(img) for img in images], delays
+            self.sprite_cache.put(key, entry)
+        return entry
+
+    def _render_transition(self, pair: tuple) -> tuple:
+        """Mezcla los sprites de ``pair = (origen, destino)``; no toca Tk."""
+        src, _ = self._decode_sprite_images(pair[0])
+        dst, _ = self._decode_sprite_images(pair[1])
+        return render_crossfade(src, dst)
+
+    def _has_sprite(self, state: str) -> bool:
+        return (self.atlas is not None and state in self.atlas) or self._find_sprite_path(state) is not None
+
+    def reload_sprites(self, states) -> None:
+        """
+        Descarta los fotogramas de ``states`` (cuyos archivos han cambiado)
+        y los vuelve a decodificar en segundo plano.  Los demás estados
+        siguen en caché.  Si el estado visible está entre ellos, se vuelve a
+        mostrar en cuanto esté listo.
+        """
+        for state in states:
+            self.sprite_cache.invalidate(("sprite", state, self.size))
+            if self.atlas is not None:
+                self.atlas.discard(state)
+            if self.prefetcher is not None:
+                self.prefetcher.discard(state)
+        # Los fundidos en los que participan se vuelven a preparar al pedirlos
+        asset_manifest.rescan(SPRITES_DIR)
+        changed = set(states)
+        self.sprite_cache.invalidate_where(
+            lambda key: key[0] == "transition" and (key[1] in changed or key[2] in changed))
+        if self.transitions is not None:
+            self.transitions.clear()
+        print(f"Sprites recargados: {', '.join(states)}")
+        if self.prefetcher is not None and self.decoder == "pil":
+            self.prefetcher.request(states)
+        if self.current_state in states:
+            self._show_when_decoded(self.current_state)
+
+    def _show_when_decoded(self, state: str) -> None:
+        # Esperar sin bloquear a que el precargador termine con ``state``
+        if state != self.current_state:
+            return
+        if self.prefetcher is not None and self.prefetcher.is_pending(state):
+            self.window.after(50, lambda: self._show_when_decoded(state))
+            return
+        self.load_sprite(state)
+
+    def _find_sprite_path(self, state: str) -> Optional[str]:
+        """
+        Busca el archivo del sprite de ``state``.
+
         Se admite tanto PNG como GIF, e incluso JPEG.  El método
         busca primero un archivo con el nombre de estado y extensión
-        `.png`, luego `.gif`, `.jpg` o `.jpeg`.  Si encuentra uno,
-        intenta cargarlo con PIL (si está disponible) y redimensionarlo
-        al tamaño del sprite.  Si no existe ninguna imagen o se
-        produce un error al cargarla, se dibuja un sprite simple de
-        colores.
-
-        Para garantizar que los sprites se encuentren correctamente
-        independientemente del directorio de trabajo actual, se
-        construye la ruta a partir del directorio en el que se
-        encuentra este archivo (``main.py``).
+        `.png`, luego `.gif`, `.jpg` o `.jpeg`.  La consulta se
+        resuelve en el índice de recursos (``modules/asset_manifest.py``),
+        sin tocar el disco.
         """
-        self.canvas.delete("all")
-        # Construir lista de extensiones en orden de preferencia
-        exts = [".png", ".gif", ".jpg", ".jpeg"]
-        sprite_path = None
-        # Ruta base relativa a la ubicación de este archivo
-        try:
-            base_dir = os.path.dirname(os.path.abspath(__file__))
-        except Exception:
-            base_dir = os.getcwd()
-        sprites_dir = os.path.join(base_dir, "assets", "sprites")
-        for ext in exts:
-            path = os.path.join(sprites_dir, f"{state}{ext}")
-            if os.path.exists(path):
-                sprite_path = path
-                break
-        if sprite_path:
-            # Cancelar cualquier animación en curso
-            if self.gif_animation_id:
-                try:
-                    self.canvas.after_cancel(self.gif_animation_id)
-                except Exception:
-                    pass
-                self.gif_animation_id = None
-            # Si es un GIF y PIL está disponible, intenta animar
-            if sprite_path.lower().endswith('.gif') and HAS_PIL:
-                if self._start_gif_animation(sprite_path):
-                    return
-            # Si no es GIF o la animación falló, cargar imagen estática
-            if HAS_PIL:
-                try:
-                    img = Image.open(sprite_path)
-                    # usar sólo primer frame
-                    try:
-                        img.seek(0)
-                    except Exception:
-                        pass
-                    img = img.resize((self.size, self.size), Image.Resampling.LANCZOS)
-                    self.sprite_img = ImageTk.PhotoImage(img)
-                    self.sprite_id = self.canvas.create_image(
-                        self.size//2, self.size//2, image=self.sprite_img
-                    )
-                    return
-                except Exception as e:
-                    print(f"Error cargando {sprite_path}: {e}")
-            else:
-                # Intentar cargar con Tkinter directamente si PIL no está disponible
-                try:
-                    photo = tk.PhotoImage(file=sprite_path)
-                    self.sprite_img = photo
-                    self.sprite_id = self.canvas.create_image(
-                        self.size//2, self.size//2, image=self.sprite_img
-                    )
-                    return
-                except Exception:
-                    pass
-        # Si no se cargó ninguna imagen, dibujar sprite básico
-        self._draw_simple_sprite(state)
+        return asset_manifest.first(SPRITES_DIR, state, IMAGE_EXTENSIONS)
 
-    def _start_gif_animation(self, sprite_path: str) -> bool:
+    def _decode_sprite_images(self, state: str) -> tuple:
         """
-        Carga un archivo GIF y reproduce su animación en bucle.
-        Devuelve ``True`` si la animación se pudo iniciar y ``False`` en caso contrario.
+        Decodifica el sprite de ``state`` a imágenes PIL del tamaño de la
+        mascota.  No toca Tk, así que puede ejecutarse en otro hilo.
+
+        Si hay un atlas de sprites cargado y contiene el estado, los
+        fotogramas se recortan de él sin tocar el disco.  En caso contrario
+        se lee el archivo: los GIF conservan todos sus fotogramas y el
+        resto de formatos sólo el primero.  ``load_frames`` reutiliza los
+        píxeles ya reescalados en arranques anteriores (caché en disco).
+        Devuelve ``(imagenes, duraciones)``, con listas vacías si no existe
+        ninguna imagen o se produce un error al cargarla.
         """
+        if self.atlas is not None and state in self.atlas:
+            try:
+                return self.atlas.frames(state)
+            except Exception as e:
+                print(f"Error leyendo {state} del atlas: {e}")
+        sprite_path = self._find_sprite_path(state)
+        if not sprite_path:
+            return [], []
+        max_frames = None if sprite_path.lower().endswith('.gif') else 1
         try:
-            from PIL import Image, ImageTk, ImageSequence
-            img = Image.open(sprite_path)
-            frames: list[ImageTk.PhotoImage] = []
-            for frame in ImageSequence.Iterator(img):
-                f = frame.copy()
-                # Asegurarse de que la imagen tiene modo RGBA para soportar transparencias
-                try:
-                    f = f.convert('RGBA')
-                except Exception:
-                    pass
-                f = f.resize((self.size, self.size), Image.Resampling.LANCZOS)
-                frames.append(ImageTk.PhotoImage(f))
-            if not frames:
-                return False
-            self.gif_frames = frames
-            self.gif_index = 0
-            # Función interna de animación
-            def animate():
-                if self.gif_frames is None:
-                    return
-                self.canvas.delete("all")
-                frame = self.gif_frames[self.gif_index]
-                self.canvas.create_image(self.size//2, self.size//2, image=frame)
-                self.gif_index = (self.gif_index + 1) % len(self.gif_frames)
-                self.gif_animation_id = self.canvas.after(100, animate)
-            animate()
-            return True
+            return load_frames(sprite_path, (self.size, self.size), max_frames=max_frames)
         except Exception as e:
-            print(f"Error animando GIF {sprite_path}: {e}")
-            return False
-    
+            print(f"Error cargando {sprite_path}: {e}")
+            return [], []
+
+    def _prepare_sprite_frames(self, state: str) -> tuple:
+        """
+        ``_decode_sprite_images`` con los fotogramas ya empaquetados como
+        índices de paleta cuando es posible (ver ``modules/frame_store.py``).
+        No toca Tk.
+        """
+        images, delays = self._decode_sprite_images(state)
+        return pack_frames(images), delays
+
+    def _decode_sprite(self, state: str) -> tuple:
+        """
+        Decodifica el sprite de ``state`` y lo convierte en fotogramas Tk.
+        Devuelve ``(fotogramas, duraciones)``; si no hay imagen, listas vacías.
+        """
+        if self.decoder == "pil":
+            frames, delays = self._prepare_sprite_frames(state)
+            return tk_frames(frames), delays
+        # Lector nativo de Tk: GIF animados con todos sus fotogramas
+        sprite_path = self._find_sprite_path(state)
+        if sprite_path:
+            max_frames = None if sprite_path.lower().endswith('.gif') else 1
+            try:
+                return load_tk_frames(sprite_path, (self.size, self.size), max_frames, master=self.canvas)
+            except Exception as e:
+                print(f"Error cargando {sprite_path} con Tk: {e}")
+        return [], []
+
     def _draw_simple_sprite(self, state):
         """Dibuja sprite simple según el estado - SIN EMOTICONOS"""
         center = self.size // 2
@@ -366,7 +462,8 @@ class PetOverlay:
         
         self.canvas.create_rectangle(
             10, 10, self.size-10, self.size-10,
-            fill=config["color"], outline="white", width=4
+            fill=config["color"], outline="white", width=4,
+            tags="simple_sprite"
         )
         
         self.canvas.create_text(
@@ -374,11 +471,22 @@ class PetOverlay:
             text=config["text"],
             font=("Arial", 14, "bold"),
             fill=config["text_color"],
-            justify="center"
+            justify="center",
+            tags="simple_sprite"
         )
     
     def update_state(self, state):
-        """Actualiza el sprite según el estado"""
+        """
+        Actualiza el sprite según el estado.  Si el estado pedido es el que
+        ya se está mostrando no se hace nada: ``update_display`` llama a
+        este método en cada cambio de estadística.
+        """
+        if state == self.current_state:
+            return
+        if state in self._startup_pending:
+            # Su decodificación ya está en marcha en el cargador de arranque
+            self.pending_state = state
+            return
         self.load_sprite(state)
     
     def _start_drag(self, event):
@@ -525,8 +633,20 @@ class MiniDiego:
         # Guardamos la fecha del último día en que se reseteó la pausa (YYYY-MM-DD)
         self.pause_reset_date = time.strftime("%Y-%m-%d")
         
+        # Todas las animaciones comparten un único temporizador sobre la raíz
+        animation_clock.attach(self.root)
+        # Fondos con vista previa inmediata (ver modules/backgrounds.py)
+        background_service.attach(self.root)
+
+        # Decodificar en paralelo los sprites y el fondo del primer minijuego
+        # (ver modules/startup_loader.py)
+        self.startup_loader = StartupLoader(self.root) if HAS_PIL else None
+
         # Crear mascota flotante
-        self.pet_overlay = PetOverlay(self)
+        self.pet_overlay = PetOverlay(self, self.startup_loader)
+        if self.startup_loader is not None:
+            self._queue_startup_backgrounds()
+            self.startup_loader.start()
         
         # Minigames
         self.current_game = None
@@ -534,6 +654,14 @@ class MiniDiego:
         
         # Crear panel de control
         self.create_control_panel()
+
+        # Preparar imágenes en los ratos muertos (ver modules/prewarm.py)
+        self.prewarmer = IdlePrewarmer(
+            self.root, is_busy=lambda: bool(self.current_game or self.minigame_popup)
+        )
+        if PREWARM_ENABLED and HAS_PIL:
+            self._queue_prewarm_tasks()
+            self.prewarmer.start()
         
         # Iniciar threads
         threading.Thread(target=self._decay_loop, daemon=True).start()
@@ -551,6 +679,48 @@ class MiniDiego:
         self._sleep_ambient_thread = None
         self._sleep_ambient_stop = None
     
+    def _queue_startup_backgrounds(self):
+        """
+        Reserva el fondo del primer minijuego y lo prepara en el cargador de
+        arranque a cada tamaño de minijuego, ya que aún no se sabe cuál será.
+        """
+        path = background_service.reserve()
+        if not path:
+            return
+        for size in MINIGAME_BACKGROUND_SIZES:
+            key = background_service.cache_key(path, *size)
+            self.startup_loader.add(
+                f"fondo {size[0]}x{size[1]}",
+                lambda size=size: background_service.prepare(path, *size),
+                lambda prepared, key=key: image_cache.put(key, tk_bridge.photo(prepared))
+            )
+
+    def _queue_prewarm_tasks(self):
+        """
+        Encola, de más a menos urgente, las imágenes a precalentar: sprites
+        de todos los estados, fondo de victoria, fondos de la ruleta y
+        fondos oscurecidos a cada tamaño de minijuego.
+        """
+        overlay = self.pet_overlay
+        sprites = find_sprite_sources() if overlay.decoder == "pil" else {}
+        for state in sprites:
+            self.prewarmer.add(("sprite", state, overlay.size),
+                               lambda st=state: overlay._prepare_sprite_frames(st),
+                               lambda decoded, st=state: overlay.warm_sprite(st, *decoded))
+        victory = victory_background_paths()
+        if victory:
+            self._queue_background_prewarm(victory[0], VICTORY_BACKGROUND_SIZE, 1.0, "RGB")
+        fran_files = background_service.list_files()
+        for path in fran_files:
+            self._queue_background_prewarm(path, ROULETTE_BACKGROUND_SIZE)
+        for size in MINIGAME_BACKGROUND_SIZES:
+            for path in fran_files:
+                self._queue_background_prewarm(path, size)
+
+    def _queue_background_prewarm(self, path, size, brightness=DEFAULT_BRIGHTNESS, mode="RGBA"):
+        key = background_service.cache_key(path, *size, brightness, mode)
+        self.prewarmer.add_photo(key, lambda: background_service.prepare(path, *size, brightness, mode))
+
     def create_control_panel(self):
         """Panel de control"""
         # Título
@@ -940,35 +1110,29 @@ class MiniDiego:
         # Intentar cargar una imagen de fondo desde la carpeta assets/backgrounds
         bg_loaded = False
         try:
-            bg_dir = os.path.join("assets", "backgrounds")
-            if os.path.isdir(bg_dir):
-                # Buscar el primer archivo de imagen (png o jpg o gif) en la carpeta
-                for fname in os.listdir(bg_dir):
-                    if fname.lower().endswith((".png", ".jpg", ".jpeg", ".gif")):
-                        bg_path = os.path.join(bg_dir, fname)
-                        if HAS_PIL:
-                            try:
-                                from PIL import Image, ImageTk
-                                img = Image.open(bg_path)
-                                # Redimensionar al tamaño de la ventana
-                                img = img.resize((700, 500), Image.Resampling.LANCZOS)
-                                top._bg_photo = ImageTk.PhotoImage(img)  # guardar referencia
-                                bg_label = tk.Label(top, image=top._bg_photo)
-                                bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-                                bg_loaded = True
-                                break
-                            except Exception:
-                                pass
-                        else:
-                            try:
-                                photo = tk.PhotoImage(file=bg_path)
-                                top._bg_photo = photo
-                                bg_label = tk.Label(top, image=top._bg_photo)
-                                bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-                                bg_loaded = True
-                                break
-                            except Exception:
-                                pass
+            # Probar los archivos de imagen (png, jpg o gif) de la carpeta por orden
+            for bg_path in victory_background_paths():
+                if HAS_PIL:
+                    # Redimensionar al tamaño de la ventana
+                    # (reutilizando las cachés en memoria y en disco)
+                    photo = background_service.get(bg_path, *VICTORY_BACKGROUND_SIZE,
+                                                   brightness=1.0, mode="RGB")
+                    if photo is not None:
+                        top._bg_photo = photo  # guardar referencia
+                        bg_label = tk.Label(top, image=top._bg_photo)
+                        bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+                        bg_loaded = True
+                        break
+                else:
+                    try:
+                        photo = tk.PhotoImage(file=bg_path)
+                        top._bg_photo = photo
+                        bg_label = tk.Label(top, image=top._bg_photo)
+                        bg_label.place(x=0, y=0, relwidth=1, relheight=1)
+                        bg_loaded = True
+                        break
+                    except Exception:
+                        pass
         except Exception:
             pass
 
@@ -1015,42 +1179,61 @@ class MiniDiego:
         # Posicionar botón en la parte inferior
         close_btn.place(relx=0.5, rely=0.88, anchor="center")
     
-    def _get_emotional_state(self):
-        """Determina estado emocional"""
-        if self.sleeping:
+    def _get_emotional_state(self, overrides=None):
+        """
+        Determina estado emocional.
+
+        ``overrides`` permite evaluar valores hipotéticos de las
+        estadísticas o del sueño (p. ej. ``{'hambre': 29}`` o
+        ``{'sleeping': False}``) sin modificar los reales;
+        lo usa ``_predict_next_states``.
+        """
+        stats = {
+            'hambre': self.hambre,
+            'sueno': self.sueno,
+            'higiene': self.higiene,
+            'felicidad': self.felicidad,
+            'sleeping': self.sleeping
+        }
+        if overrides:
+            stats.update(overrides)
+        hambre, sueno = stats['hambre'], stats['sueno']
+        higiene, felicidad = stats['higiene'], stats['felicidad']
+
+        if stats['sleeping']:
             return "durmiendo"
         
-        if self.hambre >= 90:
+        if hambre >= 90:
             return "gordo"
-        elif self.hambre <= 10:
+        elif hambre <= 10:
             return "muy_hambriento"
-        elif self.hambre <= 30:
+        elif hambre <= 30:
             return "hambriento"
         
-        if self.higiene <= 10:
+        if higiene <= 10:
             return "muy_sucio"
-        elif self.higiene <= 30:
+        elif higiene <= 30:
             return "sucio"
         
-        if self.sueno <= 10:
+        if sueno <= 10:
             return "agotado"
-        elif self.sueno <= 30:
+        elif sueno <= 30:
             return "cansado"
         
-        if self.felicidad <= 10:
+        if felicidad <= 10:
             return "muy_triste"
-        elif self.felicidad <= 30:
+        elif felicidad <= 30:
             return "triste"
-        elif self.felicidad >= 80:
+        elif felicidad >= 80:
             return "muy_feliz"
-        elif self.felicidad >= 60:
+        elif felicidad >= 60:
             return "feliz"
         
         stats_bajas = sum([
-            self.hambre < 40,
-            self.sueno < 40,
-            self.higiene < 40,
-            self.felicidad < 40
+            hambre < 40,
+            sueno < 40,
+            higiene < 40,
+            felicidad < 40
         ])
         
         if stats_bajas >= 3:
@@ -1059,6 +1242,32 @@ class MiniDiego:
             return "enfermo"
         
         return "normal"
+
+    def _predict_next_states(self) -> list:
+        """
+        Estados a los que Mini‑Diego puede pasar con el próximo cambio.
+
+        Para cada estadística se evalúan valores justo a ambos lados de los
+        umbrales más cercanos (por encima y por debajo del valor actual) de
+        ``STATE_THRESHOLDS``.  También se incluye el estado al dormir o
+        despertar.  Se devuelven sin repetir y sin el estado actual.
+        """
+        if self.sleeping:
+            # Al despertar se vuelve al estado emocional normal
+            return [self._get_emotional_state({'sleeping': False})]
+        current = self._get_emotional_state()
+        candidates = ["durmiendo"]
+        for stat_name in ('hambre', 'sueno', 'higiene', 'felicidad'):
+            value = getattr(self, stat_name)
+            below = [t for t in STATE_THRESHOLDS if t <= value]
+            above = [t for t in STATE_THRESHOLDS if t > value]
+            nearest = ([max(below)] if below else []) + ([min(above)] if above else [])
+            for threshold in nearest:
+                for probe in (threshold - 1, threshold, threshold + 1):
+                    state = self._get_emotional_state({stat_name: max(0, min(100, probe))})
+                    if state != current and state not in candidates:
+                        candidates.append(state)
+        return candidates
     
     def _update_pet_sprite(self):
         """
@@ -1075,6 +1284,12 @@ class MiniDiego:
         else:
             state = self._get_emotional_state()
         self.pet_overlay.update_state(state)
+        # Preparar en segundo plano los sprites de los estados vecinos para
+        # que cruzar un umbral no bloquee la interfaz
+        try:
+            self.pet_overlay.prefetch_states(self._predict_next_states())
+        except Exception:
+            pass
     
     def change_stat(self, stat_name, amount):
         """Cambia estadística"""
@@ -1162,7 +1377,7 @@ class MiniDiego:
         Este hilo se ejecuta en segundo plano y espera un intervalo aleatorio
         de entre 3 y 5 minutos.  Si la mascota está viva y no está dormida,
         reproduce un clip de audio aleatorio de la carpeta ``assets/sounds/awake``.
-        Si la biblioteca ``playsound`` no está disponible o no hay archivos de
+        Si no hay ningún reproductor disponible o no hay archivos de
         audio, la función no hace nada.  Durante el sueño o cuando está
         muerta, el hilo simplemente espera y vuelve a comprobar más tarde.
         """
@@ -1384,9 +1599,9 @@ class MiniDiego:
         if action == 'all':
             # Aplicar a todas las stats
             self._animate_stat_change('hambre', value)
-            self.canvas.after(300, lambda: self._animate_stat_change('sueno', value))
-            self.canvas.after(600, lambda: self._animate_stat_change('higiene', value))
-            self.canvas.after(900, lambda: self._animate_stat_change('felicidad', value))
+            self.root.after(300, lambda: self._animate_stat_change('sueno', value))
+            self.root.after(600, lambda: self._animate_stat_change('higiene', value))
+            self.root.after(900, lambda: self._animate_stat_change('felicidad', value))
         elif action in ['felicidad', 'hambre', 'higiene', 'sueno']:
             # ANIMAR stat antes de cambiar
             self._animate_stat_change(action, value)
@@ -1404,31 +1619,28 @@ class MiniDiego:
         bars = self.stat_widgets[stat_name]['bars']
         original_color = self.stat_widgets[stat_name]['color']
         
-        # Parpadear 3 veces
-        def flash(count):
-            if count > 0:
-                # Amarillo brillante
-                for bar in bars:
-                    try:
-                        bar.config(fg="#FFFF00")
-                    except:
-                        pass
-                
-                self.root.after(200, lambda: restore(count))
-            else:
+        # Parpadear 3 veces (amarillo/blanco cada 200 ms) con el reloj de
+        # animación compartido y aplicar el cambio al terminar
+        blink = {'step': 0}
+
+        def flash(frames):
+            # Si el reloj se retrasó, saltar directamente a la fase que toca
+            step = blink['step'] + frames - 1
+            if step >= 6:
                 # Aplicar cambio final
                 self.change_stat(stat_name, value)
-        
-        def restore(count):
-            # Blanco brillante
+                return False
+            # Amarillo brillante en los pasos pares, blanco en los impares
+            color = "#FFFF00" if step % 2 == 0 else "#FFFFFF"
             for bar in bars:
                 try:
-                    bar.config(fg="#FFFFFF")
+                    bar.config(fg=color)
                 except:
                     pass
-            self.root.after(200, lambda: flash(count - 1))
-        
-        flash(3)
+            blink['step'] = step + 1
+            return True
+
+        animation_clock.register(flash, fps=5, name=f"parpadeo_{stat_name}")
     
     def _animate_block(self, stat_name):
         """Anima bloqueo - FONDO ROJO"""
@@ -1642,6 +1854,15 @@ class MiniDiego:
         # Botón para restar 5 minutos (300 segundos) al temporizador
         tk.Button(control_col, text="-5 minutos", command=lambda: self.reduce_time(300),
                  width=18, bg="#FF7043", fg="white", font=("Arial", 10, "bold")).pack(pady=4, fill="x")
+        # Alternar el decodificador de sprites (Pillow / lector de Tk)
+        def toggle_decoder():
+            overlay = self.pet_overlay
+            overlay.set_sprite_decoder(DECODERS[(DECODERS.index(overlay.decoder) + 1) % len(DECODERS)])
+            decoder_btn.config(text=f"Sprites: {overlay.decoder}")
+        decoder_btn = tk.Button(control_col, text=f"Sprites: {self.pet_overlay.decoder}",
+                                command=toggle_decoder,
+                                width=18, bg="#607D8B", fg="white", font=("Arial", 10, "bold"))
+        decoder_btn.pack(pady=4, fill="x")
         # Salir del programa
         tk.Button(control_col, text="SALIR", command=self.root.quit,
                  width=18, bg="#f44336", fg="white", font=("Arial", 10, "bold")).pack(pady=4, fill="x")
@@ -1688,6 +1909,54 @@ class MiniDiego:
                      command=lambda s=st: self.preview_state(s),
                      width=18, bg="#607D8B", fg="white", font=("Arial", 9, "bold"),
                      wraplength=130, justify="center").pack(pady=1, fill="x")
+
+        # Estado de la caché de imágenes (memoria ocupada y eficacia)
+        cache = image_cache.stats()
+        tk.Label(admin_win,
+                 text=(f"Caché de imágenes: {cache['resident_bytes'] / 1048576:.1f}"
+                       f"/{cache['max_bytes'] / 1048576:.0f} MB, {cache['entries']} entradas, "
+                       f"{cache['hits']} aciertos, {cache['misses']} fallos, "
+                       f"{cache['evictions']} descartes, {cache['pinned']} fijadas"),
+                 font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
+        warm = self.prewarmer.stats()
+        tk.Label(admin_win,
+                 text=(f"Precalentado: {warm['finished']} en memoria, {warm['disk_only']} sólo en disco, "
+                       f"{warm['pending']} pendientes, trozo máx. {warm['max_slice_ms']} ms, "
+                       f"{warm['deferred']} pasos aplazados"),
+                 font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
+        progressive = background_service.stats()
+        if progressive["previews"]:
+            tk.Label(admin_win,
+                     text=(f"Fondos progresivos: {progressive['previews']} vistas previas "
+                           f"({progressive['preview_ms']} ms), {progressive['refined']} refinados "
+                           f"({progressive['refine_ms']} ms), {progressive['failed']} sin refinar"),
+                     font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
+        sound = audio_service.stats()
+        tk.Label(admin_win,
+                 text=(f"Audio: {sound['played']} reproducidos, {sound['coalesced']} agrupados, "
+                       f"{sound['stale'] + sound['dropped']} descartados, cola {sound['queue_depth']} "
+                       f"(máx. {sound['max_queue_depth']}), {sound['active_voices']} voces, "
+                       f"latencia media {sound['avg_latency_ms']} ms"),
+                 font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
+        procs = process_pool.stats()
+        if procs["spawned"]:
+            tk.Label(admin_win,
+                     text=(f"Reproductores externos: {procs['live']} vivos, {procs['spawned']} lanzados, "
+                           f"{procs['reaped']} recogidos, {procs['killed']} terminados por tiempo"),
+                     font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
+        mix = mixer.stats()
+        if mix["sink"] is not None:
+            tk.Label(admin_win,
+                     text=(f"Mezclador ({mix['sink']}): {mix['played']} clips, {mix['active']} sonando, "
+                           f"{mix['clips']} en caché ({mix['cache_bytes'] / 1048576:.1f} MB), "
+                           f"decodificación {mix['decode_ms']} ms"),
+                     font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
+        if self.startup_loader is not None:
+            boot = self.startup_loader.stats()
+            tk.Label(admin_win,
+                     text=(f"Carga inicial: {boot['loaded']} recursos en {boot['total_ms']} ms, "
+                           f"primer fotograma en {boot['first_frame_ms']} ms"),
+                     font=("Arial", 9), bg="#1a1a1a", fg="#888").pack(pady=(0, 6))
     
     def restore_stats(self):
         """Restaurar stats"""
@@ -1743,6 +2012,8 @@ def main():
     print("="*60 + "\n")
     
     root.mainloop()
+    # No dejar reproductores externos huérfanos al salir
+    process_pool.terminate_all()
 
 # Ejecutar con: dar_a_luz.py
 if __name__ == "__main__":
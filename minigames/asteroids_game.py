@@ -16,13 +16,9 @@ para tener apariencia manuscrita. Los botones son grises.
 import tkinter as tk
 import random
 import time
-import os
 
-try:
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class AsteroidsGame:
@@ -64,29 +60,7 @@ class AsteroidsGame:
         self.canvas.bind("<Button-1>", self._start_drag)
         self.canvas.bind("<B1-Motion>", self._drag)
         # Fondo
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir)
-                              if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
         # Widgets
         self.widgets = []
         # Controles
@@ -149,9 +123,9 @@ class AsteroidsGame:
         self.start_time = time.time()
         self.asteroids.clear()
         self._draw_scene()
-        # Iniciar bucles de spawn y juego
+        # Iniciar bucles de spawn y juego (20 fps con el reloj de animación compartido)
         self._spawn_asteroid()
-        self._game_loop()
+        animation_clock.register(self._game_loop, fps=20, name="asteroides")
 
     def _move_player(self, dx: int) -> None:
         if not self.game_running:
@@ -175,10 +149,11 @@ class AsteroidsGame:
         # Programar siguiente spawn
         self.window.after(self.spawn_interval, self._spawn_asteroid)
 
-    def _update_asteroids(self) -> None:
+    def _update_asteroids(self, frames: int = 1) -> None:
         new_asteroids = []
         for asteroid in self.asteroids:
-            asteroid["y"] += asteroid["speed"]
+            # Avanzar también los fotogramas que el reloj haya saltado
+            asteroid["y"] += asteroid["speed"] * frames
             # Verificar colisión con nave
             if self._check_collision(asteroid):
                 self._game_over(False)
@@ -204,21 +179,24 @@ class AsteroidsGame:
             return True
         return False
 
-    def _game_loop(self) -> None:
+    def _game_loop(self, frames: int = 1) -> bool:
+        """Fotograma del juego; lo llama el reloj de animación (``frames`` > 1 si hubo saltos)."""
         if not self.game_running or self.game_closed:
-            return
+            return False
         # Actualizar posiciones de asteroides
-        self._update_asteroids()
+        self._update_asteroids(frames)
+        if not self.game_running:
+            # Choque con la nave
+            return False
         # Verificar tiempo
         elapsed = time.time() - self.start_time
         if elapsed >= self.game_duration:
             # Ganar si sobrevives todo el tiempo
             self._game_over(True)
-            return
+            return False
         # Dibujar escena
         self._draw_scene()
-        # Programar siguiente actualización
-        self.window.after(50, self._game_loop)
+        return True
 
     def _draw_scene(self) -> None:
         self._clear_canvas()
@@ -12,14 +12,9 @@ El fondo se puede personalizar mediante ``assets/custom/balloon_bg.png``.
 
 import tkinter as tk
 import random
-import os
 
-try:
-    # Import ImageEnhance to tweak brightness of chosen backgrounds.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class BalloonPop:
@@ -57,29 +52,8 @@ class BalloonPop:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo
-        self.bg_photo = None
         # Selecciona aleatoriamente una imagen de 'fran' y oscurece ligeramente la imagen.
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith(".png")]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height, extensions=(".png",))
 
         # Colores de globos (indicamos rojos y otros colores)
         self.colors = ["red", "blue", "green", "yellow", "purple", "orange"]
@@ -147,9 +121,9 @@ class BalloonPop:
         if self.bg_photo:
             bg_id = self.canvas.create_image(0, 0, anchor="nw", image=self.bg_photo)
             self.widgets.append(bg_id)
-        # Empezar generación y movimiento
+        # Empezar generación y movimiento (~33 fps con el reloj de animación compartido)
         self._spawn_balloon()
-        self._update_balloons()
+        animation_clock.register(self._update_balloons, fps=33, name="globos")
 
     def _spawn_balloon(self) -> None:
         if not self.game_running:
@@ -203,13 +177,15 @@ class BalloonPop:
         elif self.wrong_popped > self.max_wrong:
             self._game_over(False)
 
-    def _update_balloons(self) -> None:
+    def _update_balloons(self, frames: int = 1) -> bool:
         if not self.game_running:
-            return
+            return False
         to_remove = []
         for b in self.active_balloons:
-            b["y"] -= b["speed"]
-            self.canvas.move(b["id"], 0, -b["speed"])
+            # Subir también los fotogramas que el reloj haya saltado
+            dy = b["speed"] * frames
+            b["y"] -= dy
+            self.canvas.move(b["id"], 0, -dy)
             if b["y"] + b["radius"] < 0:
                 to_remove.append(b)
         for b in to_remove:
@@ -229,8 +205,7 @@ class BalloonPop:
             fill="white",
             tag="score_text"
         )
-        # Seguir actualizando
-        self.window.after(30, self._update_balloons)
+        return True
 
     def _game_over(self, won: bool) -> None:
         self.game_running = False
@@ -21,13 +21,8 @@ Comic Sans MS para mantener la coherencia estética.
 import tkinter as tk
 from tkinter import simpledialog
 import random
-import os
 
-try:
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
 
 
 class CasinoRouletteGame:
@@ -57,29 +52,7 @@ class CasinoRouletteGame:
         self.canvas.bind("<Button-1>", self._start_drag)
         self.canvas.bind("<B1-Motion>", self._drag)
         # Fondo
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir)
-                              if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
         # Variables de juego
         self.chips = 100
         self.target = 500
@@ -15,14 +15,9 @@ the gameplay elements.
 
 import tkinter as tk
 import random
-import os
 
-try:
-    # Import ImageEnhance to adjust brightness of the background.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class CatchGame:
@@ -62,28 +57,7 @@ class CatchGame:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Background image: pick a random 'fran' image and darken it slightly to reduce contrast.
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Paddle
         self.paddle_width = 120
@@ -122,15 +96,18 @@ class CatchGame:
         elif direction == 1:
             self.right_pressed = False
 
-    def _update_paddle_position(self) -> None:
-        """Actualiza la posición del paddle de forma suave mientras se mantengan las teclas."""
-        if self.game_running:
-            if self.left_pressed and not self.right_pressed:
-                self._move_paddle(-self.move_speed)
-            if self.right_pressed and not self.left_pressed:
-                self._move_paddle(self.move_speed)
-            # Llamar de nuevo después de un pequeño intervalo
-            self.window.after(30, self._update_paddle_position)
+    def _update_paddle_position(self, frames: int = 1) -> bool:
+        """
+        Actualiza la posición del paddle de forma suave mientras se mantengan las teclas.
+        Lo llama el reloj de animación; ``frames`` > 1 si hubo fotogramas saltados.
+        """
+        if not self.game_running:
+            return False
+        if self.left_pressed and not self.right_pressed:
+            self._move_paddle(-self.move_speed * frames)
+        if self.right_pressed and not self.left_pressed:
+            self._move_paddle(self.move_speed * frames)
+        return True
 
     def _start_drag(self, event: tk.Event) -> None:
         self._drag_data = {"x": event.x, "y": event.y}
@@ -200,10 +177,10 @@ class CatchGame:
         self._draw_paddle()
         # Start spawning objects
         self.window.after(500, self._spawn_object)
-        # Start moving objects
-        self._update_objects()
+        # Start moving objects (~33 fps con el reloj de animación compartido)
+        animation_clock.register(self._update_objects, fps=33, name="atrapar_objetos")
         # Iniciar movimiento continuo del paddle
-        self._update_paddle_position()
+        animation_clock.register(self._update_paddle_position, fps=33, name="atrapar_paddle")
 
     def _draw_paddle(self) -> None:
         # Remove existing paddle
@@ -253,14 +230,14 @@ class CatchGame:
         # Spawn next object after random interval between 600-1000ms
         self.window.after(random.randint(600, 1000), self._spawn_object)
 
-    def _update_objects(self) -> None:
+    def _update_objects(self, frames: int = 1) -> bool:
         if not self.game_running:
-            return
+            return False
         objects_to_remove = []
         for obj in self.objects:
-            # Mover objeto hacia abajo
-            obj["y"] += 5
-            self.canvas.move(obj["id"], 0, 5)
+            # Mover objeto hacia abajo (más si el reloj saltó fotogramas)
+            obj["y"] += 5 * frames
+            self.canvas.move(obj["id"], 0, 5 * frames)
             # Comprobar colisión con la barra
             if obj["y"] + obj["radius"] >= self.paddle_y:
                 # Comprobar solapamiento horizontal
@@ -268,7 +245,7 @@ class CatchGame:
                     # Si el objeto es malo (calavera), derrota inmediata
                     if obj.get("is_bad"):
                         self._game_over(False)
-                        return
+                        return False
                     else:
                         # Atrapado
                         self.caught += 1
@@ -291,9 +268,9 @@ class CatchGame:
         # Check end condition
         if self.spawned_objects >= self.total_objects and not self.objects:
             self._game_over()
-            return
+            return False
         # Continue updating
-        self.window.after(30, self._update_objects)
+        return True
 
     def _update_score_text(self) -> None:
         # Remove previous score text(s) if any
@@ -1,13 +1,9 @@
 import tkinter as tk
 import random
 import time
-import os
 
-try:
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 class Cazabichos:
     """Cazabichos - Acierta 15 bichos en 30 segundos"""
@@ -45,28 +41,7 @@ class Cazabichos:
         self.current_bug = None
 
         # Fondo aleatorio: selecciona una imagen "fran" al azar y oscurece ligeramente
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((w, h), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(w, h)
     
     def _start_drag(self, event):
         self._drag_data = {"x": event.x, "y": event.y}
@@ -127,7 +102,7 @@ Apunta bien"""
         self.game_running = True
         self.start_time = time.time()
         self._spawn_bug()
-        self._game_loop()
+        animation_clock.register(self._game_loop, fps=10, name="cazabichos")
     
     def _spawn_bug(self):
         if not self.game_running:
@@ -171,9 +146,10 @@ Apunta bien"""
             self.current_bug = None
             self._spawn_bug()
     
-    def _game_loop(self):
+    def _game_loop(self, frames=1):
+        # Lo llama el reloj de animación; el tiempo se mide con el reloj real
         if not self.game_running or self.game_closed:
-            return
+            return False
         
         elapsed = time.time() - self.start_time
         remaining = self.tiempo_limite - elapsed
@@ -181,10 +157,10 @@ Apunta bien"""
         if remaining <= 0:
             self.game_running = False
             self._game_over(self.aciertos >= self.objetivo)
-            return
+            return False
         
         self._draw_ui(int(remaining))
-        self.window.after(100, self._game_loop)
+        return True
     
     def _draw_ui(self, remaining):
         # Actualizar solo el texto superior
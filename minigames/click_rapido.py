@@ -1,14 +1,8 @@
 import tkinter as tk
 import random
 import time
-import os
 
-try:
-    # Import PIL for random backgrounds
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
 
 class ClickRapido:
     """Click Rapido - Acierta 8 de 10 botones"""
@@ -40,28 +34,7 @@ class ClickRapido:
         self.window.geometry(f"{w}x{h}+{x}+{y}")
 
         # Fondo aleatorio para el juego
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((w, h), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(w, h)
         
         self.canvas.bind("<Button-1>", self._start_drag)
         self.canvas.bind("<B1-Motion>", self._drag)
@@ -13,14 +13,9 @@ está disponible. Los coches son simples rectángulos con colores vivos.
 
 import tkinter as tk
 import random
-import os
 
-try:
-    # Import ImageEnhance to adjust brightness of background images.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class CrossRoad:
@@ -59,29 +54,8 @@ class CrossRoad:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo
-        self.bg_photo = None
         # Selecciona aleatoriamente una imagen 'fran' y aplícale un oscurecimiento ligero.
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Jugador
         self.player_width = 30
@@ -178,7 +152,7 @@ class CrossRoad:
         self._draw_player()
         # Arrancar bucles
         self._spawn_car()
-        self._update_cars()
+        animation_clock.register(self._update_cars, fps=33, name="cruza_coches")
 
     def _draw_player(self) -> None:
         if self.player_id is not None:
@@ -244,20 +218,22 @@ class CrossRoad:
         # Programar siguiente coche
         self.window.after(800, self._spawn_car)
 
-    def _update_cars(self) -> None:
+    def _update_cars(self, frames: int = 1) -> bool:
         if not self.game_running:
-            return
+            return False
         cars_to_remove = []
         for car in self.cars:
-            car["x"] += car["speed"] * car["direction"]
-            self.canvas.move(car["id"], car["speed"] * car["direction"], 0)
+            # Avanzar también los fotogramas que el reloj haya saltado
+            dx = car["speed"] * car["direction"] * frames
+            car["x"] += dx
+            self.canvas.move(car["id"], dx, 0)
             # Colisión con jugador
             if (self.player_y + self.player_height > car["y"] - car["height"] / 2 and
                 self.player_y < car["y"] + car["height"] / 2 and
                 self.player_x + self.player_width > car["x"] and
                 self.player_x < car["x"] + car["width"]):
                 self._game_over(False)
-                return
+                return False
             # Eliminación cuando sale de la pantalla
             if car["direction"] == 1 and car["x"] > self.width:
                 cars_to_remove.append(car)
@@ -280,7 +256,7 @@ class CrossRoad:
             fill="white",
             tag="cross_text"
         )
-        self.window.after(30, self._update_cars)
+        return True
 
     def _game_over(self, won: bool) -> None:
         self.game_running = False
@@ -14,14 +14,8 @@ El juego utiliza un fondo personalizable localizado en
 import tkinter as tk
 import random
 import time
-import os
 
-try:
-    # Import ImageEnhance to allow dimming of backgrounds.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
 
 
 class DisarmBomb:
@@ -59,29 +53,8 @@ class DisarmBomb:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo
-        self.bg_photo = None
         # Selecciona aleatoriamente una imagen 'fran' y oscurece ligeramente la imagen para reducir el contraste.
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Conjunto de botones posibles (solo flechas para mayor dificultad)
         self.available_buttons = ["Up", "Down", "Left", "Right"]
@@ -13,15 +13,9 @@ se muestra una barra de progreso en la parte inferior de la pantalla.
 
 import tkinter as tk
 import time
-import os
-import random
 
-try:
-    # Import ImageEnhance to adjust background brightness.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class ExpressRace:
@@ -57,29 +51,8 @@ class ExpressRace:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo
-        self.bg_photo = None
         # Selecciona al azar una imagen 'fran' y oscurece ligeramente la imagen.
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Barra de progreso (rectángulo)
         self.progress_bar_bg = None
@@ -162,8 +135,8 @@ class ExpressRace:
             100, bar_y, 100, bar_y + bar_height,
             fill="#00BCD4", outline="white", width=2
         )
-        # Iniciar actualización de temporizador y progreso
-        self._update_game()
+        # Iniciar actualización de temporizador y progreso (10 fps con el reloj de animación compartido)
+        animation_clock.register(self._update_game, fps=10, name="carrera_express")
 
     def _on_space(self) -> None:
         if not self.game_running:
@@ -185,9 +158,13 @@ class ExpressRace:
         current_len = (self.progress / self.required_distance) * total_len
         self.canvas.coords(self.progress_bar_fg, bar_start_x, self.height - 70, bar_start_x + current_len, self.height - 40)
 
-    def _update_game(self) -> None:
+    def _update_game(self, frames: int = 1) -> bool:
+        """
+        Refresca el temporizador; lo llama el reloj de animación.  El tiempo
+        se mide con el reloj real, así que los fotogramas saltados no importan.
+        """
         if not self.game_running:
-            return
+            return False
         elapsed = time.time() - self.start_time
         remaining = self.game_duration - elapsed
         # Actualizar temporizador
@@ -207,9 +184,8 @@ class ExpressRace:
         if remaining <= 0:
             # Verificar si llegó a meta
             self._game_over(self.progress >= self.required_distance)
-            return
-        # Continuar actualizando
-        self.window.after(100, self._update_game)
+            return False
+        return True
 
     def _game_over(self, won: bool) -> None:
         self.game_running = False
@@ -24,15 +24,9 @@ fondo será un color sólido predeterminado.
 """
 
 import tkinter as tk
-import random
-import os
 
-try:
-    # Import ImageEnhance so we can dim backgrounds selected randomly.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class FishingGame:
@@ -83,29 +77,8 @@ class FishingGame:
         self.window.focus_force()
 
         # Imagen de fondo
-        self.bg_photo = None
         # Selecciona una imagen aleatoria "fran" y oscurece ligeramente la imagen.
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith(".png")]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height, extensions=(".png",))
 
         # Widgets dibujados
         self.widgets = []
@@ -181,7 +154,8 @@ class FishingGame:
         self.bar_pos = 50
         # Aumentar velocidad del pez según peces ya capturados
         self.fish_speed = 2 + (self.fish_caught * 0.5)
-        self._fishing_loop()
+        # ~33 fps con el reloj de animación compartido
+        animation_clock.register(self._fishing_loop, fps=33, name="pesca")
 
     def _hold_bar(self, event: tk.Event) -> None:
         self.holding = True
@@ -189,10 +163,23 @@ class FishingGame:
     def _release_bar(self, event: tk.Event) -> None:
         self.holding = False
 
-    def _fishing_loop(self) -> None:
-        """Bucle principal que actualiza barra, pez y progreso."""
+    def _fishing_loop(self, frames: int = 1) -> bool:
+        """
+        Bucle principal que actualiza barra, pez y progreso.
+        Lo llama el reloj de animación; ``frames`` > 1 si hubo fotogramas saltados.
+        """
         if not self.fishing or self.game_closed:
-            return
+            return False
+        # Se simula cada fotograma saltado: el pez rebota en los bordes
+        for _ in range(frames):
+            if not self._fishing_step():
+                return False
+        # Dibujar interfaz
+        self._draw_fishing()
+        return True
+
+    def _fishing_step(self) -> bool:
+        """Avanza un fotograma; devuelve ``False`` si el pez quedó capturado."""
         # Mover barra: subir si se sostiene espacio, bajar si no
         if self.holding:
             self.bar_pos = max(0, self.bar_pos - 3)
@@ -218,14 +205,11 @@ class FishingGame:
                 else:
                     # Mostrar breve pausa y comenzar el siguiente pez
                     self.window.after(500, self._start_fishing)
-                return
+                return False
         else:
             # Retroceso del progreso si el pez sale del área
             self.progress = max(0, self.progress - 1)
-        # Dibujar interfaz
-        self._draw_fishing()
-        # Continuar bucle tras pequeño intervalo
-        self.window.after(30, self._fishing_loop)
+        return True
 
     def _draw_fishing(self) -> None:
         """Dibuja los elementos del juego durante la pesca."""
@@ -17,15 +17,9 @@ uniforme.
 
 import tkinter as tk
 import random
-import os
 
-try:
-    # Pillow es opcional. Si está disponible, lo usamos para cargar
-    # las imágenes de fondo y ajustar su brillo.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class JumpClimb:
@@ -71,29 +65,7 @@ class JumpClimb:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir)
-                              if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Jugador (rectángulo)
         self.player_width = 30
@@ -217,8 +189,8 @@ class JumpClimb:
         # Dibujar plataformas y jugador
         self._draw_platforms()
         self._draw_player()
-        # Iniciar actualizaciones
-        self._update_game()
+        # Iniciar actualizaciones (50 fps con el reloj de animación compartido)
+        animation_clock.register(self._update_game, fps=50, name="salta_sube")
 
     def _draw_player(self) -> None:
         """Dibuja el jugador en la posición actual."""
@@ -255,10 +227,29 @@ class JumpClimb:
                 tags="platform"
             )
 
-    def _update_game(self) -> None:
-        """Actualiza la lógica del juego en cada fotograma."""
+    def _update_game(self, frames: int = 1) -> bool:
+        """
+        Actualiza la lógica del juego en cada fotograma.
+        Lo llama el reloj de animación; ``frames`` > 1 si hubo fotogramas saltados.
+        """
         if not self.game_running or self.game_closed:
-            return
+            return False
+        # Con gravedad y rebotes no basta con multiplicar el desplazamiento:
+        # se simula cada fotograma saltado y se redibuja una sola vez
+        for _ in range(frames):
+            if not self._step():
+                return False
+        # Redibujar
+        self._clear_canvas(background=False)
+        if self.bg_photo:
+            bg_id = self.canvas.create_image(0, 0, anchor="nw", image=self.bg_photo)
+            self.widgets.append(bg_id)
+        self._draw_platforms()
+        self._draw_player()
+        return True
+
+    def _step(self) -> bool:
+        """Avanza un fotograma de física; devuelve ``False`` si la partida terminó."""
         # Actualizar velocidad vertical
         self.vy += self.gravity
         # Actualizar posición horizontal según teclas
@@ -313,20 +304,12 @@ class JumpClimb:
         # Comprobar derrota
         if self.player_y - self.player_height // 2 > self.height:
             self._game_over(False)
-            return
+            return False
         # Comprobar victoria
         if self.success_count >= self.target_jumps:
             self._game_over(True)
-            return
-        # Redibujar
-        self._clear_canvas(background=False)
-        if self.bg_photo:
-            bg_id = self.canvas.create_image(0, 0, anchor="nw", image=self.bg_photo)
-            self.widgets.append(bg_id)
-        self._draw_platforms()
-        self._draw_player()
-        # Próxima actualización
-        self.window.after(20, self._update_game)
+            return False
+        return True
 
     def _game_over(self, won: bool) -> None:
         """Muestra la pantalla final y llama al callback."""
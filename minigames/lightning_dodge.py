@@ -20,12 +20,16 @@ import time
 import os
 
 try:
-    # Import ImageEnhance to allow dimming of randomly selected backgrounds.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
+    # PIL para la imagen del rayo
+    from PIL import Image, ImageTk  # type: ignore
     HAS_PIL = True
 except Exception:
     HAS_PIL = False
 
+from modules.backgrounds import background_service
+from modules.asset_manifest import asset_manifest
+from modules.animation_clock import animation_clock
+
 
 class LightningDodge:
     """Minijuego para esquivar rayos durante un periodo de tiempo."""
@@ -66,35 +70,13 @@ class LightningDodge:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Imagen de fondo
-        self.bg_photo = None
         # Seleccionar aleatoriamente una imagen 'fran' y oscurecerla ligeramente.
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    # Convertir a RGBA para soportar GIFs (primer fotograma)
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Sprite de rayo (opcional)
         self.bolt_photo = None
         bolt_path = os.path.join("assets", "custom", "lightning.png")
-        if HAS_PIL and os.path.exists(bolt_path):
+        if HAS_PIL and asset_manifest.exists(bolt_path):
             try:
                 bolt_img = Image.open(bolt_path)
                 try:
@@ -139,14 +121,18 @@ class LightningDodge:
         elif direction == 1:
             self.right_pressed = False
 
-    def _update_player_position(self) -> None:
-        """Actualiza la posición del jugador de manera suave mientras se mantenga presionada la tecla."""
-        if self.game_running:
-            if self.left_pressed and not self.right_pressed:
-                self._move_player(-self.player_speed)
-            if self.right_pressed and not self.left_pressed:
-                self._move_player(self.player_speed)
-            self.window.after(30, self._update_player_position)
+    def _update_player_position(self, frames: int = 1) -> bool:
+        """
+        Actualiza la posición del jugador de manera suave mientras se mantenga presionada la tecla.
+        Lo llama el reloj de animación; ``frames`` > 1 si hubo fotogramas saltados.
+        """
+        if not self.game_running:
+            return False
+        if self.left_pressed and not self.right_pressed:
+            self._move_player(-self.player_speed * frames)
+        if self.right_pressed and not self.left_pressed:
+            self._move_player(self.player_speed * frames)
+        return True
 
     def _start_drag(self, event: tk.Event) -> None:
         self._drag_data = {"x": event.x, "y": event.y}
@@ -211,11 +197,11 @@ class LightningDodge:
             self.widgets.append(bg_id)
         # Dibujar jugador
         self._draw_player()
-        # Iniciar timers
-        self._update_game()
+        # Iniciar timers (bucles de ~33 fps con el reloj de animación compartido)
+        animation_clock.register(self._update_game, fps=33, name="rayos")
         self._spawn_bolt()
         # Iniciar actualización continua de la posición del jugador
-        self._update_player_position()
+        animation_clock.register(self._update_player_position, fps=33, name="rayos_jugador")
 
     def _draw_player(self) -> None:
         if self.player_id is not None:
@@ -268,9 +254,9 @@ class LightningDodge:
         next_spawn = random.randint(self.bolt_spawn_interval[0], self.bolt_spawn_interval[1])
         self.window.after(next_spawn, self._spawn_bolt)
 
-    def _update_game(self) -> None:
+    def _update_game(self, frames: int = 1) -> bool:
         if not self.game_running:
-            return
+            return False
         now = time.time()
         elapsed = now - self.start_time
         remaining = self.game_duration - elapsed
@@ -290,8 +276,10 @@ class LightningDodge:
         # Mover rayos
         bolts_to_remove = []
         for bolt in self.active_bolts:
-            bolt["y"] += bolt["speed"]
-            self.canvas.move(bolt["id"], 0, bolt["speed"])
+            # Avanzar también los fotogramas que el reloj haya saltado
+            dy = bolt["speed"] * frames
+            bolt["y"] += dy
+            self.canvas.move(bolt["id"], 0, dy)
             # Colisión con jugador
             if (bolt["y"] + bolt["height"] >= self.player_y and
                 bolt["y"] <= self.player_y + self.player_height and
@@ -299,7 +287,7 @@ class LightningDodge:
                 bolt["x"] <= self.player_x + self.player_width):
                 # Golpeado
                 self._game_over(False)
-                return
+                return False
             # Salir de pantalla
             if bolt["y"] > self.height:
                 bolts_to_remove.append(bolt)
@@ -313,9 +301,9 @@ class LightningDodge:
         # Comprobar victoria
         if remaining <= 0:
             self._game_over(True)
-            return
+            return False
         # Continuar bucle
-        self.window.after(30, self._update_game)
+        return True
 
     def _game_over(self, won: bool) -> None:
         self.game_running = False
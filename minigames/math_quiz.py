@@ -3,12 +3,7 @@ import random
 import json
 import os
 
-try:
-    # Cargar Pillow para fondos aleatorios y ajuste de brillo
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
 
 class MathQuiz:
     """Quiz Matemtico - Versin mejorada"""
@@ -50,28 +45,7 @@ class MathQuiz:
         self.widgets = []
 
         # Fondo aleatorio: selecciona una imagen que comience por "fran" y oscurece
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((700, 500), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(700, 500)
     
     def _start_drag(self, event):
         self._drag_data = {"x": event.x, "y": event.y}
@@ -1,13 +1,7 @@
 import tkinter as tk
 import random
-import os
 
-try:
-    # Para cargar fondos personalizados y ajustar el brillo
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
 
 class MemoryGame:
     """Juego de Memoria (Simon Says) - Versin mejorada"""
@@ -57,28 +51,7 @@ class MemoryGame:
         self.widgets = []
 
         # Fondo aleatorio
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((700, 550), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(700, 550)
     
     def _start_drag(self, event):
         self._drag_data = {"x": event.x, "y": event.y}
@@ -1,13 +1,7 @@
 import tkinter as tk
-import random
-import os
 
-try:
-    # Importar PIL para fondos aleatorios
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 class PescaLoca:
     """Pesca Loca - Captura 3 peces consecutivos"""
@@ -43,28 +37,7 @@ class PescaLoca:
         self.window.geometry(f"{w}x{h}+{x}+{y}")
 
         # Fondo aleatorio basado en imágenes 'fran'
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith(".png")]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((w, h), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(w, h, extensions=(".png",))
         
         # Arrastrable
         self.canvas.bind("<Button-1>", self._start_drag)
@@ -144,7 +117,8 @@ Si fallas uno, pierdes"""
         self.fish_pos = 50
         self.bar_pos = 50
         self.fish_speed = 2 + (self.peces_capturados * 0.5)  # Mas rapido cada vez
-        self._fishing_loop()
+        # ~33 fps con el reloj de animación compartido
+        animation_clock.register(self._fishing_loop, fps=33, name="pesca_loca")
     
     def _hold_bar(self, event):
         self.holding = True
@@ -152,10 +126,19 @@ Si fallas uno, pierdes"""
     def _release_bar(self, event):
         self.holding = False
     
-    def _fishing_loop(self):
+    def _fishing_loop(self, frames=1):
         if not self.pescando or self.game_closed:
-            return
+            return False
+        
+        # Simular cada fotograma saltado por el reloj (el pez rebota en los bordes)
+        for _ in range(frames):
+            if not self._fishing_step():
+                return False
         
+        self._draw_fishing()
+        return True
+    
+    def _fishing_step(self):
         # Mover barra
         if self.holding:
             self.bar_pos = max(0, self.bar_pos - 3)
@@ -181,12 +164,10 @@ Si fallas uno, pierdes"""
                     self._game_over(True)
                 else:
                     self.window.after(500, self._start_fishing)
-                return
+                return False
         else:
             self.progreso = max(0, self.progreso - 1)
-        
-        self._draw_fishing()
-        self.window.after(30, self._fishing_loop)
+        return True
     
     def _draw_fishing(self):
         self._clear_widgets()
@@ -26,21 +26,12 @@ estética y la mecánica de los otros juegos en el proyecto.
 """
 
 import tkinter as tk
-import random
 import time
 import os
 
-# Importación opcional de playsound para reproducir sonidos de teclas.
-try:
-    from playsound import playsound  # type: ignore
-except Exception:
-    playsound = None
-
-try:
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.sfx import KeySounds
+from modules.animation_clock import animation_clock
 
 
 class QWERHeroGame:
@@ -99,55 +90,20 @@ class QWERHeroGame:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo opcional
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
 
         # Contenedores de widgets para limpiar fácilmente
         self.widgets = []
         # Identificador de texto de marcador (aciertos/misses) para actualizar dinámicamente
         self.score_id: int | None = None
 
-        # Función local para reproducir sonidos de teclas.  Busca en la carpeta
-        # ``assets/sounds/qwer_<tecla>`` archivos de audio y reproduce uno al
-        # azar. Si no hay archivos o la biblioteca playsound no está
-        # disponible, no hace nada.
-        def _play_key_sound(key: str) -> None:
-            folder = os.path.join('assets', 'sounds', f'qwer_{key}')
-            try:
-                files = [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(('.mp3', '.wav', '.ogg'))]
-                if not files:
-                    return
-                file_path = random.choice(files)
-                if playsound is not None:
-                    try:
-                        playsound(file_path)
-                    except Exception:
-                        pass
-            except Exception:
-                pass
-
-        # Asignamos la función como atributo para usarla en otros métodos
-        self.play_key_sound = _play_key_sound
+        # Sonidos de teclas: se precargan ahora y cada pulsación los lanza
+        # sin bloquear el hilo de Tk (ver modules/sfx.py).  Si no hay
+        # archivos en ``assets/sounds/qwer_<tecla>``, no suena nada.
+        self.key_sounds = KeySounds({key: os.path.join('assets', 'sounds', f'qwer_{key}')
+                                     for key in ('q', 'w', 'e', 'r')})
+        self.key_sounds.preload()
+        self.play_key_sound = self.key_sounds.play
 
     def _start_drag(self, event: tk.Event) -> None:
         self._drag_data = {"x": event.x, "y": event.y}
@@ -244,8 +200,8 @@ class QWERHeroGame:
         self.window.bind("<Key>", self._on_key)
         # Establecer inicio
         self.start_time = time.time() * 1000.0
-        # Comenzar bucle de actualización
-        self._update()
+        # Comenzar bucle de actualización (50 fps con el reloj compartido)
+        animation_clock.register(self._update, fps=50, name="qwer_notas")
 
     def _draw_columns(self) -> None:
         """Dibuja las cuatro columnas y la línea de golpeo."""
@@ -275,10 +231,14 @@ class QWERHeroGame:
             fill="#FFFFFF", width=2
         ))
 
-    def _update(self) -> None:
-        """Actualiza la posición de las notas y gestiona el final del juego."""
+    def _update(self, frames: int = 1) -> bool:
+        """
+        Actualiza la posición de las notas y gestiona el final del juego.
+        Las posiciones dependen del tiempo transcurrido, así que los
+        fotogramas saltados por el reloj (``frames``) no alteran el ritmo.
+        """
         if not self.running:
-            return
+            return False
         now = time.time() * 1000.0
         elapsed = now - self.start_time
         # Dibujar o actualizar notas
@@ -342,9 +302,9 @@ class QWERHeroGame:
             self.window.unbind("<Key>")
             # Pequeña pausa antes de cerrar
             self.window.after(500, lambda: self._end_game(result))
-            return
+            return False
         # Continuar actualizando
-        self.window.after(20, self._update)
+        return True
 
     def _update_score(self) -> None:
         """Actualiza el marcador que muestra los aciertos, fallos y precisión."""
@@ -360,6 +320,7 @@ class QWERHeroGame:
 
     def _on_key(self, event: tk.Event) -> None:
         """Gestiona las pulsaciones de teclas para detectar aciertos."""
+        pressed_at = time.perf_counter()
         key = event.char.lower()
         key_map = {"q": 0, "w": 1, "e": 2, "r": 3}
         if key not in key_map:
@@ -367,7 +328,7 @@ class QWERHeroGame:
         col_idx = key_map[key]
         # Emitir sonido al pulsar la tecla asociada
         try:
-            self.play_key_sound(key)
+            self.play_key_sound(key, pressed_at)
         except Exception:
             pass
         # Buscar notas activas en esa columna cerca de la línea de golpeo
@@ -400,6 +361,11 @@ class QWERHeroGame:
         if self.game_closed:
             return
         self.game_closed = True
+        # Informe de latencia de los sonidos de teclas
+        summary = self.key_sounds.summary()
+        if summary:
+            print(summary)
+        self.key_sounds.close()
         try:
             self.window.destroy()
         except Exception:
@@ -24,14 +24,8 @@ solid background colour.
 import tkinter as tk
 import random
 import time
-import os
 
-try:
-    # Import ImageEnhance so we can adjust the brightness of the randomly chosen background.
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
 
 
 class ReactionGame:
@@ -72,28 +66,7 @@ class ReactionGame:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Attempt to load a random 'fran' background and darken it slightly.
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((w, h), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(w, h)
 
         # Keep track of widgets drawn on the canvas for easy removal
         self.widgets = []
@@ -16,15 +16,10 @@ con el resto del proyecto.
 """
 
 import tkinter as tk
-import random
 import time
-import os
 
-try:
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 
 class SpaceInvaderGame:
@@ -76,29 +71,7 @@ class SpaceInvaderGame:
         self.canvas.bind("<Button-1>", self._start_drag)
         self.canvas.bind("<B1-Motion>", self._drag)
         # Fondo
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir)
-                              if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                image_path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(image_path)
-                    try:
-                        img = img.convert("RGBA")
-                    except Exception:
-                        pass
-                    img = img.resize((self.width, self.height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(self.width, self.height)
         # Widgets
         self.widgets = []
         # Bind para controles
@@ -173,9 +146,9 @@ class SpaceInvaderGame:
                 self.aliens.append({"x": x, "y": y, "alive": True})
         # Reset bullet
         self.bullet = None
-        # Dibujar escena inicial y lanzar bucle
+        # Dibujar escena inicial y lanzar bucle (20 fps con el reloj de animación compartido)
         self._draw_scene()
-        self._game_loop()
+        animation_clock.register(self._game_loop, fps=20, name="invasores")
 
     def _move_player(self, dx: int) -> None:
         if not self.game_running:
@@ -262,16 +235,21 @@ class SpaceInvaderGame:
             all_dead = all(not a["alive"] for a in self.aliens)
             self._game_over(all_dead)
 
-    def _game_loop(self) -> None:
+    def _game_loop(self, frames: int = 1) -> bool:
+        """Fotograma del juego; lo llama el reloj de animación (``frames`` > 1 si hubo saltos)."""
         if not self.game_running or self.game_closed:
-            return
-        # Actualizar elementos
-        self._move_aliens()
-        self._update_bullet()
+            return False
+        # Actualizar elementos; se simula cada fotograma saltado para que la
+        # bala no atraviese a los aliens ni estos se salgan por el borde
+        for _ in range(frames):
+            self._move_aliens()
+            self._update_bullet()
         self._check_game_conditions()
+        if not self.game_running:
+            # No redibujar encima de la pantalla final
+            return False
         self._draw_scene()
-        # Programar siguiente iteración
-        self.window.after(50, self._game_loop)
+        return True
 
     def _draw_scene(self) -> None:
         # Limpiar canvas
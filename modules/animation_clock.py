@@ -0,0 +1,158 @@
+"""
+Reloj de animación único para toda la aplicación.
+
+Cada animación (el GIF de la mascota, el giro de la ruleta, los bucles de
+los minijuegos, el parpadeo de las barras...) programaba su propia cadena
+de ``after()`` a ritmos distintos, lo que multiplicaba los despertares del
+bucle de Tk.  ``AnimationClock`` agrupa todas las animaciones registradas
+bajo un único temporizador: en cada despertar ejecuta todas las que ya
+tocan (o están a punto de tocar) y vuelve a programarse para la siguiente.
+
+Cada animación declara los fotogramas por segundo que desea.  Si el bucle
+se retrasa, el reloj no intenta recuperar los fotogramas perdidos uno a
+uno: llama una sola vez a la animación indicándole cuántos fotogramas le
+correspondían (``frames``) para que avance su lógica en consecuencia, y los
+fotogramas saltados se contabilizan en ``dropped``.
+
+Uso::
+
+    from modules.animation_clock import animation_clock
+
+    def paso(frames):
+        ...               # avanzar ``frames`` pasos y redibujar
+        return seguir     # devolver False para dejar de animar
+
+    animation_clock.register(paso, fps=30, name="mi_animacion")
+"""
+
+import time
+import tkinter as tk
+from typing import Optional
+
+from modules.config import ANIMATION_MAX_FPS
+
+# Margen con el que se adelantan animaciones casi a punto, para atenderlas
+# en el mismo despertar en lugar de programar otro unos milisegundos después.
+COALESCE_SLACK = 0.004
+
+
+class Animation:
+    """Animación registrada en el reloj."""
+
+    def __init__(self, callback, fps: float, name: Optional[str] = None):
+        self.callback = callback
+        self.name = name or getattr(callback, "__name__", "animacion")
+        self.period = 1.0 / fps
+        self.next_due = 0.0
+        self.active = True
+        self.frames = 0
+        self.dropped = 0
+
+    def set_fps(self, fps: float) -> None:
+        """Cambia el ritmo deseado; se aplica a partir del siguiente fotograma."""
+        self.period = 1.0 / fps
+
+
+class AnimationClock:
+    """Temporizador compartido que avanza todas las animaciones registradas."""
+
+    def __init__(self, max_fps: float = ANIMATION_MAX_FPS):
+        self.widget = None
+        self.max_fps = max_fps
+        self._animations: list = []
+        self._after_id: str | None = None
+        self._scheduled_for: float | None = None
+        self.wakeups = 0
+
+    def attach(self, widget) -> None:
+        """Usa ``widget`` (normalmente la ventana raíz) para programar el reloj."""
+        self.widget = widget
+
+    def _widget(self):
+        return self.widget if self.widget is not None else tk._default_root
+
+    def set_max_fps(self, fps: float) -> None:
+        """Limita el ritmo de todas las animaciones a ``fps`` como máximo."""
+        self.max_fps = fps
+
+    def register(self, callback, fps: float, name: Optional[str] = None,
+                 immediate: bool = True) -> Animation:
+        """
+        Registra ``callback(frames)`` para que se llame ``fps`` veces por
+        segundo.  La animación se da de baja cuando ``callback`` devuelve
+        ``False`` o lanza una excepción (por ejemplo, porque su ventana ya se
+        cerró).  Con ``immediate=False`` el primer fotograma llega tras un
+        periodo completo en lugar de en el siguiente despertar.
+        """
+        anim = Animation(callback, fps, name)
+        now = time.perf_counter()
+        anim.next_due = now if immediate else now + self._period(anim)
+        self._animations.append(anim)
+        self._schedule()
+        return anim
+
+    def unregister(self, anim: Optional[Animation]) -> None:
+        """Da de baja una animación (no hace nada si ya no estaba)."""
+        if anim is None:
+            return
+        anim.active = False
+        if anim in self._animations:
+            self._animations.remove(anim)
+
+    def _period(self, anim: Animation) -> float:
+        return max(anim.period, 1.0 / self.max_fps) if self.max_fps else anim.period
+
+    def _schedule(self) -> None:
+        """Programa el próximo despertar para la animación más urgente."""
+        if not self._animations:
+            return
+        due = min(anim.next_due for anim in self._animations)
+        if self._after_id is not None:
+            if self._scheduled_for is not None and self._scheduled_for <= due:
+                return
+            try:
+                self._widget().after_cancel(self._after_id)
+            except Exception:
+                pass
+        delay_ms = max(0, int((due - time.perf_counter()) * 1000))
+        try:
+            self._after_id = self._widget().after(delay_ms, self._tick)
+            self._scheduled_for = due
+        except Exception:
+            self._after_id = None
+            self._scheduled_for = None
+
+    def _tick(self) -> None:
+        self._after_id = None
+        self._scheduled_for = None
+        self.wakeups += 1
+        now = time.perf_counter()
+        for anim in list(self._animations):
+            if not anim.active or anim.next_due > now + COALESCE_SLACK:
+                continue
+            period = self._period(anim)
+            # Fotogramas que correspondían desde la última vez (1 si vamos al día)
+            frames = 1 + max(0, int((now - anim.next_due) // period))
+            last_due = anim.next_due + (frames - 1) * period
+            try:
+                keep = anim.callback(frames)
+            except Exception:
+                keep = False
+            anim.frames += 1
+            anim.dropped += frames - 1
+            if keep is False:
+                self.unregister(anim)
+            else:
+                # El periodo puede haber cambiado dentro del callback
+                anim.next_due = last_due + self._period(anim)
+        self._schedule()
+
+    def stats(self) -> dict:
+        """Despertares totales y fotogramas/saltos de cada animación activa."""
+        return {
+            "wakeups": self.wakeups,
+            "animations": {a.name: {"frames": a.frames, "dropped": a.dropped} for a in self._animations},
+        }
+
+
+animation_clock = AnimationClock()
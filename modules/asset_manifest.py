@@ -0,0 +1,316 @@
+"""
+Índice en memoria de todos los archivos de ``assets/``.
+
+Las búsquedas de recursos estaban repartidas en sondeos del sistema de
+archivos: ``PetOverlay`` probaba cuatro extensiones con ``os.path.exists``
+para cada sprite, ``play_random_sound`` hacía ``os.listdir`` en cada
+reproducción, y la pantalla de victoria y los fondos volvían a listar sus
+carpetas.  ``asset_manifest`` recorre ``assets/`` una sola vez (la primera
+vez que se consulta) y guarda para cada archivo su tipo, tamaño, dimensiones
+si es una imagen, número de fotogramas si es un GIF y duración si es audio.
+A partir de ahí, todas las consultas se resuelven en memoria sin llamadas al
+sistema.
+
+Abrir cada imagen y cada audio para obtener sus metadatos es lo caro, así
+que el índice se guarda en ``.cache/asset_manifest.json`` junto con la
+fecha de modificación y el tamaño de cada archivo: en los siguientes
+arranques sólo se vuelven a analizar los archivos nuevos o modificados.
+
+Las rutas pueden indicarse absolutas o relativas a la raíz del proyecto
+(``os.path.join("assets", "sounds", "eat")``)::
+
+    from modules.asset_manifest import asset_manifest
+
+    asset_manifest.files("assets/sounds/eat", AUDIO_EXTENSIONS)
+    asset_manifest.first("assets/sprites", "feliz", IMAGE_EXTENSIONS)
+
+Para reconstruirlo a mano y ver un resumen::
+
+    python -m modules.asset_manifest
+"""
+
+import json
+import os
+import struct
+import threading
+import wave
+from typing import Optional
+
+from modules.config import BASE_DIR, CACHE_DIR
+
+try:
+    from PIL import Image  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "asset_manifest.json")
+MANIFEST_VERSION = 1
+
+IMAGE_EXTENSIONS = (".png", ".gif", ".jpg", ".jpeg")
+AUDIO_EXTENSIONS = (".mp3", ".wav", ".ogg")
+
+# Tablas de cabeceras MPEG de audio: kbps por (versión, capa) y Hz por versión
+_MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+
+
+def _mp3_duration(path: str) -> Optional[float]:
+    """
+    Duración en segundos de un MP3 leyendo sólo su cabecera: usa el número
+    de fotogramas de la cabecera Xing/Info o VBRI si existe y, si no, la
+    estima a partir de la tasa de bits (archivos CBR).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as fh:
+        start = 0
+        head = fh.read(10)
+        if head[:3] == b"ID3" and len(head) == 10:
+            # Etiqueta ID3v2: tamaño en 4 bytes de 7 bits
+            start = 10 + ((head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9])
+        fh.seek(start)
+        data = fh.read(16384)
+    size -= start
+    offset = 0
+    # Buscar la primera cabecera de fotograma válida
+    while offset + 4 <= len(data):
+        if data[offset] == 0xFF and (data[offset + 1] & 0xE0) == 0xE0:
+            b1, b2, b3 = data[offset + 1], data[offset + 2], data[offset + 3]
+            version = {0: 2.5, 2: 2, 3: 1}.get((b1 >> 3) & 3)
+            layer = {1: 3, 2: 2, 3: 1}.get((b1 >> 1) & 3)
+            bitrate_index = b2 >> 4
+            rate_index = (b2 >> 2) & 3
+            if version and layer and 0 < bitrate_index < 15 and rate_index < 3:
+                break
+        offset += 1
+    else:
+        return None
+    table_version = 1 if version == 1 else 2
+    bitrate = _MP3_BITRATES[(table_version, layer)][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    if layer == 1:
+        samples_per_frame = 384
+    elif layer == 2 or version == 1:
+        samples_per_frame = 1152
+    else:
+        samples_per_frame = 576
+    mono = (b3 >> 6) == 3
+    # Cabecera Xing/Info tras la información lateral del primer fotograma
+    side_info = (17 if mono else 32) if version == 1 else (9 if mono else 17)
+    xing = offset + 4 + side_info
+    if data[xing:xing + 4] in (b"Xing", b"Info") and len(data) >= xing + 12:
+        flags = struct.unpack(">I", data[xing + 4:xing + 8])[0]
+        if flags & 1:
+            frames = struct.unpack(">I", data[xing + 8:xing + 12])[0]
+            return frames * samples_per_frame / sample_rate
+    vbri = offset + 4 + 32
+    if data[vbri:vbri + 4] == b"VBRI" and len(data) >= vbri + 18:
+        frames = struct.unpack(">I", data[vbri + 14:vbri + 18])[0]
+        return frames * samples_per_frame / sample_rate
+    return (size - offset) * 8 / bitrate if bitrate else None
+
+
+def _probe(path: str, ext: str) -> dict:
+    """Metadatos de un archivo según su tipo (sin la firma de fecha/tamaño)."""
+    if ext in IMAGE_EXTENSIONS:
+        info: dict = {"type": "image"}
+        if HAS_PIL:
+            try:
+                with Image.open(path) as img:
+                    info["width"], info["height"] = img.size
+                    info["frames"] = int(getattr(img, "n_frames", 1))
+            except Exception:
+                pass
+        return info
+    if ext in AUDIO_EXTENSIONS:
+        info = {"type": "audio"}
+        try:
+            if ext == ".wav":
+                with wave.open(path, "rb") as wav:
+                    info["duration"] = round(wav.getnframes() / wav.getframerate(), 3)
+            elif ext == ".mp3":
+                duration = _mp3_duration(path)
+                if duration is not None:
+                    info["duration"] = round(duration, 3)
+        except Exception:
+            pass
+        return info
+    return {"type": "other"}
+
+
+def asset_key(path: str) -> str:
+    """Ruta relativa a la raíz del proyecto con separadores ``/``."""
+    if os.path.isabs(path):
+        path = os.path.relpath(path, BASE_DIR)
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+class AssetManifest:
+    """Índice de archivos de ``assets/`` consultable sin tocar el disco."""
+
+    def __init__(self, root: str = ASSETS_DIR, cache_path: str = MANIFEST_PATH):
+        self.root = root
+        self.cache_path = cache_path
+        self._entries: dict = {}
+        self._dirs: dict = {}
+        self._lock = threading.RLock()
+        self._built = False
+        self.probed = 0
+        self.reused = 0
+
+    def build(self) -> "AssetManifest":
+        """Recorre ``assets/`` reutilizando los metadatos del índice guardado."""
+        with self._lock:
+            previous = self._load_cached()
+            entries: dict = {}
+            dirs: dict = {}
+            for dirpath, dirnames, filenames in os.walk(self.root):
+                dirnames.sort()
+                dirs[asset_key(dirpath)] = self._index_dir(dirpath, filenames, previous, entries)
+            changed = self.probed > 0 or set(previous) != set(entries)
+            self._entries = entries
+            self._dirs = dirs
+            self._built = True
+            if changed:
+                self._save()
+        return self
+
+    def rescan(self, directory: str) -> None:
+        """Vuelve a indexar una carpeta (p. ej. tras recargar sprites en caliente)."""
+        self._ensure()
+        rel = asset_key(directory)
+        full = os.path.join(BASE_DIR, rel)
+        with self._lock:
+            try:
+                names = [n for n in os.listdir(full) if os.path.isfile(os.path.join(full, n))]
+            except OSError:
+                names = []
+            entries = dict(self._entries)
+            for old in self._dirs.get(rel, []):
+                entries.pop(f"{rel}/{old}", None)
+            self._dirs[rel] = self._index_dir(full, names, self._entries, entries)
+            self._entries = entries
+            self._save()
+
+    def _index_dir(self, dirpath: str, filenames: list, previous: dict, entries: dict) -> list:
+        names = []
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            rel = asset_key(path)
+            signature = [st.st_mtime_ns, st.st_size]
+            cached = previous.get(rel)
+            if cached is not None and cached.get("signature") == signature:
+                record = cached
+                self.reused += 1
+            else:
+                record = _probe(path, os.path.splitext(name)[1].lower())
+                record["size"] = st.st_size
+                record["signature"] = signature
+                self.probed += 1
+            entries[rel] = record
+            names.append(name)
+        return names
+
+    def _load_cached(self) -> dict:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") == MANIFEST_VERSION:
+                return data.get("files", {})
+        except Exception:
+            pass
+        return {}
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                json.dump({"version": MANIFEST_VERSION, "files": self._entries}, fh)
+            os.replace(tmp_path, self.cache_path)
+        except Exception:
+            pass
+
+    def _ensure(self) -> None:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    self.build()
+
+    def get(self, path: str) -> Optional[dict]:
+        """Metadatos de ``path`` o ``None`` si no existe."""
+        self._ensure()
+        return self._entries.get(asset_key(path))
+
+    def exists(self, path: str) -> bool:
+        return self.get(path) is not None
+
+    def files(self, directory: str, extensions=None, prefix: Optional[str] = None) -> list:
+        """
+        Rutas absolutas de los archivos de ``directory`` (sin recorrer
+        subcarpetas), ordenadas por nombre y filtradas por extensión y
+        prefijo (sin distinguir mayúsculas).
+        """
+        self._ensure()
+        rel = asset_key(directory)
+        result = []
+        for name in self._dirs.get(rel, []):
+            lower = name.lower()
+            if extensions and not lower.endswith(tuple(extensions)):
+                continue
+            if prefix and not lower.startswith(prefix.lower()):
+                continue
+            result.append(os.path.join(BASE_DIR, rel, name))
+        return result
+
+    def first(self, directory: str, stem: str, extensions) -> Optional[str]:
+        """
+        Ruta del archivo ``stem`` + extensión de ``directory`` probando las
+        extensiones en el orden dado, o ``None``.
+        """
+        self._ensure()
+        rel = asset_key(directory)
+        for ext in extensions:
+            if f"{rel}/{stem}{ext}" in self._entries:
+                return os.path.join(BASE_DIR, rel, stem + ext)
+        return None
+
+    def stats(self) -> dict:
+        """Archivos indexados y cuántos se analizaron o reutilizaron del índice guardado."""
+        self._ensure()
+        by_type: dict = {}
+        for record in self._entries.values():
+            by_type[record["type"]] = by_type.get(record["type"], 0) + 1
+        return {"files": len(self._entries), "types": by_type,
+                "probed": self.probed, "reused": self.reused}
+
+
+asset_manifest = AssetManifest()
+
+
+def main() -> None:
+    manifest = AssetManifest().build()
+    stats = manifest.stats()
+    print(f"{stats['files']} archivos indexados ({stats['probed']} analizados, "
+          f"{stats['reused']} reutilizados)")
+    for kind, count in sorted(stats["types"].items()):
+        print(f"  {kind}: {count}")
+    audio = [r.get("duration", 0) for r in manifest._entries.values() if r["type"] == "audio"]
+    if audio:
+        print(f"  audio total: {sum(audio):.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Paquete de recursos en un único archivo proyectado en memoria.
+
+``assets/`` son cientos de archivos pequeños (GIF, PNG y sobre todo MP3)
+que se abren uno a uno.  Este módulo los empaqueta en ``assets.pack``::
+
+    python -m modules.asset_pack            # genera assets.pack desde assets/
+    python -m modules.asset_pack --list     # muestra el índice
+
+Formato: la firma ``MDPK``, la versión y la longitud del índice (dos
+enteros de 32 bits little‑endian), el índice en JSON y a continuación los
+datos.  El índice asocia cada ruta (relativa a la raíz del proyecto) con
+``offset``, ``length``, el hash SHA‑1 del contenido y la firma
+``[mtime_ns, tamaño]`` del archivo de origen.  Los archivos con el mismo
+contenido se guardan una sola vez y comparten ``offset``.
+
+Al leer, el paquete se abre con ``mmap`` y cada recurso es un
+``memoryview`` sobre esa proyección, sin copias.  ``open_asset`` devuelve
+un objeto de archivo de sólo lectura sobre ese ``memoryview`` que Pillow
+puede abrir directamente.  Una entrada sólo se usa si su firma coincide con
+la que tiene el índice de recursos (``modules/asset_manifest.py``) para el
+archivo suelto; si no hay paquete, o el archivo ha cambiado desde que se
+generó, se lee el archivo suelto como siempre.
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Optional
+
+from modules.asset_manifest import asset_key, asset_manifest
+from modules.config import BASE_DIR
+
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+PACK_PATH = os.path.join(BASE_DIR, "assets.pack")
+PACK_MAGIC = b"MDPK"
+PACK_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+# Carpetas generadas a partir de otros recursos que no se empaquetan
+EXCLUDED_DIRS = ("atlas",)
+
+
+def build_pack(assets_dir: str = ASSETS_DIR, out_path: str = PACK_PATH) -> dict:
+    """
+    Empaqueta todos los archivos de ``assets_dir`` en ``out_path``.
+    Devuelve un resumen con archivos, blobs únicos y bytes ahorrados.
+    """
+    files: dict = {}
+    blobs: list = []
+    by_hash: dict = {}
+    offset = 0
+    total = 0
+    for dirpath, dirnames, filenames in os.walk(assets_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as fh:
+                data = fh.read()
+            st = os.stat(path)
+            digest = hashlib.sha1(data).hexdigest()
+            total += len(data)
+            if digest not in by_hash:
+                by_hash[digest] = offset
+                blobs.append(data)
+                offset += len(data)
+            files[asset_key(path)] = {
+                "offset": by_hash[digest],
+                "length": len(data),
+                "hash": digest,
+                "signature": [st.st_mtime_ns, st.st_size],
+            }
+    index = json.dumps({"files": files}, separators=(",", ":")).encode("utf-8")
+    tmp_path = out_path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(index)))
+        fh.write(index)
+        for data in blobs:
+            fh.write(data)
+    os.replace(tmp_path, out_path)
+    return {"files": len(files), "blobs": len(blobs), "bytes": offset, "deduplicated": total - offset}
+
+
+class PackFile(io.RawIOBase):
+    """Archivo de sólo lectura sobre un ``memoryview`` (sin copiar los datos)."""
+
+    def __init__(self, view: memoryview, name: str = ""):
+        super().__init__()
+        self._view = view
+        self._pos = 0
+        self.name = name
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        n = len(chunk)
+        buffer[:n] = chunk
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class AssetPack:
+    """Paquete abierto con ``mmap``; ``view(ruta)`` devuelve un ``memoryview``."""
+
+    def __init__(self, path: str = PACK_PATH):
+        self.path = path
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_size = _HEADER.unpack_from(self._map, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} no es un paquete de recursos válido")
+        start = _HEADER.size
+        self.files: dict = json.loads(bytes(self._map[start:start + index_size]))["files"]
+        self._data = memoryview(self._map)[start + index_size:]
+        self.hits = 0
+
+    def __contains__(self, path: str) -> bool:
+        return asset_key(path) in self.files
+
+    def entry(self, path: str) -> Optional[dict]:
+        return self.files.get(asset_key(path))
+
+    def view(self, path: str) -> memoryview:
+        """Contenido de ``path`` como ``memoryview`` sobre la proyección."""
+        info = self.files[asset_key(path)]
+        self.hits += 1
+        return self._data[info["offset"]:info["offset"] + info["length"]]
+
+
+_pack = None
+_pack_lock = threading.Lock()
+_pack_checked = False
+
+
+def get_pack() -> Optional[AssetPack]:
+    """Paquete compartido, o ``None`` si no existe o no se puede abrir."""
+    global _pack, _pack_checked
+    if not _pack_checked:
+        with _pack_lock:
+            if not _pack_checked:
+                try:
+                    _pack = AssetPack(PACK_PATH)
+                except Exception:
+                    _pack = None
+                _pack_checked = True
+    return _pack
+
+
+def open_asset(path: str):
+    """
+    Abre ``path`` para lectura binaria.  Si el paquete contiene una copia
+    igual a la del archivo suelto se sirve desde la proyección en memoria;
+    si no, se abre el archivo suelto.
+    """
+    pack = get_pack()
+    if pack is not None:
+        info = pack.entry(path)
+        record = asset_manifest.get(path) if info is not None else None
+        if record is not None and record.get("signature") == info["signature"]:
+            return io.BufferedReader(PackFile(pack.view(path), name=path))
+    return open(path, "rb")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Empaqueta assets/ en un único archivo.")
+    parser.add_argument("--assets", default=ASSETS_DIR, help="carpeta de recursos de origen")
+    parser.add_argument("--out", default=PACK_PATH, help="archivo de paquete a generar")
+    parser.add_argument("--list", action="store_true", help="mostrar el índice del paquete existente")
+    args = parser.parse_args()
+    if args.list:
+        pack = AssetPack(args.out)
+        for rel, info in sorted(pack.files.items()):
+            print(f"{info['offset']:>10} {info['length']:>9} {info['hash'][:12]} {rel}")
+        return
+    summary = build_pack(args.assets, args.out)
+    print(f"{summary['files']} archivos, {summary['blobs']} contenidos únicos, "
+          f"{summary['bytes'] / 1048576:.1f} MB "
+          f"({summary['deduplicated'] / 1048576:.1f} MB ahorrados por duplicados) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,423 @@
+"""
+Servicio de audio compartido.
+
+``play_random_sound`` creaba un ``threading.Thread`` nuevo en cada llamada y,
+en Linux, un proceso ``aplay``/``paplay`` que nadie esperaba.  Pulsar
+repetidamente "Comer" o los botones de sonido del panel de administración
+creaba hilos y procesos sin límite.
+
+``audio_service`` los sustituye por un único hilo de larga duración que lee
+una cola de peticiones:
+
+- Las carpetas se consultan en el índice de recursos
+  (``modules/asset_manifest.py``), sin listar el disco.
+- Suenan a la vez como mucho ``AUDIO_MAX_VOICES`` clips.  Si no hay voz
+  libre, la petición espera en la cola; si la espera supera
+  ``AUDIO_MAX_QUEUE_DELAY_MS``, se descarta (un sonido de "comer" que llega
+  un segundo tarde ya no tiene sentido).
+- Pedir la misma carpeta o archivo otra vez antes de ``AUDIO_COALESCE_MS``
+  no encola nada: las pulsaciones repetidas se agrupan en un solo sonido.
+- Con la cola llena (``AUDIO_QUEUE_SIZE``) las nuevas peticiones se
+  descartan en lugar de acumularse.
+
+Los clips suenan por el mezclador interno (``modules/mixer.py``) cuando
+hay salida de sonido y decodificador; si no, con un reproductor externo.
+Los reproductores externos se lanzan con ``modules/process_pool.py``, que
+los recoge al terminar y los mata si se cuelgan.  Una voz está ocupada
+mientras suena en el mezclador, mientras vive su proceso reproductor o, si el clip se lanzó sin proceso (``playsound``,
+``winsound``), durante la duración que indica el índice de recursos.
+
+``stats()`` devuelve la profundidad de la cola y la latencia entre la
+petición y el inicio de la reproducción.  Para simular pulsaciones repetidas
+con un reproductor falso y comparar con un hilo por sonido::
+
+    python -m modules.audio --bench
+"""
+
+import argparse
+import os
+import platform
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Optional
+
+from modules.asset_manifest import AUDIO_EXTENSIONS, asset_manifest
+from modules.audio_cache import audio_cache
+from modules.config import (
+    AUDIO_COALESCE_MS,
+    AUDIO_MAX_QUEUE_DELAY_MS,
+    AUDIO_MAX_VOICES,
+    AUDIO_PLAYER_COMMAND,
+    AUDIO_QUEUE_SIZE,
+    PLAYER_KILL_MARGIN_S,
+)
+from modules.mixer import mixer
+from modules.process_pool import process_pool
+
+try:
+    # playsound es una librería sencilla para reproducir clips de audio. Si no
+    # está disponible, se usan las utilidades del sistema.
+    from playsound import playsound  # type: ignore
+except Exception:
+    playsound = None
+
+# Duración supuesta de un clip cuyo índice no la indica (segundos)
+DEFAULT_CLIP_SECONDS = 3.0
+# Intervalo con el que el hilo comprueba si se ha liberado una voz
+VOICE_POLL_SECONDS = 0.01
+
+
+def simple_play_sound(file_path: str, timeout: Optional[float] = None):
+    """
+    Reproduce ``file_path`` de forma asíncrona con las utilidades del
+    sistema, sin abrir un reproductor gráfico.  Los reproductores se lanzan
+    con ``process_pool`` y se terminan si siguen vivos pasado ``timeout``.
+    Devuelve el proceso del reproductor si se lanzó uno, ``True`` si el
+    sistema lo reproduce sin proceso (Windows) o ``None`` si no se pudo.
+    """
+    system = platform.system()
+    try:
+        if AUDIO_PLAYER_COMMAND:
+            # Reproductor fijado en la configuración
+            return process_pool.spawn([arg.replace("{path}", file_path) for arg in AUDIO_PLAYER_COMMAND],
+                                      timeout)
+        if system == 'Windows':
+            # En Windows, usa winsound para WAV y la API MCI para otros
+            ext = os.path.splitext(file_path)[1].lower()
+            try:
+                import winsound  # type: ignore
+                if ext == '.wav':
+                    winsound.PlaySound(file_path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+                    return True
+            except Exception:
+                pass
+            # Para otros formatos (MP3, OGG, etc.), utiliza mciSendString
+            try:
+                import ctypes
+                # Alias único: se cierra el anterior antes de abrir el nuevo
+                alias = 'media'
+                try:
+                    ctypes.windll.winmm.mciSendStringW(f'close {alias}', None, 0, None)
+                except Exception:
+                    pass
+                ctypes.windll.winmm.mciSendStringW(f'open "{file_path}" alias {alias}', None, 0, None)
+                # Reproducir desde el principio de forma asíncrona
+                ctypes.windll.winmm.mciSendStringW(f'play {alias} from 0', None, 0, None)
+                return True
+            except Exception:
+                pass
+        elif system == 'Darwin':
+            # macOS incluye afplay para reproducir audio
+            return process_pool.spawn(['afplay', file_path], timeout)
+        else:
+            # En sistemas Linux se puede utilizar aplay o paplay
+            for player in ('aplay', 'paplay'):
+                try:
+                    return process_pool.spawn([player, file_path], timeout)
+                except FileNotFoundError:
+                    pass
+    except Exception:
+        pass
+    return None
+
+
+def default_player(file_path: str):
+    """
+    Lanza ``file_path`` con el primer método que funcione y devuelve lo
+    mismo que ``simple_play_sound`` (o la voz del mezclador).  Orden: el
+    mezclador interno, playsound sin bloquear, las utilidades del sistema,
+    el reproductor predeterminado y, como último recurso, el navegador.
+    """
+    # 0) Mezclador interno: el clip se decodifica una vez y se mezcla sin
+    # lanzar procesos (ver modules/mixer.py)
+    try:
+        voice = mixer.play(file_path)
+        if voice is not None:
+            return voice
+    except Exception:
+        pass
+    if process_pool.full:
+        # Ya hay demasiados reproductores vivos: mejor no sonar que abrir
+        # el reproductor predeterminado o el navegador
+        return None
+    # Un reproductor que sigue vivo mucho después de acabar su clip se termina
+    record = asset_manifest.get(file_path) or {}
+    timeout = record["duration"] + PLAYER_KILL_MARGIN_S if record.get("duration") else None
+    # Los reproductores externos usan el WAV ya convertido si existe (ver
+    # modules/audio_cache.py): no decodifican MP3 y ``aplay`` y ``winsound``
+    # sólo entienden WAV
+    file_path = audio_cache.lookup(file_path) or file_path
+    # 1) Usar playsound si está disponible
+    if playsound is not None:
+        try:
+            playsound(file_path, False)
+            return True
+        except Exception:
+            pass
+    # 2) Utilidades del sistema
+    handle = simple_play_sound(file_path, timeout)
+    if handle is not None:
+        return handle
+    # 3) Reproductor predeterminado del sistema operativo.  Puede abrir una
+    # ventana, pero sirve como último recurso.
+    try:
+        if sys.platform.startswith('win'):
+            os.startfile(file_path)  # type: ignore[attr-defined]
+            return True
+        opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+        return process_pool.spawn([opener, file_path], timeout)
+    except Exception:
+        pass
+    # 4) Último recurso: abrir en navegador
+    try:
+        import webbrowser
+        if webbrowser.open('file://' + file_path):
+            return True
+    except Exception:
+        pass
+    return None
+
+
+class _Voice:
+    """Clip en reproducción: su proceso, si lo hay, y cuándo debería acabar."""
+
+    __slots__ = ("process", "ends_at")
+
+    def __init__(self, process, ends_at: float):
+        self.process = process
+        self.ends_at = ends_at
+
+    def stop(self) -> None:
+        """Corta el clip si es posible (voz del mezclador o proceso reproductor)."""
+        for name in ("stop", "terminate"):
+            method = getattr(self.process, name, None)
+            if method is not None:
+                method()
+                return
+
+    def active(self, now: float) -> bool:
+        if self.process is not None:
+            # ``poll`` también recoge el proceso cuando ha terminado
+            return self.process.poll() is None
+        return now < self.ends_at
+
+
+class AudioService:
+    """Un hilo de audio con cola, límite de voces y agrupación de repeticiones."""
+
+    def __init__(self, max_voices: int = AUDIO_MAX_VOICES, coalesce_ms: float = AUDIO_COALESCE_MS,
+                 queue_size: int = AUDIO_QUEUE_SIZE, max_delay_ms: float = AUDIO_MAX_QUEUE_DELAY_MS,
+                 player=default_player, manifest=asset_manifest, on_start=None,
+                 steal: bool = False):
+        self.max_voices = max(1, max_voices)
+        # Con ``steal``, si no hay voz libre se corta la más antigua en lugar de esperar
+        self.steal = steal
+        self.coalesce_ms = coalesce_ms
+        self.max_delay_ms = max_delay_ms
+        self.player = player
+        self.manifest = manifest
+        # Función ``(ruta, latencia_ms)`` que se llama al empezar cada sonido
+        self.on_start = on_start
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._last_request: dict = {}
+        self._voices: list = []
+        self._thread: threading.Thread | None = None
+        # Métricas
+        self.requested = 0
+        self.played = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.stale = 0
+        self.stolen = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.max_voices_used = 0
+        self.last_latency_ms = 0.0
+        self.max_latency_ms = 0.0
+        self._latency_total_ms = 0.0
+
+    def play_random(self, folder: str, requested_at: Optional[float] = None) -> bool:
+        """
+        Encola un sonido al azar de ``folder`` (absoluta o relativa a la
+        raíz del proyecto).  Devuelve ``False`` si la petición se agrupó con
+        una anterior o se descartó.  ``requested_at`` (``time.perf_counter()``)
+        adelanta el origen de la latencia, p. ej. al momento de una pulsación.
+        """
+        return self._submit(folder, folder, None, requested_at)
+
+    def play_file(self, file_path: str, requested_at: Optional[float] = None) -> bool:
+        """Encola ``file_path``.  Devuelve ``False`` si se agrupó o se descartó."""
+        return self._submit(file_path, None, file_path, requested_at)
+
+    def _submit(self, key: str, folder: Optional[str], file_path: Optional[str],
+                requested_at: Optional[float] = None) -> bool:
+        now = time.perf_counter()
+        with self._lock:
+            self.requested += 1
+            last = self._last_request.get(key)
+            if last is not None and (now - last) * 1000.0 < self.coalesce_ms:
+                self.coalesced += 1
+                return False
+            self._last_request[key] = now
+            try:
+                self._queue.put_nowait((folder, file_path, now if requested_at is None else requested_at))
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audio", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            request = self._queue.get()
+            if request is None:
+                self._queue.task_done()
+                break
+            try:
+                self._handle(*request)
+            except Exception:
+                self.failed += 1
+            self._queue.task_done()
+
+    def _handle(self, folder: Optional[str], file_path: Optional[str], requested_at: float) -> None:
+        # Esperar una voz libre mientras la petición siga siendo oportuna
+        while True:
+            now = time.perf_counter()
+            if (now - requested_at) * 1000.0 > self.max_delay_ms:
+                self.stale += 1
+                return
+            self._voices = [voice for voice in self._voices if voice.active(now)]
+            if len(self._voices) < self.max_voices:
+                break
+            if self.steal:
+                self._voices.pop(0).stop()
+                self.stolen += 1
+                break
+            time.sleep(VOICE_POLL_SECONDS)
+        if file_path is None:
+            files = self.manifest.files(folder, AUDIO_EXTENSIONS)
+            if not files:
+                return
+            file_path = random.choice(files)
+        handle = self.player(file_path)
+        started = time.perf_counter()
+        if handle is None:
+            self.failed += 1
+            return
+        record = self.manifest.get(file_path) or {}
+        duration = record.get("duration") or DEFAULT_CLIP_SECONDS
+        process = handle if hasattr(handle, "poll") else None
+        self._voices.append(_Voice(process, started + duration))
+        self.max_voices_used = max(self.max_voices_used, len(self._voices))
+        latency_ms = (started - requested_at) * 1000.0
+        self.played += 1
+        self.last_latency_ms = latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        self._latency_total_ms += latency_ms
+        if self.on_start is not None:
+            try:
+                self.on_start(file_path, latency_ms)
+            except Exception:
+                pass
+
+    def wait_idle(self, timeout: float = 5.0) -> bool:
+        """Espera a que la cola se vacíe (para pruebas y el banco de medidas)."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if self._queue.unfinished_tasks == 0:
+                return True
+            time.sleep(VOICE_POLL_SECONDS)
+        return False
+
+    def shutdown(self) -> None:
+        """Detiene el hilo de audio cuando termine lo que hay en la cola."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+
+    def stats(self) -> dict:
+        """Contadores de peticiones, cola, voces y latencia en ms."""
+        now = time.perf_counter()
+        return {
+            "requested": self.requested,
+            "played": self.played,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "stale": self.stale,
+            "stolen": self.stolen,
+            "failed": self.failed,
+            "queue_depth": self._queue.qsize(),
+            "max_queue_depth": self.max_queue_depth,
+            "active_voices": sum(1 for voice in list(self._voices) if voice.active(now)),
+            "max_voices_used": self.max_voices_used,
+            "last_latency_ms": round(self.last_latency_ms, 1),
+            "avg_latency_ms": round(self._latency_total_ms / self.played, 1) if self.played else 0.0,
+            "max_latency_ms": round(self.max_latency_ms, 1),
+        }
+
+
+audio_service = AudioService()
+
+
+class _FakeProcess:
+    """Proceso reproductor simulado que "suena" durante ``seconds``."""
+
+    def __init__(self, seconds: float):
+        self.ends_at = time.perf_counter() + seconds
+
+    def poll(self):
+        return 0 if time.perf_counter() >= self.ends_at else None
+
+
+def benchmark(presses: int = 40, interval_ms: float = 30.0, clip_ms: float = 400.0) -> None:
+    """
+    Simula ``presses`` pulsaciones de "Comer" cada ``interval_ms`` con un
+    reproductor falso cuyos clips duran ``clip_ms``, y compara con un hilo y
+    un proceso por pulsación como antes.
+    """
+    folder = os.path.join("assets", "sounds", "eat")
+    if not asset_manifest.files(folder, AUDIO_EXTENSIONS):
+        print(f"No hay sonidos en {folder}")
+        return
+    service = AudioService(player=lambda path: _FakeProcess(clip_ms / 1000.0))
+    threads_before = threading.active_count()
+    peak_threads = 0
+    for _ in range(presses):
+        service.play_random(folder)
+        peak_threads = max(peak_threads, threading.active_count() - threads_before)
+        time.sleep(interval_ms / 1000.0)
+    service.wait_idle()
+    stats = service.stats()
+    service.shutdown()
+    print(f"{presses} pulsaciones cada {interval_ms:.0f} ms, clips de {clip_ms:.0f} ms:")
+    print(f"  antes: {presses} hilos y {presses} procesos reproductores")
+    print(f"  ahora: {peak_threads} hilo(s) nuevos, {stats['played']} reproducidos, "
+          f"{stats['coalesced']} agrupados, {stats['stale']} caducados, {stats['dropped']} descartados")
+    print(f"  voces simultáneas máx. {stats['max_voices_used']}/{service.max_voices}, "
+          f"cola máx. {stats['max_queue_depth']}, latencia media {stats['avg_latency_ms']} ms "
+          f"(máx. {stats['max_latency_ms']} ms)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servicio de audio compartido.")
+    parser.add_argument("--bench", action="store_true", help="simular pulsaciones repetidas")
+    parser.add_argument("--presses", type=int, default=40, help="número de pulsaciones")
+    parser.add_argument("--interval", type=float, default=30.0, help="ms entre pulsaciones")
+    parser.add_argument("--clip", type=float, default=400.0, help="duración de cada clip en ms")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.presses, args.interval, args.clip)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
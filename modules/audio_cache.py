@@ -0,0 +1,325 @@
+"""
+Caché en disco de sonidos transcodificados a WAV normalizado.
+
+Decodificar los MP3 al reproducirlos es lo más caro que hacen los caminos
+de audio: cada reproductor externo vuelve a decodificar el archivo, y en
+Linux ``aplay`` ni siquiera entiende MP3 (sólo WAV).  Este comando convierte
+de antemano todos los sonidos de ``assets/sounds`` (subcarpetas incluidas)
+repartiendo el trabajo en un ``ProcessPoolExecutor``::
+
+    python -m modules.audio_cache              # todos los núcleos
+    python -m modules.audio_cache --workers 2
+
+Si no hay ni ``miniaudio`` ni ``ffmpeg`` el comando avisa y no hace nada
+(los scripts de instalación lo ejecutan siempre).
+
+Cada sonido se decodifica (``decode_clip`` del mezclador o, si no hay
+``miniaudio``, ``ffmpeg``) a PCM de 16 bits con la frecuencia y los
+canales del mezclador, se normaliza su volumen medio (RMS) a
+``AUDIO_NORMALIZE_DBFS`` limitando la ganancia para que ningún pico pase de
+``AUDIO_PEAK_CEILING``, y se guarda en ``.cache/audio`` como
+``<sha1 del archivo de origen>-<Hz>-<canales>-n<dBFS>.wav``.  Los sonidos
+con el mismo contenido comparten un único WAV.
+
+Un índice (``index.json``) asocia cada sonido con su hash y la firma de
+fecha y tamaño del archivo de origen.  ``lookup`` lo consulta en memoria:
+si la firma coincide con la del índice de recursos devuelve la ruta del
+WAV, y si el sonido ha cambiado o no se ha convertido, ``None``.
+``modules/audio.py`` y ``modules/mixer.py`` usan el WAV cuando existe, de
+modo que el camino rápido de WAV (``winsound`` en Windows, ``aplay`` en
+Linux) vale para todos los sonidos y el mezclador no necesita decodificar.
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import subprocess
+import threading
+import time
+import wave
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from modules.asset_manifest import AUDIO_EXTENSIONS, asset_key, asset_manifest
+from modules.asset_pack import open_asset
+from modules.config import (
+    AUDIO_CACHE_DIR,
+    AUDIO_NORMALIZE_DBFS,
+    AUDIO_PEAK_CEILING,
+    BASE_DIR,
+    MIXER_CHANNELS,
+    MIXER_SAMPLE_RATE,
+)
+
+try:
+    import audioop  # type: ignore
+except Exception:
+    audioop = None
+
+SOUNDS_DIR = os.path.join(BASE_DIR, "assets", "sounds")
+INDEX_VERSION = 1
+SAMPLE_WIDTH = 2
+
+
+def _rms_peak(pcm: bytes) -> tuple:
+    if audioop is not None:
+        return audioop.rms(pcm, SAMPLE_WIDTH), audioop.max(pcm, SAMPLE_WIDTH)
+    samples = array("h", pcm)
+    if not samples:
+        return 0, 0
+    rms = math.sqrt(sum(s * s for s in samples) / len(samples))
+    return int(rms), max(abs(s) for s in samples)
+
+
+def _scale(pcm: bytes, gain: float) -> bytes:
+    if audioop is not None:
+        return audioop.mul(pcm, SAMPLE_WIDTH, gain)
+    samples = array("h", pcm)
+    for i, value in enumerate(samples):
+        samples[i] = max(-32768, min(32767, int(value * gain)))
+    return samples.tobytes()
+
+
+def normalize(pcm: bytes, target_dbfs: float = AUDIO_NORMALIZE_DBFS,
+              peak_ceiling: float = AUDIO_PEAK_CEILING) -> tuple:
+    """
+    ``(pcm, ganancia_dB)``: ``pcm`` con su RMS llevado a ``target_dbfs``,
+    con la ganancia limitada para que el pico no supere ``peak_ceiling``
+    (fracción del fondo de escala).  El silencio se devuelve tal cual.
+    """
+    rms, peak = _rms_peak(pcm)
+    if rms == 0 or peak == 0:
+        return pcm, 0.0
+    gain = min(32768.0 * 10 ** (target_dbfs / 20.0) / rms, peak_ceiling * 32767.0 / peak)
+    return _scale(pcm, gain), 20.0 * math.log10(gain)
+
+
+def _ffmpeg_decode(path: str, sample_rate: int, channels: int) -> bytes:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        raise ValueError(f"no hay decodificador para {os.path.basename(path)} "
+                         "(pip install miniaudio o instalar ffmpeg)")
+    result = subprocess.run([ffmpeg, "-v", "error", "-i", path, "-f", "s16le",
+                             "-ac", str(channels), "-ar", str(sample_rate), "-"],
+                            capture_output=True, timeout=120)
+    if result.returncode != 0:
+        raise ValueError(result.stderr.decode("utf-8", "replace").strip() or "ffmpeg falló")
+    return result.stdout
+
+
+def decode_source(path: str, sample_rate: int = MIXER_SAMPLE_RATE,
+                  channels: int = MIXER_CHANNELS) -> bytes:
+    """PCM de 16 bits de ``path`` con el decodificador del mezclador o, si no puede, ``ffmpeg``."""
+    from modules.mixer import decode_clip
+
+    try:
+        return decode_clip(path, sample_rate, channels)
+    except Exception:
+        return _ffmpeg_decode(path, sample_rate, channels)
+
+
+def decoder_available() -> bool:
+    """Si hay con qué decodificar los MP3: ``miniaudio`` o ``ffmpeg``."""
+    from modules.mixer import HAS_MINIAUDIO
+
+    return HAS_MINIAUDIO or shutil.which("ffmpeg") is not None
+
+
+def _wav_name(digest: str, sample_rate: int, channels: int, target_dbfs: float) -> str:
+    return f"{digest}-{sample_rate}-{channels}-n{abs(target_dbfs):g}.wav"
+
+
+def transcode_file(path: str, out_dir: str = AUDIO_CACHE_DIR, sample_rate: int = MIXER_SAMPLE_RATE,
+                   channels: int = MIXER_CHANNELS, target_dbfs: float = AUDIO_NORMALIZE_DBFS) -> dict:
+    """
+    Convierte un sonido (se ejecuta en un proceso del pool).  Devuelve su
+    entrada para el índice más tiempos y tamaños para el informe; si no se
+    pudo, ``error`` explica por qué.
+    """
+    st = os.stat(path)
+    result = {"key": asset_key(path), "signature": [st.st_mtime_ns, st.st_size],
+              "source_bytes": st.st_size}
+    try:
+        with open_asset(path) as fh:
+            digest = hashlib.sha1(fh.read()).hexdigest()
+        name = _wav_name(digest, sample_rate, channels, target_dbfs)
+        out_path = os.path.join(out_dir, name)
+        result.update(hash=digest, wav=name)
+        if os.path.exists(out_path):
+            # Mismo contenido ya convertido (otra copia del sonido o una ejecución anterior)
+            result.update(reused=True, output_bytes=os.path.getsize(out_path))
+            return result
+        start = time.perf_counter()
+        pcm = decode_source(path, sample_rate, channels)
+        result["decode_s"] = time.perf_counter() - start
+        pcm, result["gain_db"] = normalize(pcm, target_dbfs)
+        os.makedirs(out_dir, exist_ok=True)
+        tmp_path = f"{out_path}.{os.getpid()}.tmp"
+        with wave.open(tmp_path, "wb") as wav:
+            wav.setnchannels(channels)
+            wav.setsampwidth(SAMPLE_WIDTH)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        os.replace(tmp_path, out_path)
+        result.update(output_bytes=os.path.getsize(out_path),
+                      seconds=len(pcm) / (SAMPLE_WIDTH * channels * sample_rate))
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+class AudioCache:
+    """Consulta en memoria de los WAV ya convertidos por ``python -m modules.audio_cache``."""
+
+    def __init__(self, directory: str = AUDIO_CACHE_DIR, sample_rate: int = MIXER_SAMPLE_RATE,
+                 channels: int = MIXER_CHANNELS, target_dbfs: float = AUDIO_NORMALIZE_DBFS,
+                 manifest=asset_manifest):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.target_dbfs = target_dbfs
+        self.manifest = manifest
+        self._entries: dict | None = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _load(self) -> dict:
+        if self._entries is None:
+            with self._lock:
+                if self._entries is None:
+                    self._entries = self._read_index()
+        return self._entries
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if data.get("version") != INDEX_VERSION:
+                return {}
+            # Sólo las entradas con el formato actual cuyo WAV sigue en disco
+            existing = set(os.listdir(self.directory))
+            return {key: entry for key, entry in data.get("files", {}).items()
+                    if entry.get("wav") == _wav_name(entry.get("hash", ""), self.sample_rate,
+                                                     self.channels, self.target_dbfs)
+                    and entry["wav"] in existing}
+        except Exception:
+            return {}
+
+    def save(self, results: list) -> None:
+        """Actualiza el índice con los resultados de ``transcode_file``."""
+        entries = dict(self._read_index())
+        for r in results:
+            if "error" not in r:
+                entries[r["key"]] = {"signature": r["signature"], "hash": r["hash"], "wav": r["wav"]}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"version": INDEX_VERSION, "files": entries}, fh)
+        os.replace(tmp_path, self.index_path)
+        with self._lock:
+            self._entries = None
+
+    def lookup(self, path: str) -> Optional[str]:
+        """Ruta del WAV de ``path`` si está convertido y al día, o ``None``."""
+        entry = self._load().get(asset_key(path))
+        record = self.manifest.get(path) if entry is not None else None
+        if record is None or record.get("signature") != entry["signature"]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return os.path.join(self.directory, entry["wav"])
+
+    def stats(self) -> dict:
+        return {"files": len(self._load()), "hits": self.hits, "misses": self.misses}
+
+
+audio_cache = AudioCache()
+
+
+def collect_sounds(root: str = SOUNDS_DIR) -> list:
+    """Todos los sonidos de ``root`` y sus subcarpetas, según el índice de recursos."""
+    sounds = []
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames.sort()
+        sounds.extend(asset_manifest.files(dirpath, AUDIO_EXTENSIONS))
+    return sounds
+
+
+def run(workers: Optional[int] = None, cache: AudioCache = audio_cache) -> list:
+    """Convierte todos los sonidos en paralelo, actualiza el índice y devuelve los resultados."""
+    sounds = collect_sounds()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(transcode_file, sounds, [cache.directory] * len(sounds),
+                                [cache.sample_rate] * len(sounds), [cache.channels] * len(sounds),
+                                [cache.target_dbfs] * len(sounds)))
+    cache.save(results)
+    return results
+
+
+def _startup_ms(path: str, wav_path: Optional[str]) -> tuple:
+    """Tiempo hasta tener el PCM listo: decodificando el original y leyendo el WAV."""
+    start = time.perf_counter()
+    decode_source(path)
+    decode_ms = (time.perf_counter() - start) * 1000.0
+    if wav_path is None:
+        return decode_ms, None
+    start = time.perf_counter()
+    with wave.open(wav_path, "rb") as wav:
+        wav.readframes(wav.getnframes())
+    return decode_ms, (time.perf_counter() - start) * 1000.0
+
+
+def report(results: list, elapsed: float, cache: AudioCache = audio_cache) -> None:
+    done = [r for r in results if "error" not in r]
+    failed = [r for r in results if "error" in r]
+    converted = [r for r in done if not r.get("reused")]
+    print(f"{len(done)}/{len(results)} sonidos en caché en {elapsed:.1f} s "
+          f"({len(converted)} convertidos, {len(done) - len(converted)} ya estaban)")
+    if failed:
+        print(f"  {len(failed)} sin convertir: {failed[0]['error']}")
+    if not done:
+        return
+    source_bytes = sum(r["source_bytes"] for r in done)
+    output_bytes = sum(os.path.getsize(os.path.join(cache.directory, w))
+                       for w in {r["wav"] for r in done})
+    print(f"  originales: {source_bytes / 1048576:.1f} MB -> WAV: {output_bytes / 1048576:.1f} MB "
+          f"({cache.sample_rate} Hz, {cache.channels} canales, RMS {cache.target_dbfs:g} dBFS)")
+    gains = [r["gain_db"] for r in converted]
+    if gains:
+        print(f"  ganancia aplicada: de {min(gains):+.1f} a {max(gains):+.1f} dB")
+    # Latencia de arranque con unos cuantos sonidos: decodificar frente a leer el WAV
+    sample = done[:: max(1, len(done) // 5)][:5]
+    timings = [_startup_ms(os.path.join(BASE_DIR, r["key"]), os.path.join(cache.directory, r["wav"]))
+               for r in sample]
+    decode_ms = sum(t[0] for t in timings) / len(timings)
+    wav_ms = sum(t[1] for t in timings) / len(timings)
+    print(f"  PCM listo para sonar: {decode_ms:.1f} ms decodificando -> {wav_ms:.1f} ms "
+          f"leyendo el WAV (media de {len(timings)} sonidos)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convierte los sonidos a WAV normalizado.")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    args = parser.parse_args()
+    if not decoder_available():
+        # Sin decodificador todos los sonidos fallarían uno a uno (por
+        # ejemplo, durante la instalación): mejor avisar una vez
+        print("Conversión de sonidos omitida: no hay decodificador de MP3 "
+              "(pip install miniaudio o instalar ffmpeg).  El juego usará los originales.")
+        return
+    start = time.perf_counter()
+    results = run(args.workers)
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
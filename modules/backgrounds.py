@@ -0,0 +1,238 @@
+"""
+Servicio compartido de fondos para los minijuegos y la ruleta.
+
+Cada minijuego repetía en su ``__init__`` el mismo bloque: listar
+``assets/custom``, quedarse con los archivos ``fran*``, elegir uno al azar,
+abrirlo, convertirlo, reescalarlo con LANCZOS, oscurecerlo y crear el
+``PhotoImage``.  Abrir un minijuego pagaba siempre la decodificación y el
+reescalado completos antes del primer fotograma.
+
+``background_service`` hace ese trabajo una sola vez por combinación
+``(archivo, ancho, alto, brillo)``: el ``PhotoImage`` resultante se guarda
+en la caché compartida de imágenes (``modules/image_cache.py``), así que
+volver a abrir un minijuego con el mismo fondo es instantáneo.  Los píxeles
+reescalados también se guardan en la caché en disco, de modo que incluso el
+primer uso tras reiniciar evita el reescalado.  Los ``PhotoImage`` se
+crean con ``modules/tk_bridge.py``, y ``prepare`` deja hecha fuera del hilo
+de Tk la parte de la conversión que no necesita Tk.
+
+Carga progresiva: si el fondo pedido no está en ninguna de las dos
+cachés, ``get`` devuelve al momento una vista previa reescalada por vecino
+más próximo (``decode_preview``) y encarga la versión LANCZOS a un hilo.
+Cuando está lista, sus píxeles se copian sobre la misma foto
+(``tk_bridge.update``), así que el canvas que la muestra se actualiza sin
+que el minijuego, la ruleta o la pantalla de victoria tengan que hacer
+nada.  Necesita un widget para comprobar desde el hilo de Tk si el trabajo
+ha terminado (``attach``); sin él, ``get`` espera a la versión final.  Si
+la versión final falla, la vista previa sigue en pantalla pero sale de la
+caché, para que el siguiente ``get`` lo vuelva a intentar.
+
+Uso::
+
+    from modules.backgrounds import background_service
+
+    background_service.attach(root)   # una vez, para la carga progresiva
+    self.bg_photo = background_service.random_background(ancho, alto)
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from modules import tk_bridge
+from modules.asset_manifest import asset_manifest
+from modules.config import (
+    BASE_DIR,
+    PROGRESSIVE_BACKGROUNDS,
+    PROGRESSIVE_POLL_MS,
+    PROGRESSIVE_PREVIEW_RESAMPLE,
+)
+from modules.disk_cache import decode_preview, disk_cache, load_image
+from modules.image_cache import image_cache
+from modules.tk_bridge import HAS_PIL
+
+BACKGROUNDS_DIR = os.path.join(BASE_DIR, "assets", "custom")
+VICTORY_BACKGROUNDS_DIR = os.path.join(BASE_DIR, "assets", "backgrounds")
+BACKGROUND_PREFIX = "fran"
+BACKGROUND_EXTENSIONS = (".png", ".gif")
+# Oscurecimiento que usan todos los minijuegos para que resalten los elementos
+DEFAULT_BRIGHTNESS = 0.7
+
+
+class BackgroundService:
+    """Fondos ``fran*`` ya preparados para Tk, memorizados por tamaño y brillo."""
+
+    def __init__(self, directory: str = BACKGROUNDS_DIR, prefix: str = BACKGROUND_PREFIX,
+                 cache=image_cache):
+        self.directory = directory
+        self.prefix = prefix
+        self.cache = cache
+        # Fondo ya elegido para el próximo ``random_background`` (ver ``reserve``)
+        self._reserved: str | None = None
+        # Carga progresiva: widget para ``after``, hilo de LANCZOS y
+        # trabajos pendientes ``(futuro, foto, inicio)``
+        self.progressive = PROGRESSIVE_BACKGROUNDS
+        self._widget = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._refining: list = []
+        self.previews = 0
+        self.refined = 0
+        self.failed = 0
+        self.preview_ms = 0.0
+        self.refine_ms = 0.0
+
+    def attach(self, widget) -> None:
+        """Activa la carga progresiva usando ``widget`` para programar las comprobaciones."""
+        self._widget = widget
+
+    def list_files(self, extensions=BACKGROUND_EXTENSIONS) -> list:
+        """Rutas de los fondos disponibles con alguna de las ``extensions``."""
+        return asset_manifest.files(self.directory, extensions, prefix=self.prefix)
+
+    @staticmethod
+    def cache_key(path: str, width: int, height: int, brightness: float = DEFAULT_BRIGHTNESS,
+                  mode: str = "RGBA") -> tuple:
+        """Clave de la caché de imágenes para un fondo ya preparado."""
+        return ("fondo", path, int(width), int(height), brightness, mode)
+
+    @staticmethod
+    def decode(path: str, width: int, height: int, brightness: float = DEFAULT_BRIGHTNESS,
+               mode: str = "RGBA"):
+        """
+        Imagen PIL del fondo ya reescalada y oscurecida.  No toca Tk, así que
+        puede llamarse desde otro hilo (lo usa ``modules/prewarm.py``).
+        """
+        return load_image(path, (int(width), int(height)), brightness=brightness, mode=mode)
+
+    @classmethod
+    def prepare(cls, path: str, width: int, height: int, brightness: float = DEFAULT_BRIGHTNESS,
+                mode: str = "RGBA"):
+        """
+        Fondo listo para ``tk_bridge.photo`` (``decode`` + ``tk_bridge.prepare``).
+        Tampoco toca Tk.
+        """
+        return tk_bridge.prepare(cls.decode(path, width, height, brightness, mode))
+
+    def get(self, path: str, width: int, height: int, brightness: float = DEFAULT_BRIGHTNESS,
+            mode: str = "RGBA"):
+        """
+        Devuelve el ``PhotoImage`` de ``path`` reescalado a ``width`` x
+        ``height`` y con el brillo indicado, o ``None`` si no se puede
+        cargar (o no hay PIL).  Debe llamarse desde el hilo de Tk.
+        """
+        if not HAS_PIL:
+            return None
+        key = self.cache_key(path, width, height, brightness, mode)
+        try:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+            size = (int(width), int(height))
+            # Ya reescalado en disco: leerlo es tan rápido como una vista previa
+            stored = disk_cache.load(path, size, brightness, mode, 1)
+            if stored is not None:
+                result = tk_bridge.photo(tk_bridge.prepare(stored[0][0]))
+            elif self.progressive and self._widget is not None:
+                result = self._preview(path, size, brightness, mode)
+            else:
+                result = tk_bridge.photo(self.prepare(path, width, height, brightness, mode))
+            self.cache.put(key, result)
+            return result
+        except Exception:
+            return None
+
+    def _preview(self, path: str, size: tuple, brightness: float, mode: str):
+        """
+        Vista previa barata y encargo de la versión final a otro hilo.  La
+        vista previa se guarda en la caché con la clave de la versión final
+        hasta que ésta la sustituye o falla.
+        """
+        start = time.perf_counter()
+        preview = tk_bridge.photo(tk_bridge.prepare(
+            decode_preview(path, size, brightness, mode, PROGRESSIVE_PREVIEW_RESAMPLE)))
+        self.previews += 1
+        self.preview_ms += (time.perf_counter() - start) * 1000.0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fondos")
+        future = self._executor.submit(self.prepare, path, *size, brightness, mode)
+        if not self._refining:
+            self._schedule()
+        self._refining.append((future, preview, start, self.cache_key(path, *size, brightness, mode)))
+        return preview
+
+    def _schedule(self) -> None:
+        try:
+            self._widget.after(PROGRESSIVE_POLL_MS, self._swap_ready)
+        except Exception:
+            # La ventana ya no existe: las vistas previas no se refinarán
+            for _, _, _, key in self._refining:
+                self._discard_preview(key)
+            self._refining.clear()
+
+    def _swap_ready(self) -> None:
+        pending = []
+        for future, preview, start, key in self._refining:
+            if not future.done():
+                pending.append((future, preview, start, key))
+                continue
+            try:
+                refined = tk_bridge.update(preview, future.result())
+            except Exception:
+                refined = False
+            if refined:
+                self.refined += 1
+                self.refine_ms += (time.perf_counter() - start) * 1000.0
+            else:
+                # En pantalla se queda la vista previa, pero no en la caché
+                self._discard_preview(key)
+        self._refining = pending
+        if pending:
+            self._schedule()
+
+    def _discard_preview(self, key: tuple) -> None:
+        self.failed += 1
+        self.cache.invalidate(key)
+
+    def stats(self) -> dict:
+        """Vistas previas mostradas, cuántas se han refinado o no y sus tiempos medios en ms."""
+        return {
+            "previews": self.previews,
+            "refined": self.refined,
+            "failed": self.failed,
+            "pending": len(self._refining),
+            "preview_ms": round(self.preview_ms / self.previews, 1) if self.previews else None,
+            "refine_ms": round(self.refine_ms / self.refined, 1) if self.refined else None,
+        }
+
+    def reserve(self, extensions=BACKGROUND_EXTENSIONS) -> Optional[str]:
+        """
+        Elige ya el fondo que usará el próximo ``random_background``, para
+        poder prepararlo antes de que se abra el minijuego.  Devuelve su
+        ruta, o ``None`` si no hay fondos.
+        """
+        files = self.list_files(extensions)
+        self._reserved = random.choice(files) if files else None
+        return self._reserved
+
+    def random_background(self, width: int, height: int, brightness: float = DEFAULT_BRIGHTNESS,
+                          mode: str = "RGBA", extensions=BACKGROUND_EXTENSIONS):
+        """
+        Elige un fondo al azar (o el reservado con ``reserve``, si es de una
+        de las ``extensions``) y lo devuelve preparado (``None`` si no hay).
+        """
+        files = self.list_files(extensions)
+        reserved, self._reserved = self._reserved, None
+        if not files or not HAS_PIL:
+            return None
+        path = reserved if reserved in files else random.choice(files)
+        return self.get(path, width, height, brightness, mode)
+
+
+def victory_background_paths() -> list:
+    """Imágenes de ``assets/backgrounds`` candidatas para el panel de victoria."""
+    return asset_manifest.files(VICTORY_BACKGROUNDS_DIR, (".png", ".jpg", ".jpeg", ".gif"))
+
+
+background_service = BackgroundService()
@@ -1,4 +1,12 @@
 # Configuración del juego Mini-Diego
+import os
+
+# Rutas
+# Directorio raíz del proyecto (el que contiene ``main.py``) y carpeta donde
+# se guardan los datos regenerables, como los fotogramas ya reescalados.  Se
+# puede borrar en cualquier momento; el juego la vuelve a crear.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
 
 # Intervalos de tiempo (en segundos)
 # Ajustes de tiempo para la versión de 24 horas.
@@ -52,6 +60,157 @@ ALWAYS_ON_TOP = True
 WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 
+# Lado en píxeles de la mascota flotante (sus sprites se reescalan a este tamaño)
+PET_SIZE = 150
+
+# Animaciones
+# Límite global de fotogramas por segundo del reloj de animación compartido
+# (modules/animation_clock.py).  Bajarlo reduce el trabajo de todas las
+# animaciones a la vez: mascota, ruleta, minijuegos y parpadeos.
+ANIMATION_MAX_FPS = 60
+
+# Transiciones de la mascota
+# Al cambiar de estado, la mascota funde el sprite anterior con el nuevo en
+# lugar de cambiar de golpe.  Los fundidos se preparan en segundo plano para
+# los estados vecinos (modules/transitions.py); si el del cambio no está
+# listo todavía, el cambio es instantáneo como antes.
+PET_TRANSITIONS = True
+TRANSITION_FRAMES = 8
+TRANSITION_FRAME_MS = 40
+
+# Recarga de sprites
+# Mientras la aplicación está abierta se vigila ``assets/sprites``: los GIF
+# modificados se vuelven a cargar sin reiniciar (modules/sprite_watcher.py).
+# El intervalo es el tiempo entre comprobaciones de fechas de modificación.
+SPRITE_HOT_RELOAD = True
+SPRITE_WATCH_INTERVAL_MS = 1000
+
+# Decodificador de sprites
+# "pil" (Pillow, con caché en disco, atlas y precarga en segundo plano), "tk"
+# (lector nativo de GIF de Tk, ver modules/tk_sprites.py) o "auto" (Pillow si
+# está instalado).  También se puede cambiar desde el panel de administración.
+SPRITE_DECODER = "auto"
+
+# Fotogramas con paleta
+# Los sprites se guardan en memoria como índices de una paleta compartida
+# (1 byte por píxel) y sólo se expanden a RGBA los FRAME_RING_SIZE
+# fotogramas mostrados más recientemente (ver modules/frame_store.py).
+SPRITE_PALETTE_FRAMES = True
+FRAME_RING_SIZE = 2
+
+# Memoria
+# Presupuesto de la caché compartida de imágenes ya preparadas (sprites de la
+# mascota, fondos de minijuegos, ruleta y victoria).  Al superarlo se
+# descartan primero las imágenes usadas hace más tiempo.
+IMAGE_CACHE_MAX_BYTES = 48 * 1024 * 1024
+# Los fondos opacos pasan a Tk como bloques PPM preparados fuera del hilo de
+# Tk (ver modules/tk_bridge.py).  Con False se usa siempre ImageTk.PhotoImage.
+TK_BRIDGE_PPM = True
+
+# Carga inicial
+# Al arrancar, ``modules/startup_loader.py`` decodifica a la vez los sprites
+# y el fondo del primer minijuego en STARTUP_LOADER_WORKERS hilos.  El hilo
+# de Tk recoge los resultados cada STARTUP_POLL_MS.
+STARTUP_LOADER_WORKERS = 4
+STARTUP_POLL_MS = 15
+
+# Carga progresiva de fondos
+# Si un fondo no está en ninguna caché, se muestra al momento una vista previa
+# reescalada con PROGRESSIVE_PREVIEW_RESAMPLE ("nearest" o "bilinear") y la
+# versión LANCZOS se calcula en otro hilo y sustituye a la vista previa en
+# cuanto está lista (se comprueba cada PROGRESSIVE_POLL_MS).
+PROGRESSIVE_BACKGROUNDS = True
+PROGRESSIVE_PREVIEW_RESAMPLE = "nearest"
+PROGRESSIVE_POLL_MS = 30
+
+# Audio
+# Todos los sonidos pasan por un único hilo de audio (modules/audio.py) con
+# una cola de como mucho AUDIO_QUEUE_SIZE peticiones.  Suenan a la vez como
+# mucho AUDIO_MAX_VOICES clips; si la misma carpeta o archivo se pide otra
+# vez antes de AUDIO_COALESCE_MS, la repetición se descarta, y una petición
+# que lleva esperando más de AUDIO_MAX_QUEUE_DELAY_MS ya no se reproduce.
+AUDIO_MAX_VOICES = 4
+AUDIO_COALESCE_MS = 150
+AUDIO_QUEUE_SIZE = 32
+AUDIO_MAX_QUEUE_DELAY_MS = 500
+
+# Sonidos de teclas
+# Los minijuegos de ritmo (QWERHero) precargan sus sonidos al empezar y los
+# lanzan por un hilo de audio propio (modules/sfx.py).  Un sonido que no
+# puede empezar antes de SFX_MAX_LATENCY_MS desde la pulsación se descarta:
+# llegaría tarde respecto a la nota.  Se guardan las últimas
+# SFX_LATENCY_SAMPLES latencias para el informe del final de la partida.
+SFX_MAX_LATENCY_MS = 50
+SFX_MAX_VOICES = 4
+SFX_LATENCY_SAMPLES = 256
+
+# Procesos reproductores
+# Los reproductores externos (aplay, paplay, afplay, xdg-open) se lanzan a
+# través de modules/process_pool.py: como mucho AUDIO_MAX_PROCESSES vivos a
+# la vez, recogidos por un hilo cada PROCESS_REAP_INTERVAL_MS y terminados
+# si siguen vivos PLAYER_KILL_MARGIN_S después de lo que dura su clip (o
+# PLAYER_KILL_TIMEOUT_S si no se sabe).  AUDIO_PLAYER_COMMAND permite fijar
+# el reproductor, con "{path}" en lugar del archivo, p. ej.
+# ["mpg123", "-q", "{path}"]; con None se elige según el sistema.
+AUDIO_PLAYER_COMMAND = None
+AUDIO_MAX_PROCESSES = 6
+PROCESS_REAP_INTERVAL_MS = 200
+PLAYER_KILL_MARGIN_S = 2.0
+PLAYER_KILL_TIMEOUT_S = 120.0
+
+# Mezclador de audio
+# Los clips se decodifican una vez a PCM de 16 bits (MIXER_SAMPLE_RATE Hz,
+# MIXER_CHANNELS canales) y se mezclan en el propio proceso en bloques de
+# MIXER_BLOCK_FRAMES (ver modules/mixer.py).  MIXER_SINK es la salida:
+# "device" (tarjeta de sonido, necesita ``pip install miniaudio``), "wav"
+# (se escribe en MIXER_WAV_PATH) o "null" (se descarta, para pruebas sin
+# sonido).  Los clips de más de MIXER_MAX_CLIP_SECONDS, o que no se pueden
+# decodificar, se siguen reproduciendo con un reproductor externo.  La caché
+# de PCM ocupa como mucho MIXER_PCM_CACHE_MAX_BYTES.
+MIXER_ENABLED = True
+MIXER_SINK = "device"
+MIXER_SAMPLE_RATE = 44100
+MIXER_CHANNELS = 2
+MIXER_BLOCK_FRAMES = 1024
+MIXER_MAX_CLIP_SECONDS = 30
+MIXER_PCM_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MIXER_WAV_PATH = os.path.join(CACHE_DIR, "mixer.wav")
+
+# Caché de audio transcodificado
+# ``python -m modules.audio_cache`` convierte los sonidos de assets/sounds a
+# WAV de 16 bits con el formato del mezclador (MIXER_SAMPLE_RATE,
+# MIXER_CHANNELS) y un volumen medio (RMS) de AUDIO_NORMALIZE_DBFS, sin
+# que ningún pico pase de AUDIO_PEAK_CEILING.  Los reproductores y el
+# mezclador usan esos WAV en lugar de decodificar el MP3 al reproducirlo.
+AUDIO_CACHE_DIR = os.path.join(CACHE_DIR, "audio")
+AUDIO_NORMALIZE_DBFS = -18.0
+AUDIO_PEAK_CEILING = 0.98
+
+# Precalentamiento en reposo
+# Mientras no hay minijuego abierto, ``modules/prewarm.py`` prepara en trozos
+# pequeños los sprites, los fondos de los minijuegos, el de la ruleta y el de
+# victoria.  Cada trozo en el hilo de Tk dura como mucho PREWARM_SLICE_MS; el
+# trabajo pesado (decodificar y reescalar) se hace en otro hilo.  Sólo se
+# ocupa hasta PREWARM_MEMORY_FRACTION del presupuesto de la caché: el resto
+# de fondos se deja preparado únicamente en la caché en disco.
+PREWARM_ENABLED = True
+PREWARM_START_DELAY_MS = 5000
+PREWARM_INTERVAL_MS = 250
+PREWARM_SLICE_MS = 8
+PREWARM_MEMORY_FRACTION = 0.75
+# Coste inicial estimado de copiar píxeles a una foto de Tk (ms por MB, a 4
+# bytes por píxel) hasta que el precalentador lo mide por sí mismo
+PREWARM_MS_PER_MB = 4.0
+# Tamaños de canvas (ancho, alto) de los minijuegos activos, para preparar
+# sus fondos oscurecidos: MathQuiz/Stroop, Memory, Snake, Tetris,
+# Typing/Catch/Lightning/Disarm/CrossRoad, ExpressRace y Blackjack.
+MINIGAME_BACKGROUND_SIZES = [
+    (700, 500), (700, 550), (540, 540), (470, 600), (600, 500), (600, 400), (650, 550),
+]
+# Tamaño del fondo de la ruleta y de la ventana de victoria
+ROULETTE_BACKGROUND_SIZE = (700, 600)
+VICTORY_BACKGROUND_SIZE = (700, 500)
+
 # Movimiento
 # La mascota flotante se mueve más lentamente para que permanezca más
 # tiempo en pantalla. Se incrementan los pasos y la demora entre ellos,
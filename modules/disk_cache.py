@@ -0,0 +1,205 @@
+"""
+Caché persistente en disco de fotogramas ya reescalados.
+
+Reescalar con LANCZOS los GIF de la mascota y las fotos de fondo de los
+minijuegos cuesta lo mismo en cada arranque.  Este módulo guarda el
+resultado (píxeles RGBA o RGB sin comprimir) en ``CACHE_DIR/frames`` para
+que en los siguientes arranques baste con leer los bytes y construir la
+imagen con ``Image.frombytes``.
+
+Cada entrada se identifica por la ruta del archivo de origen, el tamaño de
+destino, el factor de brillo, el modo de color y el número máximo de
+fotogramas.  En la cabecera de la entrada se guarda además la fecha de
+modificación y el tamaño en bytes del archivo de origen: si cualquiera de
+los dos cambia, la entrada se descarta y se vuelve a generar.
+
+Formato de cada archivo ``<sha1>.frames``: una línea JSON con la cabecera
+seguida de los fotogramas concatenados en bruto.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Optional
+
+from modules.asset_pack import open_asset
+from modules.config import CACHE_DIR
+
+try:
+    from PIL import Image, ImageEnhance, ImageSequence  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+# Se incrementa cuando cambia el formato de las entradas para ignorar las
+# generadas por versiones anteriores.
+FORMAT_VERSION = 1
+
+
+class DiskFrameCache:
+    """Almacén de fotogramas reescalados en archivos dentro de ``directory``."""
+
+    def __init__(self, directory: str = os.path.join(CACHE_DIR, "frames")):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, path: str, size: tuple, brightness: float, mode: str,
+                    max_frames: Optional[int]) -> str:
+        raw = f"{os.path.abspath(path)}|{size[0]}x{size[1]}|{brightness:.3f}|{mode}|{max_frames}"
+        digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.frames")
+
+    @staticmethod
+    def _source_signature(path: str) -> list:
+        """Fecha de modificación (ns) y tamaño en bytes del archivo de origen."""
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def load(self, path: str, size: tuple, brightness: float = 1.0, mode: str = "RGBA",
+             max_frames: Optional[int] = None):
+        """
+        Devuelve ``(fotogramas, duraciones)`` si hay una entrada válida para
+        el archivo y los parámetros indicados, o ``None`` en caso contrario.
+        Las entradas obsoletas se eliminan al detectarlas.
+        """
+        entry = self._entry_path(path, size, brightness, mode, max_frames)
+        try:
+            signature = self._source_signature(path)
+            with open(entry, "rb") as fh:
+                header = json.loads(fh.readline().decode("utf-8"))
+                if header.get("version") != FORMAT_VERSION or header.get("source") != signature:
+                    raise ValueError("entrada obsoleta")
+                width, height = header["size"]
+                frame_mode = header["mode"]
+                frame_bytes = width * height * len(frame_mode)
+                frames = []
+                for _ in header["durations"]:
+                    data = fh.read(frame_bytes)
+                    if len(data) != frame_bytes:
+                        raise ValueError("entrada truncada")
+                    frames.append(Image.frombytes(frame_mode, (width, height), data))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            self.misses += 1
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+            return None
+        self.hits += 1
+        return frames, list(header["durations"])
+
+    def store(self, path: str, size: tuple, brightness: float, mode: str,
+              max_frames: Optional[int], frames: list, durations: list) -> None:
+        """Guarda los fotogramas; los errores de escritura se ignoran."""
+        entry = self._entry_path(path, size, brightness, mode, max_frames)
+        tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            header = {
+                "version": FORMAT_VERSION,
+                "source": self._source_signature(path),
+                "size": [frames[0].width, frames[0].height],
+                "mode": mode,
+                "durations": list(durations),
+            }
+            with open(tmp, "wb") as fh:
+                fh.write(json.dumps(header).encode("utf-8") + b"\n")
+                for frame in frames:
+                    fh.write(frame.tobytes())
+            # Reemplazo atómico para que un lector nunca vea una entrada a medias
+            os.replace(tmp, entry)
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        """Elimina todas las entradas del directorio de la caché."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".frames"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
+disk_cache = DiskFrameCache()
+
+
+def decode_frames(path: str, size: tuple, brightness: float = 1.0, mode: str = "RGBA",
+                  max_frames: Optional[int] = None):
+    """
+    Decodifica ``path`` sin pasar por la caché.
+
+    Cada fotograma se convierte a ``mode``, se reescala a ``size`` con
+    LANCZOS y, si ``brightness`` es distinto de 1, se oscurece o aclara con
+    ``ImageEnhance.Brightness``, igual que hacían los cargadores de fondos.
+    Devuelve ``(fotogramas, duraciones_en_ms)``.
+    """
+    frames = []
+    durations = []
+    # Desde el paquete de recursos si lo hay (ver modules/asset_pack.py)
+    with open_asset(path) as fh:
+        img = Image.open(fh)
+        for frame in ImageSequence.Iterator(img):
+            f = frame.convert(mode)
+            f = f.resize(size, Image.Resampling.LANCZOS)
+            if brightness != 1.0:
+                f = ImageEnhance.Brightness(f).enhance(brightness)
+            frames.append(f)
+            durations.append(int(frame.info.get("duration", 100) or 100))
+            if max_frames is not None and len(frames) >= max_frames:
+                break
+    return frames, durations
+
+
+def load_frames(path: str, size: tuple, brightness: float = 1.0, mode: str = "RGBA",
+                max_frames: Optional[int] = None):
+    """
+    Igual que ``decode_frames`` pero consultando primero la caché en disco y
+    guardando en ella el resultado cuando no estaba.
+    """
+    size = (int(size[0]), int(size[1]))
+    cached = disk_cache.load(path, size, brightness, mode, max_frames)
+    if cached is not None:
+        return cached
+    frames, durations = decode_frames(path, size, brightness, mode, max_frames)
+    if frames:
+        disk_cache.store(path, size, brightness, mode, max_frames, frames, durations)
+    return frames, durations
+
+
+def decode_preview(path: str, size: tuple, brightness: float = 1.0, mode: str = "RGBA",
+                   resample: str = "nearest"):
+    """
+    Primer fotograma de ``path`` a ``size`` con un reescalado barato
+    (``resample``: ``"nearest"`` o ``"bilinear"``), para mostrar algo
+    mientras se calcula la versión con LANCZOS.  Los JPEG se decodifican ya
+    reducidos (``draft``).  No usa ni rellena la caché en disco.
+    """
+    size = (int(size[0]), int(size[1]))
+    with open_asset(path) as fh:
+        img = Image.open(fh)
+        img.draft("RGB", size)
+        img = img.convert(mode).resize(size, getattr(Image.Resampling, resample.upper()))
+    if brightness != 1.0:
+        # Como ImageEnhance.Brightness: escala el color y deja el alfa
+        lut = [min(255, int(v * brightness)) for v in range(256)]
+        img = img.point(lut * 3 + (list(range(256)) if mode == "RGBA" else []))
+    return img
+
+
+def load_image(path: str, size: tuple, brightness: float = 1.0, mode: str = "RGBA"):
+    """Devuelve sólo el primer fotograma de ``path`` reescalado (con caché)."""
+    frames, _ = load_frames(path, size, brightness, mode, max_frames=1)
+    return frames[0]
@@ -0,0 +1,213 @@
+"""
+Fotogramas de sprites guardados como índices de paleta.
+
+Los GIF de ``assets/sprites`` tienen muy pocos colores (de 16 a 47), pero
+cada fotograma se guardaba expandido a RGBA como un ``PhotoImage`` vivo:
+4 bytes por píxel y por fotograma, se mostrara o no.  ``PaletteFrames``
+guarda cada animación como un byte por píxel más una única paleta
+compartida por todos sus fotogramas, y sólo crea la imagen Tk del
+fotograma que se va a mostrar.  Los últimos ``FRAME_RING_SIZE``
+fotogramas expandidos se conservan en un anillo; al salir del anillo, su
+``PhotoImage`` se reutiliza (``paste``) para el siguiente en lugar de crear
+otro.  Cuando ``GifAnimator`` pasa a otra animación suelta el anillo de la
+anterior (``release``), así que sólo la animación visible tiene fotogramas
+expandidos.
+
+La paleta se obtiene con ``quantize`` sobre todos los fotogramas a la vez,
+con los píxeles transparentes sustituidos por un color clave que no aparece
+en el sprite, y sólo se usa si al expandir se recuperan exactamente los
+mismos píxeles.  Si no (más de 255 colores o transparencia parcial,
+por ejemplo al reescalar a otro tamaño), ``pack_frames`` devuelve las
+imágenes tal cual y se usan fotogramas RGBA como antes.
+
+``pack_frames`` no toca Tk, así que se ejecuta en los hilos que
+decodifican (precarga, carga inicial).  Para ver la memoria de los sprites
+con y sin paleta::
+
+    python -m modules.frame_store
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+from modules.config import FRAME_RING_SIZE, PET_SIZE, SPRITE_PALETTE_FRAMES
+
+try:
+    from PIL import Image, ImageTk  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+# Bytes por píxel de una foto de Tk (igual que en image_cache)
+TK_BYTES_PER_PIXEL = 4
+# Colores candidatos para marcar los píxeles transparentes
+_KEY_COLORS = ((255, 0, 255), (0, 255, 0), (0, 0, 254), (1, 2, 3))
+
+
+class PaletteFrames:
+    """
+    Secuencia indexable de fotogramas Tk (la que espera ``GifAnimator``)
+    guardados como índices de paleta y expandidos al pedirlos.
+    """
+
+    def __init__(self, size: tuple, palette: list, transparency: Optional[int], indices: list,
+                 ring_size: int = FRAME_RING_SIZE):
+        self.size = size
+        self._palette = palette
+        self._transparency = transparency
+        self._indices = indices
+        # Al menos dos: el fotograma visible nunca es el que se reutiliza
+        self.ring_size = max(2, ring_size)
+        self._ring: OrderedDict = OrderedDict()
+        self.expanded = 0
+
+    @classmethod
+    def from_images(cls, images: list, ring_size: int = FRAME_RING_SIZE):
+        """``PaletteFrames`` equivalente a ``images`` (RGBA), o ``None`` si no es posible sin pérdidas."""
+        if not images or any(img.size != images[0].size for img in images):
+            return None
+        width, height = images[0].size
+        strip = Image.new("RGBA", (width, height * len(images)))
+        for i, img in enumerate(images):
+            strip.paste(img.convert("RGBA"), (0, i * height))
+        alpha = strip.getchannel("A")
+        if any(value not in (0, 255) for _, value in alpha.getcolors(256)):
+            return None
+        colors = strip.getcolors(256)
+        if colors is None:
+            return None
+        used = {color[:3] for _, color in colors if color[3] == 255}
+        key = next((c for c in _KEY_COLORS if c not in used), None)
+        if key is None:
+            return None
+        rgb = Image.new("RGB", strip.size, key)
+        rgb.paste(strip, mask=alpha)
+        quantized = rgb.quantize(colors=256, method=Image.Quantize.MEDIANCUT)
+        if quantized.convert("RGB").tobytes() != rgb.tobytes():
+            return None
+        palette = quantized.getpalette()
+        entries = [tuple(palette[i:i + 3]) for i in range(0, len(palette), 3)]
+        transparency = entries.index(key) if key in entries and 0 in alpha.getextrema() else None
+        data = quantized.tobytes()
+        frame_bytes = width * height
+        indices = [data[i * frame_bytes:(i + 1) * frame_bytes] for i in range(len(images))]
+        return cls((width, height), palette, transparency, indices, ring_size)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, index: int):
+        index = range(len(self._indices))[index]
+        photo = self._ring.get(index)
+        if photo is not None:
+            self._ring.move_to_end(index)
+            return photo
+        image = self.expand(index)
+        if len(self._ring) >= self.ring_size:
+            # Reutilizar la foto más antigua del anillo, que ya no está en pantalla
+            _, photo = self._ring.popitem(last=False)
+            photo.paste(image)
+        else:
+            photo = ImageTk.PhotoImage(image)
+        self._ring[index] = photo
+        self.expanded += 1
+        return photo
+
+    def release(self) -> None:
+        """Suelta las fotos del anillo (cuando la animación deja de mostrarse)."""
+        self._ring.clear()
+
+    def expand(self, index: int):
+        """Fotograma ``index`` como imagen PIL RGBA."""
+        image = Image.frombytes("P", self.size, self._indices[index])
+        image.putpalette(self._palette)
+        if self._transparency is not None:
+            image.info["transparency"] = self._transparency
+        return image.convert("RGBA")
+
+    @property
+    def frame_bytes(self) -> int:
+        """Memoria de un fotograma expandido en Tk."""
+        return self.size[0] * self.size[1] * TK_BYTES_PER_PIXEL
+
+    @property
+    def packed_bytes(self) -> int:
+        """Índices de todos los fotogramas más la paleta."""
+        return sum(len(data) for data in self._indices) + len(self._palette)
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria máxima: índices, paleta y el anillo lleno (lo usa la caché)."""
+        return self.packed_bytes + min(self.ring_size, len(self)) * self.frame_bytes
+
+    def resident_bytes(self) -> int:
+        """Memoria ocupada ahora mismo (índices, paleta y fotos del anillo)."""
+        return self.packed_bytes + len(self._ring) * self.frame_bytes
+
+    def stats(self) -> dict:
+        return {
+            "frames": len(self),
+            "ring": len(self._ring),
+            "expanded": self.expanded,
+            "resident_bytes": self.resident_bytes(),
+            "rgba_bytes": len(self) * self.frame_bytes,
+        }
+
+
+def pack_frames(images: list, ring_size: int = FRAME_RING_SIZE):
+    """
+    ``PaletteFrames`` para ``images`` si está activado y se puede sin
+    pérdidas; si no, la lista de imágenes PIL sin cambios.  Las animaciones
+    que caben enteras en el anillo no ganan nada y tampoco se empaquetan.
+    No toca Tk.
+    """
+    if SPRITE_PALETTE_FRAMES and HAS_PIL and len(images) > max(2, ring_size):
+        try:
+            packed = PaletteFrames.from_images(images, ring_size)
+        except Exception:
+            packed = None
+        if packed is not None:
+            return packed
+    return images
+
+
+def tk_frames(frames):
+    """Fotogramas listos para ``GifAnimator`` a partir de ``pack_frames``.  En el hilo de Tk."""
+    if isinstance(frames, PaletteFrames):
+        return frames
+    return [ImageTk.PhotoImage(img) for img in frames]
+
+
+def main() -> None:
+    from modules.disk_cache import load_frames
+    from modules.sprite_atlas import find_sprite_sources
+
+    if not HAS_PIL:
+        print("Pillow no está instalado")
+        return
+    size = (PET_SIZE, PET_SIZE)
+    before = packed_total = ring_max = 0
+    print(f"{'estado':<16} {'fotogramas':>10} {'RGBA':>10} {'paleta':>10}")
+    for state, path in find_sprite_sources().items():
+        images, _ = load_frames(path, size, max_frames=None if path.lower().endswith(".gif") else 1)
+        rgba = len(images) * size[0] * size[1] * TK_BYTES_PER_PIXEL
+        frames = pack_frames(images)
+        before += rgba
+        if isinstance(frames, PaletteFrames):
+            packed_total += frames.packed_bytes
+            ring_max = max(ring_max, frames.nbytes - frames.packed_bytes)
+            label = f"{frames.packed_bytes / 1024:9.1f}K"
+        else:
+            packed_total += rgba
+            label = "    (RGBA)"
+        print(f"{state:<16} {len(images):>10} {rgba / 1024:9.1f}K {label}")
+    # Sólo la animación visible tiene su anillo de fotogramas expandidos
+    after = packed_total + ring_max
+    print(f"Memoria residente de todos los sprites en caché: antes {before / 1024:.1f}K, "
+          f"ahora {after / 1024:.1f}K con un estado en pantalla "
+          f"({(1 - after / before) * 100 if before else 0:.0f} % menos; "
+          f"anillo de {FRAME_RING_SIZE} fotogramas)")
+
+
+if __name__ == "__main__":
+    main()
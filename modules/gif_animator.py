@@ -0,0 +1,153 @@
+"""
+Animador de GIF en modo retenido para un ``tk.Canvas``.
+
+La animación antigua de la mascota borraba el canvas y creaba un elemento
+de imagen nuevo cada 100 ms, sin tener en cuenta la duración real de cada
+fotograma.  ``GifAnimator`` crea un único elemento de imagen y en cada
+fotograma sólo cambia su opción ``image`` con ``itemconfig``, respetando la
+duración propia de cada fotograma.  El ritmo lo marca el reloj de
+animación compartido (``modules/animation_clock.py``).
+
+Los fotogramas llegan ya compuestos: Pillow aplica el método de
+eliminación (*disposal*) de cada fotograma del GIF al decodificarlo, así
+que cada imagen de la lista es el cuadro completo que debe verse en
+pantalla.
+
+Para comprobar que no se crean elementos por fotograma, el animador lleva
+la cuenta de los elementos de canvas creados (``items_created``), de los
+fotogramas mostrados (``frames_shown``) y de la tasa real de fotogramas por
+segundo (``frame_rate``).
+"""
+
+import time
+
+from modules.animation_clock import animation_clock
+
+# Duración mínima de un fotograma en ms.  Muchos GIF declaran 0 o 10 ms y los
+# navegadores los reproducen a 100 ms; aquí se limita a un valor razonable
+# para no saturar el bucle de Tk.
+MIN_FRAME_DELAY_MS = 20
+DEFAULT_FRAME_DELAY_MS = 100
+
+
+class GifAnimator:
+    """Reproduce una secuencia de fotogramas en un único elemento del canvas."""
+
+    def __init__(self, canvas, x: int, y: int, anchor: str = "center"):
+        self.canvas = canvas
+        self.x = x
+        self.y = y
+        self.anchor = anchor
+        self.item_id: int | None = None
+        self.frames = None
+        self.delays: list = []
+        self.index = 0
+        self._animation = None
+        self._then = None
+        # Contadores de verificación
+        self.items_created = 0
+        self.frames_shown = 0
+        self.frames_dropped = 0
+        self._started_at: float | None = None
+
+    def play(self, frames, delays=None, then=None) -> None:
+        """
+        Empieza a reproducir ``frames`` en bucle.  ``frames`` puede ser
+        cualquier secuencia indexable de imágenes Tk; ``delays`` es la
+        duración en ms de cada fotograma (100 ms por defecto).
+
+        Si se indica ``then``, la secuencia se reproduce una sola vez y al
+        terminar se llama a ``then()`` (así se encadena un fundido con la
+        animación del estado siguiente).
+        """
+        self.stop()
+        self._then = then
+        if not frames:
+            self.hide()
+            return
+        previous, self.frames = self.frames, frames
+        if delays is None:
+            delays = [DEFAULT_FRAME_DELAY_MS] * len(frames)
+        self.delays = [max(MIN_FRAME_DELAY_MS, int(d or DEFAULT_FRAME_DELAY_MS)) for d in delays]
+        self.index = 0
+        self._ensure_item()
+        self.canvas.itemconfig(self.item_id, state="normal")
+        self._show_frame()
+        if previous is not frames:
+            self._release(previous)
+        if len(self.frames) > 1 or then is not None:
+            self._animation = animation_clock.register(
+                self._advance, fps=1000.0 / self.delays[0], name="mascota", immediate=False
+            )
+
+    def stop(self) -> None:
+        """Detiene la animación dejando visible el fotograma actual."""
+        self._then = None
+        if self._animation is not None:
+            self.frames_dropped += self._animation.dropped
+            animation_clock.unregister(self._animation)
+            self._animation = None
+
+    def hide(self) -> None:
+        """Detiene la animación y oculta el elemento de imagen."""
+        self.stop()
+        self._release(self.frames)
+        self.frames = None
+        if self.item_id is not None:
+            try:
+                self.canvas.itemconfig(self.item_id, state="hidden")
+            except Exception:
+                pass
+
+    @staticmethod
+    def _release(frames) -> None:
+        # Las secuencias que expanden fotogramas bajo demanda (ver
+        # modules/frame_store.py) sueltan sus fotos al dejar de mostrarse
+        release = getattr(frames, "release", None)
+        if release is not None:
+            release()
+
+    def _ensure_item(self) -> None:
+        # Se vuelve a crear sólo si alguien ha borrado el elemento del canvas
+        if self.item_id is None or not self.canvas.type(self.item_id):
+            self.item_id = self.canvas.create_image(self.x, self.y, anchor=self.anchor)
+            self.items_created += 1
+
+    def _show_frame(self) -> None:
+        self.canvas.itemconfig(self.item_id, image=self.frames[self.index])
+        self.frames_shown += 1
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+
+    def _advance(self, frames: int) -> bool:
+        """Callback del reloj: avanza ``frames`` fotogramas y muestra el actual."""
+        if not self.frames:
+            return False
+        if self._then is not None and self.index + frames >= len(self.frames):
+            then, self._then = self._then, None
+            then()
+            # ``then`` ya ha iniciado otra animación; ésta termina aquí
+            return False
+        self.index = (self.index + frames) % len(self.frames)
+        self._show_frame()
+        # El siguiente cambio llega cuando termine la duración de este fotograma
+        self._animation.set_fps(1000.0 / self.delays[self.index])
+        return True
+
+    @property
+    def frame_rate(self) -> float:
+        """Fotogramas por segundo mostrados desde el primer fotograma."""
+        if self._started_at is None:
+            return 0.0
+        elapsed = time.perf_counter() - self._started_at
+        return self.frames_shown / elapsed if elapsed > 0 else 0.0
+
+    def stats(self) -> dict:
+        """Resumen de contadores para depuración."""
+        dropped = self.frames_dropped + (self._animation.dropped if self._animation else 0)
+        return {
+            "items_created": self.items_created,
+            "frames_shown": self.frames_shown,
+            "frames_dropped": dropped,
+            "frame_rate": round(self.frame_rate, 2),
+        }
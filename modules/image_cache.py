@@ -0,0 +1,169 @@
+"""
+Caché en memoria de imágenes ya preparadas para dibujar en Tk.
+
+Decodificar un GIF, convertir cada fotograma a RGBA, reescalarlo con
+LANCZOS y crear el ``PhotoImage`` correspondiente es, con diferencia, lo
+más caro que hace la mascota flotante al cambiar de estado.  Esta caché
+guarda el resultado final (la lista de fotogramas listos para el canvas)
+asociado a una clave arbitraria, normalmente ``(estado, tamaño)``, para que
+cambiar a un estado ya visto sólo cueste una actualización del canvas.
+
+La caché es un LRU con presupuesto en bytes: cuando lo que hay en memoria
+supera ``max_bytes`` se descartan primero las entradas usadas hace más
+tiempo.  El tamaño de cada entrada se estima a partir de las dimensiones de
+las imágenes que contiene (4 bytes por píxel, que es lo que Tk reserva para
+cada foto).  Las entradas fijadas con ``pin`` (lo que se está mostrando) no
+se descartan nunca: seguirían en memoria a través de quien las muestra, y
+fuera de la caché dejarían de contar en ``resident_bytes``.
+``image_cache`` es la instancia compartida por la mascota, los fondos y la
+ruleta.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from modules.config import IMAGE_CACHE_MAX_BYTES
+
+BYTES_PER_PIXEL = 4
+
+
+def estimate_bytes(value) -> int:
+    """
+    Estima la memoria ocupada por ``value``: una imagen Tk o PIL, un objeto
+    con atributo ``nbytes``, o una lista/tupla que los contenga.  Los demás
+    objetos cuentan como 0.
+    """
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_bytes(item) for item in value)
+    # Objetos que calculan su propio tamaño (p. ej. ``PaletteFrames``)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        # ImageTk.PhotoImage y tk.PhotoImage exponen width()/height()
+        return int(value.width()) * int(value.height()) * BYTES_PER_PIXEL
+    except Exception:
+        pass
+    try:
+        # Imágenes PIL: ``size`` es una tupla (ancho, alto)
+        width, height = value.size
+        return int(width) * int(height) * BYTES_PER_PIXEL
+    except Exception:
+        return 0
+
+
+class ImageCache:
+    """LRU de imágenes preparadas con presupuesto en bytes y estadísticas."""
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self._pinned: set = set()
+        self._lock = threading.RLock()
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Devuelve la entrada asociada a ``key`` o ``None`` si no existe."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value) -> None:
+        """Guarda ``value`` bajo ``key`` sustituyendo cualquier valor previo."""
+        size = estimate_bytes(value)
+        with self._lock:
+            self.invalidate(key)
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.resident_bytes += size
+            self._evict(keep=key)
+
+    def get_or_create(self, key, factory):
+        """
+        Devuelve la entrada de ``key``; si no existe, la crea con
+        ``factory()`` y la guarda (salvo que ``factory`` devuelva ``None``).
+        """
+        value = self.get(key)
+        if value is None:
+            value = factory()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def invalidate(self, key) -> None:
+        """Elimina una entrada concreta si está presente."""
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self.resident_bytes -= self._sizes.pop(key, 0)
+
+    def pin(self, key) -> None:
+        """Impide que ``key`` se descarte por falta de espacio (sí con ``invalidate``)."""
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key) -> None:
+        """Deshace ``pin``; la entrada vuelve a poder descartarse."""
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict()
+
+    def invalidate_where(self, predicate) -> int:
+        """Elimina las entradas cuya clave cumple ``predicate``; devuelve cuántas."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                self.invalidate(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Vacía la caché por completo."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.resident_bytes = 0
+
+    def _evict(self, keep=None) -> None:
+        # Descartar las entradas menos usadas hasta volver al presupuesto.  La
+        # recién insertada y las fijadas nunca se descartan, aunque por sí
+        # solas lo superen.
+        if self.max_bytes is None:
+            return
+        for key in list(self._entries):
+            if self.resident_bytes <= self.max_bytes:
+                break
+            if key == keep or key in self._pinned:
+                continue
+            self.invalidate(key)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """Aciertos, fallos, descartes y memoria residente de la caché."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "resident_bytes": self.resident_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pinned": sum(1 for key in self._pinned if key in self._entries),
+            }
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+image_cache = ImageCache(IMAGE_CACHE_MAX_BYTES)
@@ -0,0 +1,602 @@
+"""
+Mezclador de audio dentro del proceso.
+
+Durante una partida de 12 horas suenan una y otra vez los mismos ~80 MP3 de
+``assets/sounds``, y cada vez un reproductor externo (``aplay``, ``afplay``,
+MCI...) arranca y vuelve a decodificar el archivo.  ``Mixer`` decodifica cada
+clip una sola vez a PCM de 16 bits con el formato de ``modules/config.py``
+y lo guarda en una caché LRU con presupuesto en bytes (la misma clase que
+la caché de imágenes).  Reproducir un clip ya decodificado sólo añade una
+voz; el mezclador suma las voces activas bloque a bloque (copiar trozos
+del PCM y ``audioop.add``) y entrega el resultado a una única salida.
+
+Salidas (``MIXER_SINK``):
+
+- ``DeviceSink``: la tarjeta de sonido, con ``miniaudio`` (opcional).
+- ``WavSink``: escribe la mezcla en un archivo WAV, útil para escuchar o
+  comparar lo que se habría reproducido en una máquina sin sonido.
+- ``NullSink``: descarta la mezcla y sólo cuenta bytes (pruebas).
+
+Decodificación: si el clip está en la caché de audio transcodificado
+(``python -m modules.audio_cache``) se lee su WAV, que ya tiene el formato
+del mezclador.  Los WAV se leen con la biblioteca estándar (``wave`` y
+``audioop`` para cambiar formato, canales o frecuencia); el resto (MP3,
+OGG) necesita ``miniaudio``.  Si un clip no se puede decodificar, dura más
+de ``MIXER_MAX_CLIP_SECONDS`` o no hay salida disponible, ``play`` devuelve
+``None`` y ``modules/audio.py`` usa el reproductor externo de siempre.
+
+``play`` nunca decodifica en el hilo que lo llama (el del servicio de
+audio): si el clip no está en la caché, la voz se devuelve al momento y
+empieza a sonar cuando el hilo decodificador del mezclador termina.  Así un
+clip nuevo no retrasa a los que se piden detrás.  ``preload`` sí decodifica
+en el hilo que lo llama, para usarlo desde un hilo de precarga.
+
+Las voces devueltas por ``play`` tienen ``poll()`` como un ``Popen``, así que
+el servicio de audio las cuenta igual que a los procesos.  Para medir la
+decodificación y el coste de reproducir desde la caché frente a lanzar un
+proceso, o para mezclar unos clips en un WAV::
+
+    python -m modules.mixer --bench
+    python -m modules.mixer --wav mezcla.wav
+"""
+
+import argparse
+import io
+import os
+import random
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import wave
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from modules.asset_manifest import AUDIO_EXTENSIONS, asset_manifest
+from modules.asset_pack import open_asset
+from modules.audio_cache import audio_cache
+from modules.config import (
+    BASE_DIR,
+    MIXER_BLOCK_FRAMES,
+    MIXER_CHANNELS,
+    MIXER_ENABLED,
+    MIXER_MAX_CLIP_SECONDS,
+    MIXER_PCM_CACHE_MAX_BYTES,
+    MIXER_SAMPLE_RATE,
+    MIXER_SINK,
+    MIXER_WAV_PATH,
+)
+from modules.image_cache import ImageCache
+
+try:
+    # Decodificador de MP3/OGG y salida a la tarjeta de sonido
+    import miniaudio  # type: ignore
+    HAS_MINIAUDIO = True
+except Exception:
+    HAS_MINIAUDIO = False
+
+try:
+    # Suma con saturación en C (no existe a partir de Python 3.13)
+    import audioop  # type: ignore
+except Exception:
+    audioop = None
+
+SAMPLE_WIDTH = 2
+SOUNDS_DIR = os.path.join(BASE_DIR, "assets", "sounds")
+
+
+class PCMClip:
+    """Clip decodificado: PCM de 16 bits intercalado en el formato del mezclador."""
+
+    __slots__ = ("path", "data", "frames", "decode_ms")
+
+    def __init__(self, path: str, data: bytes, frame_bytes: int, decode_ms: float):
+        self.path = path
+        self.data = data
+        self.frames = len(data) // frame_bytes
+        self.decode_ms = decode_ms
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria ocupada (la usa la caché)."""
+        return len(self.data)
+
+
+class MixerVoice:
+    """
+    Un clip sonando en el mezclador.  ``poll`` funciona como en ``Popen``.
+    ``clip`` es ``None`` mientras el clip se decodifica.
+    """
+
+    __slots__ = ("path", "clip", "position", "stopped")
+
+    def __init__(self, path: str, clip: Optional[PCMClip] = None):
+        self.path = path
+        self.clip = clip
+        self.position = 0
+        self.stopped = False
+
+    def poll(self):
+        """``None`` mientras suena (o espera a su clip), ``0`` cuando ha terminado."""
+        if self.stopped:
+            return 0
+        if self.clip is None:
+            return None
+        return 0 if self.position >= len(self.clip.data) else None
+
+    def stop(self) -> None:
+        self.stopped = True
+
+
+def _convert_pcm(frames: bytes, width: int, channels: int, rate: int,
+                 sample_rate: int, out_channels: int) -> bytes:
+    """Convierte PCM entero a 16 bits, ``out_channels`` canales y ``sample_rate`` Hz."""
+    if (width, channels, rate) == (SAMPLE_WIDTH, out_channels, sample_rate):
+        return frames
+    if audioop is None:
+        raise ValueError("hace falta audioop para convertir el formato del WAV")
+    if width == 1:
+        # Los WAV de 8 bits no tienen signo
+        frames = audioop.bias(frames, 1, -128)
+    if width != SAMPLE_WIDTH:
+        frames = audioop.lin2lin(frames, width, SAMPLE_WIDTH)
+    if channels != out_channels:
+        if channels == 1 and out_channels == 2:
+            frames = audioop.tostereo(frames, SAMPLE_WIDTH, 1, 1)
+        elif channels == 2 and out_channels == 1:
+            frames = audioop.tomono(frames, SAMPLE_WIDTH, 0.5, 0.5)
+        else:
+            raise ValueError(f"no se pueden convertir {channels} canales a {out_channels}")
+    if rate != sample_rate:
+        frames, _ = audioop.ratecv(frames, SAMPLE_WIDTH, out_channels, rate, sample_rate, None)
+    return frames
+
+
+def decode_clip(path: str, sample_rate: int = MIXER_SAMPLE_RATE,
+                channels: int = MIXER_CHANNELS) -> bytes:
+    """
+    PCM de 16 bits intercalado de ``path`` con ``sample_rate`` y ``channels``.
+    Lanza una excepción si no hay decodificador para el formato.
+    """
+    with open_asset(path) as fh:
+        data = fh.read()
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(io.BytesIO(data), "rb") as wav:
+                frames = wav.readframes(wav.getnframes())
+                return _convert_pcm(frames, wav.getsampwidth(), wav.getnchannels(),
+                                    wav.getframerate(), sample_rate, channels)
+        except Exception:
+            if not HAS_MINIAUDIO:
+                raise
+    if not HAS_MINIAUDIO:
+        raise ValueError(f"no hay decodificador para {os.path.basename(path)} (pip install miniaudio)")
+    decoded = miniaudio.decode(data, output_format=miniaudio.SampleFormat.SIGNED16,
+                               nchannels=channels, sample_rate=sample_rate)
+    return decoded.samples.tobytes()
+
+
+def _add(a: bytes, b: bytes) -> bytes:
+    """Suma dos bloques PCM de 16 bits con saturación (el más corto se completa con silencio)."""
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) < len(a):
+        b = b + bytes(len(a) - len(b))
+    if audioop is not None:
+        return audioop.add(a, b, SAMPLE_WIDTH)
+    left, right = array("h", a), array("h", b)
+    for i, value in enumerate(right):
+        total = left[i] + value
+        left[i] = 32767 if total > 32767 else -32768 if total < -32768 else total
+    return left.tobytes()
+
+
+class Mixer:
+    """Caché de clips en PCM y mezcla de las voces activas hacia una salida."""
+
+    def __init__(self, sink=None, sample_rate: int = MIXER_SAMPLE_RATE,
+                 channels: int = MIXER_CHANNELS, block_frames: int = MIXER_BLOCK_FRAMES,
+                 max_clip_seconds: float = MIXER_MAX_CLIP_SECONDS,
+                 cache_bytes: int = MIXER_PCM_CACHE_MAX_BYTES, manifest=asset_manifest):
+        self.sink = sink
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.block_frames = block_frames
+        self.frame_bytes = SAMPLE_WIDTH * channels
+        self.max_clip_seconds = max_clip_seconds
+        self.manifest = manifest
+        self.cache = ImageCache(max_bytes=cache_bytes)
+        self.wake = threading.Event()
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._voices: list = []
+        self._undecodable: set = set()
+        self._started = False
+        self._decoder: ThreadPoolExecutor | None = None
+        self._pending: set = set()
+        # Métricas
+        self.played = 0
+        self.decoded = 0
+        self.decode_ms = 0.0
+        self.blocks = 0
+        self.max_render_ms = 0.0
+
+    @property
+    def active(self) -> int:
+        """Voces sonando ahora mismo."""
+        return len(self._voices)
+
+    def load(self, path: str) -> Optional[PCMClip]:
+        """Clip decodificado de ``path`` (de la caché si ya estaba), o ``None`` si no se puede."""
+        key = (path, self.sample_rate, self.channels)
+        clip = self.cache.get(key)
+        if clip is not None or path in self._undecodable:
+            return clip
+        # Un solo hilo decodifica a la vez: dos peticiones del mismo clip no lo hacen dos veces
+        with self._load_lock:
+            clip = self.cache.get(key)
+            if clip is not None:
+                return clip
+            start = time.perf_counter()
+            try:
+                # El WAV ya convertido (modules/audio_cache.py) no hay que decodificarlo
+                source = audio_cache.lookup(path) or path
+                data = decode_clip(source, self.sample_rate, self.channels)
+            except Exception:
+                self._undecodable.add(path)
+                return None
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            clip = PCMClip(path, data, self.frame_bytes, elapsed_ms)
+            self.decoded += 1
+            self.decode_ms += elapsed_ms
+            self.cache.put(key, clip)
+            return clip
+
+    def accepts(self, path: str) -> bool:
+        """
+        Si ``path`` puede sonar por el mezclador: hay salida, hay con qué
+        decodificarlo y no es demasiado largo.
+        """
+        if self.sink is None or path in self._undecodable:
+            return False
+        if not (HAS_MINIAUDIO or path.lower().endswith(".wav") or audio_cache.lookup(path)):
+            # Sin miniaudio sólo se leen WAV (propios o de la caché de audio)
+            return False
+        record = self.manifest.get(path) or {}
+        return (record.get("duration") or 0) <= self.max_clip_seconds
+
+    def preload(self, paths) -> int:
+        """Decodifica ``paths`` por adelantado; devuelve cuántos quedaron en la caché."""
+        return sum(1 for path in paths if self.accepts(path) and self.load(path) is not None)
+
+    def play(self, path: str) -> Optional[MixerVoice]:
+        """
+        Añade ``path`` a la mezcla y devuelve su voz, o ``None`` si no puede
+        sonar por el mezclador (el llamador debe usar otro reproductor).
+        Si el clip no está decodificado, la voz empieza a sonar cuando lo
+        esté; si resulta que no se puede decodificar, termina sin sonar.
+        """
+        if not self.accepts(path) or not self._ensure_started():
+            return None
+        clip = self.cache.get((path, self.sample_rate, self.channels))
+        voice = MixerVoice(path, clip)
+        self.played += 1
+        if clip is None:
+            if self._decoder is None:
+                self._decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mezclador-decodificar")
+            future = self._decoder.submit(self._decode_voice, voice)
+            self._pending.add(future)
+            future.add_done_callback(self._pending.discard)
+        else:
+            self._add_voice(voice)
+        return voice
+
+    def _decode_voice(self, voice: MixerVoice) -> None:
+        clip = self.load(voice.path)
+        if clip is None:
+            voice.stop()
+            return
+        voice.clip = clip
+        self._add_voice(voice)
+
+    def _add_voice(self, voice: MixerVoice) -> None:
+        with self._lock:
+            if not voice.stopped:
+                self._voices.append(voice)
+        self.wake.set()
+
+    def stop_all(self) -> None:
+        with self._lock:
+            for voice in self._voices:
+                voice.stop()
+            self._voices = []
+
+    def _ensure_started(self) -> bool:
+        if self._started:
+            return self.sink is not None
+        with self._lock:
+            if not self._started:
+                try:
+                    self.sink.start(self)
+                except Exception as e:
+                    print(f"Mezclador: no se pudo abrir la salida {self.sink.name}: {e}")
+                    self.sink = None
+                self._started = True
+        return self.sink is not None
+
+    def render(self, frames: int) -> bytes:
+        """
+        Siguientes ``frames`` fotogramas de la mezcla (silencio si no suena
+        nada).  Lo llama la salida desde su propio hilo.
+        """
+        start = time.perf_counter()
+        size = frames * self.frame_bytes
+        chunks = []
+        with self._lock:
+            for voice in self._voices:
+                if voice.stopped:
+                    continue
+                chunk = voice.clip.data[voice.position:voice.position + size]
+                voice.position += len(chunk)
+                chunks.append(chunk)
+            self._voices = [voice for voice in self._voices if voice.poll() is None]
+        if not chunks:
+            return bytes(size)
+        mixed = chunks[0]
+        for chunk in chunks[1:]:
+            mixed = _add(mixed, chunk)
+        if len(mixed) < size:
+            mixed += bytes(size - len(mixed))
+        self.blocks += 1
+        self.max_render_ms = max(self.max_render_ms, (time.perf_counter() - start) * 1000.0)
+        return mixed
+
+    def close(self) -> None:
+        self.stop_all()
+        if self._decoder is not None:
+            # shutdown(cancel_futures=True) no existe antes de Python 3.9
+            for future in list(self._pending):
+                future.cancel()
+            self._decoder.shutdown(wait=False)
+            self._decoder = None
+        if self.sink is not None and self._started:
+            self.sink.stop()
+
+    def stats(self) -> dict:
+        """Clips en caché, voces, decodificación y coste de mezcla en ms."""
+        cache = self.cache.stats()
+        return {
+            "sink": self.sink.name if self.sink is not None else None,
+            "played": self.played,
+            "active": self.active,
+            "clips": cache["entries"],
+            "cache_bytes": cache["resident_bytes"],
+            "decoded": self.decoded,
+            "decode_ms": round(self.decode_ms, 1),
+            "blocks": self.blocks,
+            "max_render_ms": round(self.max_render_ms, 2),
+        }
+
+
+class NullSink:
+    """
+    Salida que descarta la mezcla.  Un hilo pide bloques al mezclador
+    mientras hay voces; con ``realtime`` lo hace al ritmo de reproducción,
+    sin él tan rápido como puede (pruebas).
+    """
+
+    name = "null"
+
+    def __init__(self, realtime: bool = True):
+        self.realtime = realtime
+        self.bytes_written = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.mixer: Mixer | None = None
+
+    def start(self, mixer: Mixer) -> None:
+        self.mixer = mixer
+        self._thread = threading.Thread(target=self._run, name=f"mezclador-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self.mixer is not None:
+            self.mixer.wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def write(self, data: bytes) -> None:
+        self.bytes_written += len(data)
+
+    def _run(self) -> None:
+        mixer = self.mixer
+        period = mixer.block_frames / mixer.sample_rate
+        next_at = time.perf_counter()
+        while not self._stop.is_set():
+            if not mixer.active:
+                # Sin voces no se escribe nada: esperar a la siguiente
+                mixer.wake.clear()
+                if not mixer.active:
+                    mixer.wake.wait(0.5)
+                next_at = time.perf_counter()
+                continue
+            self.write(mixer.render(mixer.block_frames))
+            if self.realtime:
+                next_at += period
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+
+class WavSink(NullSink):
+    """Salida que escribe la mezcla en un archivo WAV (sólo los tramos con sonido)."""
+
+    name = "wav"
+
+    def __init__(self, path: str = MIXER_WAV_PATH, realtime: bool = True):
+        super().__init__(realtime)
+        self.path = path
+        self._wav = None
+
+    def start(self, mixer: Mixer) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._wav = wave.open(self.path, "wb")
+        self._wav.setnchannels(mixer.channels)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(mixer.sample_rate)
+        super().start(mixer)
+
+    def write(self, data: bytes) -> None:
+        # ``writeframes`` actualiza la cabecera: el archivo es válido aunque no se cierre
+        self._wav.writeframes(data)
+        super().write(data)
+
+    def stop(self) -> None:
+        super().stop()
+        if self._wav is not None:
+            self._wav.close()
+            self._wav = None
+
+
+class DeviceSink:
+    """Salida a la tarjeta de sonido con ``miniaudio``: el dispositivo pide los bloques."""
+
+    name = "device"
+
+    def __init__(self, buffer_ms: int = 40):
+        self.buffer_ms = buffer_ms
+        self._device = None
+
+    def start(self, mixer: Mixer) -> None:
+        def stream():
+            frames = yield b""
+            while True:
+                frames = yield mixer.render(frames)
+
+        generator = stream()
+        next(generator)
+        self._device = miniaudio.PlaybackDevice(
+            output_format=miniaudio.SampleFormat.SIGNED16, nchannels=mixer.channels,
+            sample_rate=mixer.sample_rate, buffersize_msec=self.buffer_ms)
+        self._device.start(generator)
+
+    def stop(self) -> None:
+        if self._device is not None:
+            self._device.close()
+            self._device = None
+
+
+class _ManualSink(NullSink):
+    """Salida sin hilo: quien la usa llama a ``render`` (banco de medidas y ``mix_to_wav``)."""
+
+    name = "manual"
+
+    def start(self, mixer: Mixer) -> None:
+        self.mixer = mixer
+
+
+def make_sink(name: str = MIXER_SINK):
+    """Salida ``name`` ("device", "wav" o "null"), o ``None`` si no está disponible."""
+    if name == "device":
+        return DeviceSink() if HAS_MINIAUDIO else None
+    if name == "wav":
+        return WavSink()
+    if name == "null":
+        return NullSink()
+    return None
+
+
+mixer = Mixer(make_sink() if MIXER_ENABLED else None)
+
+
+def _sound_files() -> list:
+    folders = sorted(os.path.join(SOUNDS_DIR, name) for name in os.listdir(SOUNDS_DIR)
+                     if os.path.isdir(os.path.join(SOUNDS_DIR, name)))
+    return [path for folder in folders for path in asset_manifest.files(folder, AUDIO_EXTENSIONS)]
+
+
+def benchmark(repeat: int = 200) -> None:
+    """
+    Decodifica todos los clips que acepta el mezclador y compara el coste de
+    reproducir uno desde la caché con el de lanzar un proceso.
+    """
+    test_mixer = Mixer(_ManualSink())
+    files = _sound_files()
+    clips = [clip for clip in (test_mixer.load(path) for path in files if test_mixer.accepts(path))
+             if clip is not None]
+    stats = test_mixer.stats()
+    print(f"{len(clips)}/{len(files)} clips decodificados en {stats['decode_ms']:.0f} ms, "
+          f"{stats['cache_bytes'] / 1048576:.1f} MB en caché "
+          f"({test_mixer.sample_rate} Hz, {test_mixer.channels} canales)")
+    if len(clips) < len(files):
+        print("  Los demás necesitan miniaudio (pip install miniaudio) o duran más de "
+              f"{test_mixer.max_clip_seconds} s")
+    if not clips:
+        return
+    start = time.perf_counter()
+    for i in range(repeat):
+        test_mixer.play(clips[i % len(clips)].path)
+    play_us = (time.perf_counter() - start) / repeat * 1e6
+    start = time.perf_counter()
+    for _ in range(repeat):
+        test_mixer.render(test_mixer.block_frames)
+    render_us = (time.perf_counter() - start) / repeat * 1e6
+    voices = test_mixer.active
+    test_mixer.close()
+    command = [shutil.which("true")] if shutil.which("true") else [sys.executable, "-c", "pass"]
+    spawn = []
+    for _ in range(20):
+        start = time.perf_counter()
+        process = subprocess.Popen(command)
+        spawn.append(time.perf_counter() - start)
+        process.wait()
+    print(f"Reproducir desde la caché: {play_us:.1f} µs por clip; lanzar un proceso "
+          f"({os.path.basename(command[0])}): {min(spawn) * 1e6:.0f} µs sin contar la decodificación")
+    print(f"Mezclar un bloque de {test_mixer.block_frames} fotogramas con {voices} voces: "
+          f"{render_us:.0f} µs ({test_mixer.block_frames / test_mixer.sample_rate * 1000:.1f} ms de audio)")
+
+
+def mix_to_wav(path: str, count: int = 3, gap_ms: float = 500.0) -> None:
+    """Mezcla ``count`` clips al azar, separados ``gap_ms``, en el WAV ``path``."""
+    test_mixer = Mixer(_ManualSink())
+    files = [p for p in _sound_files() if test_mixer.accepts(p) and test_mixer.load(p) is not None]
+    if not files:
+        print("No hay clips que se puedan decodificar (pip install miniaudio)")
+        return
+    gap_frames = int(test_mixer.sample_rate * gap_ms / 1000.0)
+    chosen = random.sample(files, min(count, len(files)))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(test_mixer.channels)
+        wav.setsampwidth(SAMPLE_WIDTH)
+        wav.setframerate(test_mixer.sample_rate)
+        for clip_path in chosen:
+            test_mixer.play(clip_path)
+            rendered = 0
+            while rendered < gap_frames and test_mixer.active:
+                wav.writeframes(test_mixer.render(test_mixer.block_frames))
+                rendered += test_mixer.block_frames
+        while test_mixer.active:
+            wav.writeframes(test_mixer.render(test_mixer.block_frames))
+    print(f"{len(chosen)} clips mezclados en {path}: " + ", ".join(os.path.basename(p) for p in chosen))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mezclador de audio dentro del proceso.")
+    parser.add_argument("--bench", action="store_true", help="medir decodificación y reproducción")
+    parser.add_argument("--wav", metavar="RUTA", help="mezclar unos clips al azar en un WAV")
+    parser.add_argument("--clips", type=int, default=3, help="clips a mezclar con --wav")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark()
+    elif args.wav:
+        mix_to_wav(args.wav, args.clips)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
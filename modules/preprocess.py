@@ -0,0 +1,136 @@
+"""
+Preprocesado en paralelo de sprites y fondos.
+
+Todas las imágenes se reescalan en tiempo de ejecución al tamaño en que se
+muestran.  Este comando deja hecho ese trabajo para exactamente las
+entradas que leen los cargadores, repartiéndolo en un
+``ProcessPoolExecutor``::
+
+    python -m modules.preprocess              # todos los núcleos
+    python -m modules.preprocess --workers 2
+
+Las entradas son las mismas combinaciones de archivo y parámetros que piden
+los cargadores:
+
+- El sprite de cada estado (``find_sprite_sources``) a ``PET_SIZE``.
+- Los fondos ``fran*`` de ``assets/custom`` a ``ROULETTE_BACKGROUND_SIZE``
+  y a cada uno de los ``MINIGAME_BACKGROUND_SIZES``, oscurecidos.
+- El fondo de victoria que usa ``_game_won`` (el primero de
+  ``assets/backgrounds``) a ``VICTORY_BACKGROUND_SIZE``.
+
+Cada una se decodifica, convierte, reescala y oscurece exactamente igual
+que en tiempo de ejecución, y el resultado se guarda en la caché de
+fotogramas en disco (``.cache/frames``): a partir de ahí ninguna de esas
+imágenes se vuelve a reescalar al arrancar.  Las imágenes de
+``assets/minigames`` no se procesan porque ningún minijuego las carga.
+
+Al terminar se muestra un informe con lo que ocupa la caché frente a los
+originales y la reducción del tiempo de carga (decodificar y reescalar
+frente a leer la caché en disco) para esas mismas entradas.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from modules.backgrounds import DEFAULT_BRIGHTNESS, background_service, victory_background_paths
+from modules.config import (
+    MINIGAME_BACKGROUND_SIZES,
+    PET_SIZE,
+    ROULETTE_BACKGROUND_SIZE,
+    VICTORY_BACKGROUND_SIZE,
+)
+from modules.sprite_atlas import find_sprite_sources
+
+try:
+    from PIL import Image  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+
+def collect_jobs() -> list:
+    """
+    Lista de trabajos ``(ruta, tamaño, brillo, modo, max_frames)`` con los
+    mismos parámetros que usan los cargadores en tiempo de ejecución.
+    """
+    jobs = []
+    for path in find_sprite_sources().values():
+        max_frames = None if path.lower().endswith(".gif") else 1
+        jobs.append((path, (PET_SIZE, PET_SIZE), 1.0, "RGBA", max_frames))
+    for path in background_service.list_files():
+        jobs.append((path, ROULETTE_BACKGROUND_SIZE, DEFAULT_BRIGHTNESS, "RGBA", 1))
+        for size in MINIGAME_BACKGROUND_SIZES:
+            jobs.append((path, size, DEFAULT_BRIGHTNESS, "RGBA", 1))
+    for path in victory_background_paths()[:1]:
+        jobs.append((path, VICTORY_BACKGROUND_SIZE, 1.0, "RGB", 1))
+    return jobs
+
+
+def process_job(job: tuple) -> dict:
+    """
+    Prepara una entrada de la caché en disco (se ejecuta en un proceso del
+    pool).  Devuelve bytes y tiempos para el informe.
+    """
+    from modules.disk_cache import decode_frames, disk_cache
+
+    path, size, brightness, mode, max_frames = job
+    start = time.perf_counter()
+    frames, durations = decode_frames(path, size, brightness, mode, max_frames)
+    decode_s = time.perf_counter() - start
+    disk_cache.store(path, size, brightness, mode, max_frames, frames, durations)
+    start = time.perf_counter()
+    stored = disk_cache.load(path, size, brightness, mode, max_frames)
+    cached_s = time.perf_counter() - start
+    return {
+        "source": path,
+        "source_bytes": os.path.getsize(path),
+        "cache_bytes": sum(len(frame.tobytes()) for frame in frames),
+        "stored": stored is not None,
+        "decode_s": decode_s,
+        "cached_s": cached_s,
+    }
+
+
+def run(workers: Optional[int] = None) -> list:
+    """Procesa todos los trabajos en paralelo y devuelve sus resultados."""
+    jobs = collect_jobs()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(process_job, jobs, chunksize=4))
+
+
+def report(results: list, elapsed: float) -> None:
+    sources: dict = {}
+    for r in results:
+        sources[r["source"]] = r["source_bytes"]
+    stored = [r for r in results if r["stored"]]
+    cache_bytes = sum(r["cache_bytes"] for r in stored)
+    decode_s = sum(r["decode_s"] for r in stored)
+    cached_s = sum(r["cached_s"] for r in stored)
+    print(f"{len(stored)}/{len(results)} entradas de {len(sources)} imágenes en la caché en disco "
+          f"en {elapsed:.1f} s")
+    if len(stored) < len(results):
+        print(f"  {len(results) - len(stored)} no se pudieron guardar (¿permisos en .cache?)")
+    print(f"  originales: {sum(sources.values()) / 1048576:.2f} MB -> caché sin comprimir: "
+          f"{cache_bytes / 1048576:.2f} MB")
+    print(f"  carga en tiempo de ejecución: {decode_s * 1000:.0f} ms decodificando y reescalando "
+          f"-> {cached_s * 1000:.0f} ms desde la caché en disco "
+          f"({(1 - cached_s / decode_s) * 100 if decode_s else 0:.0f} % menos)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Preprocesa sprites y fondos en paralelo.")
+    parser.add_argument("--workers", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    args = parser.parse_args()
+    if not HAS_PIL:
+        print("Pillow no está instalado")
+        return
+    start = time.perf_counter()
+    results = run(args.workers)
+    report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Precalentamiento de imágenes mientras la aplicación está en reposo.
+
+La mayor parte de la sesión Mini‑Diego sólo espera al siguiente evento de
+minijuego.  ``IdlePrewarmer`` aprovecha ese tiempo para dejar preparadas
+las imágenes antes de que hagan falta: sprites de todos los estados,
+fondos oscurecidos a cada tamaño de minijuego, el de la ruleta y el de la
+pantalla de victoria.
+
+Cada tarea tiene dos partes:
+
+- ``prepare()`` hace el trabajo caro (decodificar, reescalar, oscurecer)
+  sin tocar Tk, en un hilo aparte.  De paso deja el resultado en la caché
+  en disco.
+- ``finish(resultado)`` crea los ``PhotoImage`` y los guarda en la caché
+  de imágenes; debe ejecutarse en el hilo de Tk.
+
+Los ``finish`` se ejecutan en trozos programados con ``after`` +
+``after_idle`` con un presupuesto de tiempo (``PREWARM_SLICE_MS``).  Antes
+de cada paso se estima lo que costará a partir de sus bytes y de lo que
+han costado los pasos anteriores (``PREWARM_MS_PER_MB`` hasta tener
+medidas); si no cabe en lo que queda del trozo, se deja para el siguiente.
+Los fondos (``add_photo``) se crean por franjas de filas que caben en un
+trozo, así que ni el más grande bloquea la interfaz de una vez.  Un paso
+que no se puede partir (una foto con transparencia, los fotogramas de un
+sprite) y no cabe en un trozo entero se ejecuta solo, al principio de uno.
+Mientras ``is_busy()`` sea cierto (por ejemplo, con un
+minijuego abierto) no se hace nada.  Para no expulsar de la caché lo que
+ya está en uso, los ``finish`` se omiten cuando la caché llega a
+``PREWARM_MEMORY_FRACTION`` de su presupuesto; esas imágenes quedan
+preparadas sólo en disco.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+from modules import tk_bridge
+from modules.config import (
+    PREWARM_INTERVAL_MS,
+    PREWARM_MEMORY_FRACTION,
+    PREWARM_MS_PER_MB,
+    PREWARM_SLICE_MS,
+    PREWARM_START_DELAY_MS,
+)
+from modules.image_cache import BYTES_PER_PIXEL, estimate_bytes, image_cache
+
+# Resultados preparados que pueden esperar al hilo de Tk a la vez
+MAX_PREPARED = 4
+# Fracción del trozo que puede ocupar una franja de un fondo, para dejar
+# margen a los errores de la estimación
+STRIP_FRACTION = 0.5
+# Peso de cada medida nueva en el coste por byte estimado
+COST_SMOOTHING = 0.25
+# Filas de la primera franja, antes de haber medido nada
+PROBE_ROWS = 8
+
+
+class IdlePrewarmer:
+    """Cola de tareas de precalentamiento repartidas en trozos de tiempo acotado."""
+
+    def __init__(self, widget, is_busy=None, cache=image_cache,
+                 slice_ms: float = PREWARM_SLICE_MS, interval_ms: int = PREWARM_INTERVAL_MS,
+                 memory_fraction: float = PREWARM_MEMORY_FRACTION):
+        self.widget = widget
+        self.is_busy = is_busy or (lambda: False)
+        self.cache = cache
+        self.slice_ms = slice_ms
+        self.interval_ms = interval_ms
+        self.memory_fraction = memory_fraction
+        self._tasks: deque = deque()
+        self._prepared: queue.Queue = queue.Queue(maxsize=MAX_PREPARED)
+        # Tarea a medias en el hilo de Tk: (pasos, bytes del siguiente paso,
+        # si sus pasos sirven para medir el coste por byte)
+        self._current = None
+        self.ms_per_byte = PREWARM_MS_PER_MB / 1048576.0
+        self._measured = False
+        self._idle = threading.Event()
+        self._worker_done = threading.Event()
+        self._started = False
+        # Contadores
+        self.prepared = 0
+        self.finished = 0
+        self.disk_only = 0
+        self.skipped = 0
+        self.slices = 0
+        self.deferred = 0
+        self.max_slice_ms = 0.0
+
+    def add(self, key, prepare, finish) -> None:
+        """
+        Añade una tarea.  ``key`` es la clave de la caché que rellenará
+        ``finish``; si ya está en caché, la tarea se omite.
+        """
+        self._tasks.append((key, prepare, finish))
+
+    def add_photo(self, key, prepare) -> None:
+        """
+        Añade una tarea cuyo ``prepare`` devuelve una ``PreparedImage``
+        (``modules/tk_bridge.py``).  La foto se crea por franjas y se guarda
+        en la caché bajo ``key``.
+        """
+        self._tasks.append((key, prepare, None))
+
+    def start(self, delay_ms: int = PREWARM_START_DELAY_MS) -> None:
+        """Empieza a precalentar tras ``delay_ms`` (sólo la primera vez)."""
+        if self._started:
+            return
+        self._started = True
+        threading.Thread(target=self._worker, daemon=True).start()
+        self._schedule(delay_ms)
+
+    @property
+    def done(self) -> bool:
+        return self._worker_done.is_set() and self._prepared.empty() and self._current is None
+
+    def _worker(self) -> None:
+        while self._tasks:
+            # No competir por la CPU mientras la interfaz está ocupada
+            self._idle.wait()
+            key, prepare, finish = self._tasks.popleft()
+            if key in self.cache:
+                self.skipped += 1
+                continue
+            try:
+                result = prepare()
+            except Exception:
+                continue
+            self.prepared += 1
+            self._prepared.put((key, finish, result))
+        self._worker_done.set()
+
+    def _schedule(self, delay_ms: int) -> None:
+        try:
+            self.widget.after(delay_ms, lambda: self.widget.after_idle(self._slice))
+        except Exception:
+            # La ventana ya no existe
+            pass
+
+    def _slice(self) -> None:
+        if self.is_busy():
+            self._idle.clear()
+            self._schedule(self.interval_ms)
+            return
+        self._idle.set()
+        start = time.perf_counter()
+        self.slices += 1
+        ran = False
+        while True:
+            if self._current is None and not self._next_task():
+                break
+            steps, cost, measurable = self._current
+            estimate_ms = cost * self.ms_per_byte
+            elapsed_ms = (time.perf_counter() - start) * 1000.0
+            if ran and elapsed_ms + estimate_ms > self.slice_ms:
+                # No cabe en lo que queda: al siguiente trozo
+                self.deferred += 1
+                break
+            ran = True
+            step_start = time.perf_counter()
+            try:
+                self._current = (steps, next(steps), measurable)
+            except StopIteration:
+                self._current = None
+                self.finished += 1
+            except Exception:
+                self._current = None
+            if measurable and cost:
+                # Sólo las franjas de fotos: su coste es proporcional a los bytes
+                measured = (time.perf_counter() - step_start) * 1000.0 / cost
+                if self._measured:
+                    self.ms_per_byte += COST_SMOOTHING * (measured - self.ms_per_byte)
+                else:
+                    self.ms_per_byte = measured
+                    self._measured = True
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        self.max_slice_ms = max(self.max_slice_ms, elapsed_ms)
+        if not self.done:
+            self._schedule(self.interval_ms)
+
+    def _next_task(self) -> bool:
+        """Pasa a ``_current`` el siguiente resultado preparado que haga falta."""
+        while True:
+            try:
+                key, finish, result = self._prepared.get_nowait()
+            except queue.Empty:
+                return False
+            if key in self.cache:
+                self.skipped += 1
+                continue
+            if not self._fits(result):
+                self.disk_only += 1
+                continue
+            if finish is None:
+                steps = self._photo_steps(key, result)
+            else:
+                steps = self._single_step(finish, result)
+            self._current = (steps, next(steps), finish is None)
+            return True
+
+    @staticmethod
+    def _single_step(finish, result):
+        # Los pasos producen los bytes del paso siguiente antes de hacerlo
+        yield estimate_bytes(result)
+        finish(result)
+
+    def _photo_steps(self, key, prepared):
+        if prepared.data is None:
+            # Con transparencia no se puede partir: ``ImageTk.PhotoImage`` entera
+            yield estimate_bytes(prepared)
+            self.cache.put(key, tk_bridge.photo(prepared))
+            return
+        width, height = prepared.size
+        row_bytes = width * BYTES_PER_PIXEL
+        yield 0
+        photo = tk_bridge.blank(prepared)
+        top = 0
+        while top < height:
+            # Franjas según el coste medido hasta ahora (una pequeña si aún no hay medidas)
+            if self._measured:
+                rows = int(self.slice_ms * STRIP_FRACTION / self.ms_per_byte // row_bytes)
+            else:
+                rows = PROBE_ROWS
+            bottom = min(height, top + max(1, rows))
+            yield (bottom - top) * row_bytes
+            tk_bridge.put_rows(photo, prepared, top, bottom)
+            top = bottom
+        yield 0
+        self.cache.put(key, photo)
+
+    def _fits(self, result) -> bool:
+        max_bytes = getattr(self.cache, "max_bytes", None)
+        if max_bytes is None:
+            return True
+        limit = max_bytes * self.memory_fraction
+        return self.cache.resident_bytes + estimate_bytes(result) <= limit
+
+    def stats(self) -> dict:
+        """Tareas pendientes, preparadas, terminadas y duración máxima de un trozo."""
+        return {
+            "pending": len(self._tasks),
+            "prepared": self.prepared,
+            "finished": self.finished,
+            "disk_only": self.disk_only,
+            "skipped": self.skipped,
+            "slices": self.slices,
+            "deferred": self.deferred,
+            "max_slice_ms": round(self.max_slice_ms, 2),
+        }
@@ -0,0 +1,303 @@
+"""
+Procesos hijo gestionados para los reproductores externos.
+
+``simple_play_sound`` lanzaba ``subprocess.Popen(['aplay', ...])`` y
+``play_random_sound`` recurría a ``xdg-open`` sin esperar nunca a ninguno:
+en una partida de 12 horas se acumulaban procesos zombi y descriptores.
+``process_pool`` es la única vía para lanzar esos procesos:
+
+- ``spawn`` no lanza nada si ya hay ``AUDIO_MAX_PROCESSES`` vivos.
+- Un hilo recoge los hijos terminados cada ``PROCESS_REAP_INTERVAL_MS``
+  mientras quede alguno vivo (``poll`` hace el ``waitpid``).  Se usa un
+  hilo y no ``SIGCHLD`` porque Python sólo atiende señales en el hilo
+  principal, que es el de Tk, y porque así funciona igual en Windows.
+- Un proceso que sigue vivo después de su ``timeout`` recibe ``terminate``
+  y, si no sale en ``KILL_GRACE_SECONDS``, ``kill``.
+- Al salir del juego, ``terminate_all`` hace lo mismo con todos los que
+  queden y espera a que terminen.
+
+Los hijos se lanzan con la entrada y las salidas en ``DEVNULL``, así que no
+quedan tuberías abiertas en el proceso del juego.  ``stats()`` devuelve los
+procesos vivos, lanzados, recogidos y terminados a la fuerza.
+
+Para comprobarlo en Linux con un reproductor falso (un script que sólo
+espera, ``write_fake_player``), comparado con lanzar sin esperar como
+antes::
+
+    python -m modules.process_pool --bench
+
+Las pruebas de ``tests/test_process_pool.py`` usan el mismo reproductor.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from modules.config import (
+    AUDIO_MAX_PROCESSES,
+    PLAYER_KILL_TIMEOUT_S,
+    PROCESS_REAP_INTERVAL_MS,
+)
+
+# Tiempo entre ``terminate`` y ``kill`` para un proceso que no termina
+KILL_GRACE_SECONDS = 1.0
+
+
+class ManagedProcess:
+    """Proceso lanzado por ``ProcessPool``.  ``poll`` funciona como en ``Popen``."""
+
+    __slots__ = ("popen", "started_at", "deadline", "terminated_at")
+
+    def __init__(self, popen, timeout: float):
+        self.popen = popen
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + timeout
+        self.terminated_at: float | None = None
+
+    @property
+    def pid(self) -> int:
+        return self.popen.pid
+
+    def poll(self):
+        return self.popen.poll()
+
+    def terminate(self) -> None:
+        try:
+            self.popen.terminate()
+        except OSError:
+            pass
+
+    def kill(self) -> None:
+        try:
+            self.popen.kill()
+        except OSError:
+            pass
+
+
+class ProcessPool:
+    """Procesos hijo con límite, recogida en segundo plano y tiempo máximo de vida."""
+
+    def __init__(self, max_processes: int = AUDIO_MAX_PROCESSES,
+                 reap_interval_ms: float = PROCESS_REAP_INTERVAL_MS,
+                 default_timeout: float = PLAYER_KILL_TIMEOUT_S):
+        self.max_processes = max(1, max_processes)
+        self.reap_interval = reap_interval_ms / 1000.0
+        self.default_timeout = default_timeout
+        self._live: list = []
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Métricas
+        self.spawned = 0
+        self.reaped = 0
+        self.killed = 0
+        self.rejected = 0
+        self.max_live = 0
+
+    @property
+    def live(self) -> int:
+        """Procesos lanzados que todavía no se han recogido."""
+        return len(self._live)
+
+    @property
+    def full(self) -> bool:
+        """Si ``spawn`` no lanzaría nada (tras recoger los que ya han terminado)."""
+        if len(self._live) >= self.max_processes:
+            self.reap()
+        return len(self._live) >= self.max_processes
+
+    def spawn(self, args: list, timeout: Optional[float] = None) -> Optional[ManagedProcess]:
+        """
+        Lanza ``args`` y lo vigila.  Devuelve ``None`` si ya hay
+        ``max_processes`` vivos; los errores de ``Popen`` (por ejemplo
+        ``FileNotFoundError`` si el programa no existe) se propagan.
+        """
+        with self._lock:
+            if len(self._live) >= self.max_processes:
+                # Puede que alguno haya terminado desde la última recogida
+                self.reap()
+            if len(self._live) >= self.max_processes:
+                self.rejected += 1
+                return None
+            popen = subprocess.Popen(args, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL)
+            process = ManagedProcess(popen, self.default_timeout if timeout is None else timeout)
+            self._live.append(process)
+            self.spawned += 1
+            self.max_live = max(self.max_live, len(self._live))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="recogida-procesos", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return process
+
+    def reap(self) -> int:
+        """Recoge los procesos terminados y termina los que se han pasado de tiempo."""
+        now = time.monotonic()
+        with self._lock:
+            live = []
+            finished = 0
+            for process in self._live:
+                if process.poll() is not None:
+                    finished += 1
+                    continue
+                if process.terminated_at is None and now > process.deadline:
+                    process.terminate()
+                    process.terminated_at = now
+                    self.killed += 1
+                elif process.terminated_at is not None and now > process.terminated_at + KILL_GRACE_SECONDS:
+                    process.kill()
+                live.append(process)
+            self._live = live
+            self.reaped += finished
+        return finished
+
+    def _run(self) -> None:
+        while True:
+            if not self._live:
+                # Nada que vigilar: dormir hasta el siguiente ``spawn``
+                self._wake.clear()
+                if not self._live:
+                    self._wake.wait()
+            time.sleep(self.reap_interval)
+            try:
+                self.reap()
+            except Exception:
+                pass
+
+    def terminate_all(self, grace: float = KILL_GRACE_SECONDS) -> int:
+        """
+        Termina todos los procesos vivos (al salir del juego).  Los que no
+        han salido al cabo de ``grace`` segundos (por ejemplo, porque
+        ignoran ``SIGTERM``) reciben ``kill``.  Devuelve cuántos hubo que
+        matar así.
+        """
+        with self._lock:
+            processes = [process for process in self._live if process.poll() is None]
+            for process in processes:
+                process.terminate()
+            deadline = time.monotonic() + grace
+            forced = 0
+            for process in processes:
+                try:
+                    process.popen.wait(max(0.0, deadline - time.monotonic()))
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    forced += 1
+                    try:
+                        process.popen.wait(grace)
+                    except subprocess.TimeoutExpired:
+                        pass
+            self.killed += forced
+            self.reap()
+        return forced
+
+    def stats(self) -> dict:
+        return {
+            "live": self.live,
+            "max_live": self.max_live,
+            "spawned": self.spawned,
+            "reaped": self.reaped,
+            "killed": self.killed,
+            "rejected": self.rejected,
+        }
+
+
+process_pool = ProcessPool()
+
+
+# Reproductor falso para el banco de medidas y las pruebas: "reproduce"
+# durante los segundos que recibe como argumento; con ``--ignore-term`` no
+# hace caso de ``SIGTERM``, como un reproductor colgado
+FAKE_PLAYER = (
+    "#!{python}\n"
+    "import signal, sys, time\n"
+    "if '--ignore-term' in sys.argv:\n"
+    "    signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+    "time.sleep(float(sys.argv[1]))\n"
+)
+
+
+def write_fake_player(directory: str) -> str:
+    """Escribe el reproductor falso en ``directory`` y devuelve su ruta."""
+    player = os.path.join(directory, "fake-player")
+    with open(player, "w") as fh:
+        fh.write(FAKE_PLAYER.format(python=sys.executable))
+    os.chmod(player, 0o755)
+    return player
+
+
+def _zombies() -> int:
+    """Hijos de este proceso en estado zombi (sólo Linux, leyendo ``/proc``)."""
+    count = 0
+    me = os.getpid()
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat", "r") as fh:
+                fields = fh.read().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        if fields[0] == "Z" and int(fields[1]) == me:
+            count += 1
+    return count
+
+
+def benchmark(plays: int = 30, clip: float = 0.3, hung_every: int = 10, timeout: float = 1.0) -> None:
+    """
+    Lanza ``plays`` reproducciones con un reproductor falso; una de cada
+    ``hung_every`` se queda colgada (dura mucho más que su ``timeout``).
+    Compara con lanzar sin esperar, como hacía ``simple_play_sound``.
+    """
+    if not sys.platform.startswith("linux"):
+        print("El banco de medidas necesita Linux (/proc)")
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        player = write_fake_player(tmp)
+
+        def seconds(i: int) -> str:
+            return str(60.0 if hung_every and i % hung_every == hung_every - 1 else clip)
+
+        # Antes: Popen sin esperar nunca
+        before = [subprocess.Popen([player, seconds(i)]) for i in range(plays)]
+        time.sleep(clip + 0.5)
+        zombies_before = _zombies()
+        alive_before = sum(1 for p in before if p.poll() is None)
+        for p in before:
+            p.kill()
+            p.wait()
+
+        pool = ProcessPool(max_processes=plays)
+        start = time.monotonic()
+        for i in range(plays):
+            pool.spawn([player, seconds(i)], timeout=timeout)
+        while pool.live and time.monotonic() - start < timeout + KILL_GRACE_SECONDS + 5:
+            time.sleep(0.05)
+        stats = pool.stats()
+        print(f"{plays} reproducciones de {clip:.1f} s, {plays // hung_every if hung_every else 0} colgadas:")
+        print(f"  antes: {zombies_before} zombis y {alive_before} colgados "
+              f"{clip + 0.5:.1f} s después, sin límite de tiempo")
+        print(f"  ahora: {stats['reaped']} recogidos, {stats['killed']} terminados por tiempo "
+              f"({timeout:.1f} s), {stats['live']} vivos y {_zombies()} zombis al cabo de "
+              f"{time.monotonic() - start:.1f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Procesos reproductores gestionados.")
+    parser.add_argument("--bench", action="store_true", help="probar con un reproductor falso")
+    parser.add_argument("--plays", type=int, default=30, help="número de reproducciones")
+    args = parser.parse_args()
+    if args.bench:
+        benchmark(args.plays)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
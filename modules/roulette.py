@@ -1,14 +1,9 @@
 import tkinter as tk
 import math
 import random
-import os
 
-try:
-    # Import PIL para fondos aleatorios
-    from PIL import Image, ImageTk, ImageEnhance  # type: ignore
-    HAS_PIL = True
-except Exception:
-    HAS_PIL = False
+from modules.backgrounds import background_service
+from modules.animation_clock import animation_clock
 
 class Roulette:
     def __init__(self, parent_window, sectors, callback, title="Ruleta"):
@@ -47,24 +42,7 @@ class Roulette:
         self.canvas.bind("<B1-Motion>", self._drag)
 
         # Fondo aleatorio
-        self.bg_photo = None
-        if HAS_PIL:
-            bg_dir = os.path.join("assets", "custom")
-            try:
-                fran_files = [f for f in os.listdir(bg_dir) if f.lower().startswith("fran") and f.lower().endswith((".png", ".gif"))]
-            except Exception:
-                fran_files = []
-            if fran_files:
-                chosen = random.choice(fran_files)
-                path = os.path.join(bg_dir, chosen)
-                try:
-                    img = Image.open(path)
-                    img = img.resize((width, height), Image.Resampling.LANCZOS)
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(0.7)
-                    self.bg_photo = ImageTk.PhotoImage(img)
-                except Exception:
-                    self.bg_photo = None
+        self.bg_photo = background_service.random_background(width, height)
         
         self.size = 350
         self.radius = 140
@@ -218,24 +196,31 @@ class Roulette:
         self.spinning = True
         self.v = random.uniform(22, 38)
         self.dec = random.uniform(0.16, 0.26)
-        self._animate()
+        animation_clock.register(self._animate, fps=60, name="ruleta")
 
     def _auto_spin(self):
         """Lanza el giro automáticamente si el usuario no ha pulsado el botón en 30 s"""
         if not self.spinning:
             self.start()
     
-    def _animate(self):
-        """Animación del giro"""
+    def _animate(self, frames=1):
+        """
+        Animación del giro.  Se llama desde el reloj de animación compartido;
+        si éste se retrasa, ``frames`` indica cuántos pasos de la física del
+        giro hay que avanzar antes de redibujar una sola vez.
+        """
         if self.v > 0.1:
-            self.angle += self.v
-            self.v -= self.dec
-            
-            if self.v < 0:
-                self.v = 0
+            for _ in range(frames):
+                if self.v <= 0.1:
+                    break
+                self.angle += self.v
+                self.v -= self.dec
+                
+                if self.v < 0:
+                    self.v = 0
             
             self.draw_roulette(self.angle)
-            self.canvas.after(16, self._animate)
+            return True
         else:
             # Giro terminado
             self.spinning = False
@@ -245,6 +230,7 @@ class Roulette:
             # Mostrar resultado antes de cerrar
             self._show_result(label)
             self.canvas.after(1500, lambda: self._finish(payload))
+            return False
     
     def _show_result(self, label):
         """Muestra el resultado ganador"""
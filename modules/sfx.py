@@ -0,0 +1,125 @@
+"""
+Efectos de sonido por tecla con latencia acotada.
+
+``QWERHeroGame`` buscaba en cada pulsación los archivos de
+``assets/sounds/qwer_<tecla>`` y llamaba a ``playsound`` de forma síncrona:
+el hilo de Tk quedaba bloqueado mientras sonaba el clip, en un juego de
+ritmo cuya ventana de acierto es de 20 px.
+
+``KeySounds`` separa ese camino del resto del audio:
+
+- ``preload`` resuelve al empezar la partida los archivos de cada tecla en
+  el índice de recursos y, en segundo plano, los deja decodificados en el
+  mezclador (``modules/mixer.py``) y buscados en la caché de WAV
+  (``modules/audio_cache.py``).
+- ``play`` no hace nada más que encolar el archivo en un ``AudioService``
+  propio, sin agrupar repeticiones (cada pulsación suena) y con un límite
+  de espera de ``SFX_MAX_LATENCY_MS``: el hilo de Tk nunca espera, y un
+  sonido que no puede empezar a tiempo se descarta.  Si ya suenan
+  ``SFX_MAX_VOICES`` sonidos, se corta el más antiguo: en un juego de ritmo
+  importa más la nota nueva que el final de la anterior.
+- La latencia se mide desde la pulsación (``pressed_at``) hasta que el
+  sonido empieza (el gancho ``on_start`` del servicio).  ``stats()`` y
+  ``summary()`` dan la mediana, el percentil 95 y el máximo de las últimas
+  ``SFX_LATENCY_SAMPLES`` pulsaciones.
+
+Uso::
+
+    sounds = KeySounds({"q": "assets/sounds/qwer_q", ...})
+    sounds.preload()
+    sounds.play("q", pressed_at=time.perf_counter())
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from modules.asset_manifest import AUDIO_EXTENSIONS, asset_manifest
+from modules.audio import AudioService, default_player
+from modules.audio_cache import audio_cache
+from modules.config import SFX_LATENCY_SAMPLES, SFX_MAX_LATENCY_MS, SFX_MAX_VOICES
+from modules.mixer import mixer
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class KeySounds:
+    """Sonidos asociados a teclas, precargados y lanzados sin bloquear el hilo de Tk."""
+
+    def __init__(self, folders: dict, max_latency_ms: float = SFX_MAX_LATENCY_MS,
+                 max_voices: int = SFX_MAX_VOICES, samples: int = SFX_LATENCY_SAMPLES, player=None):
+        self.folders = folders
+        self.files: dict = {}
+        self.service = AudioService(max_voices=max_voices, coalesce_ms=0, max_delay_ms=max_latency_ms,
+                                    player=player or default_player, on_start=self._record, steal=True)
+        self.latencies: deque = deque(maxlen=samples)
+        self.pressed = 0
+        self.preloaded = 0
+
+    def preload(self) -> None:
+        """
+        Resuelve los archivos de cada tecla (al momento) y los prepara en un
+        hilo para que la primera pulsación no tenga que decodificar.
+        """
+        self.files = {key: asset_manifest.files(folder, AUDIO_EXTENSIONS)
+                      for key, folder in self.folders.items()}
+        paths = [path for files in self.files.values() for path in files]
+        if not paths:
+            return
+
+        def _warm() -> None:
+            for path in paths:
+                audio_cache.lookup(path)
+            self.preloaded = mixer.preload(paths)
+
+        threading.Thread(target=_warm, name="precarga-sonidos", daemon=True).start()
+
+    def play(self, key: str, pressed_at: Optional[float] = None) -> bool:
+        """
+        Encola un sonido de ``key``.  ``pressed_at`` es el ``time.perf_counter()``
+        de la pulsación.  Devuelve ``False`` si la tecla no tiene sonidos o
+        la cola está llena.
+        """
+        self.pressed += 1
+        files = self.files.get(key)
+        if not files:
+            return False
+        return self.service.play_file(random.choice(files),
+                                      time.perf_counter() if pressed_at is None else pressed_at)
+
+    def _record(self, file_path: str, latency_ms: float) -> None:
+        self.latencies.append(latency_ms)
+
+    def stats(self) -> dict:
+        """Pulsaciones, sonidos lanzados y descartados y latencias en ms."""
+        latencies = list(self.latencies)
+        service = self.service.stats()
+        return {
+            "pressed": self.pressed,
+            "played": service["played"],
+            "late": service["stale"] + service["dropped"],
+            "cut": service["stolen"],
+            "preloaded": self.preloaded,
+            "p50_ms": round(_percentile(latencies, 0.5), 1) if latencies else None,
+            "p95_ms": round(_percentile(latencies, 0.95), 1) if latencies else None,
+            "max_ms": round(max(latencies), 1) if latencies else None,
+        }
+
+    def summary(self) -> Optional[str]:
+        """Línea de informe con las latencias, o ``None`` si no sonó nada."""
+        stats = self.stats()
+        if not stats["played"]:
+            return None
+        return (f"Sonidos de teclas: {stats['played']}/{stats['pressed']} pulsaciones, "
+                f"latencia p50 {stats['p50_ms']} ms, p95 {stats['p95_ms']} ms, "
+                f"máx. {stats['max_ms']} ms, {stats['late']} descartados por llegar tarde, "
+                f"{stats['cut']} cortados")
+
+    def close(self) -> None:
+        """Detiene el hilo de audio de los efectos."""
+        self.service.shutdown()
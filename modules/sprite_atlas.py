@@ -0,0 +1,186 @@
+"""
+Atlas de sprites de la mascota.
+
+En lugar de abrir y decodificar por separado cada GIF de ``assets/sprites``
+cada vez que Mini‑Diego cambia de estado, este módulo permite empaquetar
+todas las animaciones (ya reescaladas al tamaño de la mascota) en una sola
+imagen PNG más un índice JSON con la posición y la duración de cada
+fotograma::
+
+    python -m modules.sprite_atlas            # tamaño por defecto (PET_SIZE)
+    python -m modules.sprite_atlas --size 120
+
+El resultado se guarda en ``assets/atlas/sprites_<tamaño>.png`` y
+``assets/atlas/sprites_<tamaño>.json``.  ``PetOverlay`` carga el atlas una
+sola vez al arrancar y recorta de él los fotogramas, de modo que cambiar de
+estado no vuelve a tocar el sistema de archivos.
+
+El índice guarda la fecha de modificación y el tamaño de cada archivo de
+origen; los estados cuyo archivo haya cambiado desde que se generó el atlas
+se ignoran al cargarlo y se leen directamente del GIF hasta que se vuelva a
+ejecutar el empaquetador.
+"""
+
+import argparse
+import json
+import math
+import os
+
+from modules.config import BASE_DIR, PET_SIZE
+
+try:
+    from PIL import Image, ImageSequence  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+SPRITES_DIR = os.path.join(BASE_DIR, "assets", "sprites")
+ATLAS_DIR = os.path.join(BASE_DIR, "assets", "atlas")
+SPRITE_EXTENSIONS = (".png", ".gif", ".jpg", ".jpeg")
+ATLAS_VERSION = 1
+
+
+def _atlas_paths(size: int, atlas_dir: str = ATLAS_DIR) -> tuple:
+    base = os.path.join(atlas_dir, f"sprites_{size}")
+    return base + ".png", base + ".json"
+
+
+def _source_signature(path: str) -> list:
+    st = os.stat(path)
+    return [st.st_mtime_ns, st.st_size]
+
+
+def find_sprite_sources(sprites_dir: str = SPRITES_DIR) -> dict:
+    """
+    Devuelve ``{estado: ruta}`` con el archivo de cada estado presente en
+    ``sprites_dir``, respetando el mismo orden de preferencia de
+    extensiones que ``PetOverlay`` (PNG, GIF, JPG, JPEG).
+    """
+    sources: dict = {}
+    try:
+        names = sorted(os.listdir(sprites_dir))
+    except OSError:
+        return sources
+    for ext in SPRITE_EXTENSIONS:
+        for name in names:
+            state, file_ext = os.path.splitext(name)
+            if file_ext.lower() == ext and state not in sources:
+                sources[state] = os.path.join(sprites_dir, name)
+    return sources
+
+
+def build_atlas(size: int = PET_SIZE, sprites_dir: str = SPRITES_DIR, atlas_dir: str = ATLAS_DIR) -> dict:
+    """
+    Empaqueta todos los sprites de ``sprites_dir`` en un atlas de fotogramas
+    de ``size`` x ``size`` píxeles.  Devuelve el índice generado.
+    """
+    from modules.disk_cache import decode_frames
+
+    states: dict = {}
+    all_frames: list = []
+    for state, path in sorted(find_sprite_sources(sprites_dir).items()):
+        max_frames = None if path.lower().endswith(".gif") else 1
+        try:
+            frames, delays = decode_frames(path, (size, size), max_frames=max_frames)
+        except Exception as e:
+            print(f"Error leyendo {path}: {e}")
+            continue
+        if not frames:
+            continue
+        states[state] = {
+            "source": os.path.basename(path),
+            "signature": _source_signature(path),
+            "first": len(all_frames),
+            "delays": delays,
+        }
+        all_frames.extend(frames)
+
+    # Rejilla casi cuadrada: todos los fotogramas tienen el mismo tamaño
+    columns = max(1, math.ceil(math.sqrt(len(all_frames))))
+    rows = max(1, math.ceil(len(all_frames) / columns))
+    sheet = Image.new("RGBA", (columns * size, rows * size), (0, 0, 0, 0))
+    rects: list = []
+    for i, frame in enumerate(all_frames):
+        x, y = (i % columns) * size, (i // columns) * size
+        sheet.paste(frame, (x, y))
+        rects.append([x, y, size, size])
+
+    index = {"version": ATLAS_VERSION, "size": size, "states": {}}
+    for state, info in states.items():
+        first = info.pop("first")
+        info["frames"] = rects[first:first + len(info["delays"])]
+        index["states"][state] = info
+
+    png_path, json_path = _atlas_paths(size, atlas_dir)
+    os.makedirs(atlas_dir, exist_ok=True)
+    # Compresión mínima: el atlas se lee en cada arranque y prima la velocidad
+    sheet.save(png_path, compress_level=1)
+    with open(json_path, "w", encoding="utf-8") as fh:
+        json.dump(index, fh, indent=1)
+    return index
+
+
+class SpriteAtlas:
+    """Atlas ya cargado en memoria del que se recortan los fotogramas."""
+
+    def __init__(self, sheet, index: dict):
+        self.sheet = sheet
+        self.size = index["size"]
+        self.states: dict = index["states"]
+
+    @classmethod
+    def load(cls, size: int = PET_SIZE, sprites_dir: str = SPRITES_DIR, atlas_dir: str = ATLAS_DIR):
+        """
+        Carga el atlas del tamaño indicado, o devuelve ``None`` si no existe
+        o no se puede leer.  Los estados cuyo archivo de origen ha cambiado
+        (o ya no existe) se descartan del índice.
+        """
+        if not HAS_PIL:
+            return None
+        png_path, json_path = _atlas_paths(size, atlas_dir)
+        try:
+            with open(json_path, "r", encoding="utf-8") as fh:
+                index = json.load(fh)
+            if index.get("version") != ATLAS_VERSION or index.get("size") != size:
+                return None
+            sheet = Image.open(png_path)
+            sheet.load()
+        except Exception:
+            return None
+        fresh = {}
+        for state, info in index["states"].items():
+            try:
+                if _source_signature(os.path.join(sprites_dir, info["source"])) == info["signature"]:
+                    fresh[state] = info
+            except OSError:
+                pass
+        index["states"] = fresh
+        return cls(sheet, index)
+
+    def __contains__(self, state: str) -> bool:
+        return state in self.states
+
+    def discard(self, state: str) -> None:
+        """Deja de servir ``state`` desde el atlas (su archivo ha cambiado)."""
+        self.states.pop(state, None)
+
+    def frames(self, state: str) -> tuple:
+        """Devuelve ``(fotogramas, duraciones)`` de ``state`` recortados del atlas."""
+        info = self.states[state]
+        frames = [self.sheet.crop((x, y, x + w, y + h)) for x, y, w, h in info["frames"]]
+        return frames, list(info["delays"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Empaqueta los sprites de la mascota en un atlas.")
+    parser.add_argument("--size", type=int, default=PET_SIZE, help="lado en píxeles de cada fotograma")
+    parser.add_argument("--sprites", default=SPRITES_DIR, help="carpeta de sprites de origen")
+    parser.add_argument("--out", default=ATLAS_DIR, help="carpeta de salida del atlas")
+    args = parser.parse_args()
+    index = build_atlas(args.size, args.sprites, args.out)
+    total = sum(len(info["frames"]) for info in index["states"].values())
+    print(f"Atlas generado: {len(index['states'])} estados, {total} fotogramas -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Precarga en segundo plano de los sprites de los estados más probables.
+
+Los umbrales de ``MiniDiego._get_emotional_state`` son fijos, así que a
+partir de las estadísticas actuales se sabe a qué estados se puede pasar a
+continuación.  ``SpritePrefetcher`` decodifica en un hilo aparte los
+fotogramas PIL de esos estados; cuando la mascota cambia de verdad, en el
+hilo de Tk sólo queda envolverlos en ``PhotoImage`` (Tk no permite crear
+imágenes desde otros hilos).
+"""
+
+import queue
+import threading
+
+
+class SpritePrefetcher:
+    """
+    Hilo decodificador con cola de estados pendientes.
+
+    ``decode`` es una función ``estado -> (imagenes_pil, duraciones)`` que no
+    debe tocar Tk.  Los resultados se guardan hasta que alguien los recoge
+    con ``take``.
+    """
+
+    def __init__(self, decode, max_ready: int = 6):
+        self._decode = decode
+        self._max_ready = max_ready
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending: set = set()
+        self._ready: dict = {}
+        self.decoded = 0
+        self.used = 0
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    def request(self, states) -> None:
+        """Encola los estados que aún no están preparados ni pendientes."""
+        with self._lock:
+            for state in states:
+                if state in self._ready or state in self._pending:
+                    continue
+                self._pending.add(state)
+                self._queue.put(state)
+
+    def take(self, state: str):
+        """Devuelve y retira el resultado preparado de ``state``, o ``None``."""
+        with self._lock:
+            result = self._ready.pop(state, None)
+        if result is not None:
+            self.used += 1
+        return result
+
+    def is_pending(self, state: str) -> bool:
+        """Indica si ``state`` está en cola o decodificándose."""
+        with self._lock:
+            return state in self._pending
+
+    def discard(self, state: str) -> None:
+        """Olvida un resultado preparado (por ejemplo, si el archivo cambió)."""
+        with self._lock:
+            self._ready.pop(state, None)
+
+    def clear(self) -> None:
+        """Olvida todos los resultados preparados."""
+        with self._lock:
+            self._ready.clear()
+
+    def _worker(self) -> None:
+        while True:
+            state = self._queue.get()
+            try:
+                result = self._decode(state)
+            except Exception:
+                result = None
+            with self._lock:
+                self._pending.discard(state)
+                if result is not None and result[0]:
+                    # Limitar los resultados retenidos: se descartan los más
+                    # antiguos, que ya no son vecinos del estado actual.
+                    while len(self._ready) >= self._max_ready:
+                        self._ready.pop(next(iter(self._ready)))
+                    self._ready[state] = result
+                    self.decoded += 1
@@ -0,0 +1,113 @@
+"""
+Vigilancia de ``assets/sprites`` para recargar sprites en caliente.
+
+Para ver un GIF retocado había que reiniciar la aplicación entera.
+``SpriteWatcher`` comprueba periódicamente, desde el propio bucle de Tk
+con ``after()``, la fecha de modificación y el tamaño de los archivos de
+sprites.  Cuando alguno cambia, aparece o desaparece, avisa con la lista de
+estados afectados para que sólo se descarten y vuelvan a decodificar esos;
+el resto de estados siguen en memoria.
+
+Un archivo sólo se da por cambiado cuando su firma se mantiene igual entre
+dos comprobaciones seguidas, para no recargar un GIF que el editor aún está
+escribiendo.
+"""
+
+import os
+
+from modules.config import SPRITE_WATCH_INTERVAL_MS
+from modules.sprite_atlas import SPRITES_DIR, find_sprite_sources
+
+
+def _snapshot(sprites_dir: str) -> dict:
+    """Devuelve ``{estado: (ruta, mtime_ns, tamaño)}`` de los sprites actuales."""
+    snapshot = {}
+    for state, path in find_sprite_sources(sprites_dir).items():
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        snapshot[state] = (path, st.st_mtime_ns, st.st_size)
+    return snapshot
+
+
+class SpriteWatcher:
+    """
+    Sondeo periódico de la carpeta de sprites.
+
+    ``on_change`` recibe la lista de estados cuyo archivo ha cambiado, se ha
+    creado o se ha borrado.  Se llama siempre desde el hilo de Tk.
+    """
+
+    def __init__(self, widget, on_change, sprites_dir: str = SPRITES_DIR,
+                 interval_ms: int = SPRITE_WATCH_INTERVAL_MS):
+        self.widget = widget
+        self.on_change = on_change
+        self.sprites_dir = sprites_dir
+        self.interval_ms = interval_ms
+        self._known = _snapshot(sprites_dir)
+        self._settling: dict = {}
+        self._after_id = None
+        self.polls = 0
+        self.changes = 0
+
+    def start(self) -> None:
+        """Empieza a vigilar (no hace nada si ya estaba en marcha)."""
+        if self._after_id is None:
+            self._schedule()
+
+    def stop(self) -> None:
+        """Deja de vigilar."""
+        if self._after_id is not None:
+            try:
+                self.widget.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _schedule(self) -> None:
+        try:
+            self._after_id = self.widget.after(self.interval_ms, self._poll)
+        except Exception:
+            # La ventana ya no existe
+            self._after_id = None
+
+    def _poll(self) -> None:
+        self._after_id = None
+        self.polls += 1
+        try:
+            changed = self.check()
+            if changed:
+                self.changes += len(changed)
+                self.on_change(changed)
+        except Exception as e:
+            print(f"Error vigilando sprites: {e}")
+        self._schedule()
+
+    def check(self) -> list:
+        """
+        Compara la carpeta con la última comprobación y devuelve los estados
+        cuyo cambio ya se ha estabilizado.
+        """
+        current = _snapshot(self.sprites_dir)
+        changed = []
+        for state in set(current) | set(self._known) | set(self._settling):
+            signature = current.get(state)
+            if signature == self._known.get(state):
+                self._settling.pop(state, None)
+                continue
+            if state in self._settling and self._settling[state] == signature:
+                # Misma firma que en la comprobación anterior: escritura terminada
+                del self._settling[state]
+                if signature is None:
+                    self._known.pop(state, None)
+                else:
+                    self._known[state] = signature
+                changed.append(state)
+            else:
+                self._settling[state] = signature
+        return sorted(changed)
+
+    def stats(self) -> dict:
+        """Comprobaciones realizadas y estados recargados."""
+        return {"polls": self.polls, "changes": self.changes, "watched": len(self._known)}
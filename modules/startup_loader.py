@@ -0,0 +1,142 @@
+"""
+Carga inicial de recursos en paralelo.
+
+Al arrancar, ``PetOverlay`` decodificaba el primer sprite en el hilo de Tk
+antes de que la ventana respondiera, y el primer minijuego pagaba entero el
+reescalado de su fondo.  ``StartupLoader`` reparte ese trabajo (el atlas,
+los sprites de todos los estados y el fondo del primer minijuego) en un
+``ThreadPoolExecutor``: Pillow libera el GIL mientras decodifica y
+reescala, así que los hilos avanzan a la vez.
+
+Cada tarea tiene dos partes, igual que en ``modules/prewarm.py``:
+
+- ``decode()`` se ejecuta en un hilo del pool y no debe tocar Tk.
+- ``finish(resultado)`` crea los ``PhotoImage`` o muestra el sprite; Tk
+  sólo admite llamadas desde su propio hilo, así que los resultados se
+  dejan en una cola que el hilo de Tk vacía con ``after`` cada
+  ``STARTUP_POLL_MS``.
+
+Se mide y se muestra por consola la latencia hasta el primer fotograma de
+la mascota, contada desde que se creó el cargador, y el tiempo total de la
+carga inicial.
+"""
+
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from modules.config import STARTUP_LOADER_WORKERS, STARTUP_POLL_MS
+
+
+class StartupLoader:
+    """Tareas de arranque decodificadas en un pool y terminadas en el hilo de Tk."""
+
+    def __init__(self, widget, workers: int = STARTUP_LOADER_WORKERS,
+                 poll_ms: int = STARTUP_POLL_MS):
+        self.widget = widget
+        self.workers = workers
+        self.poll_ms = poll_ms
+        self.started_at = time.perf_counter()
+        self._tasks: list = []
+        self._results: queue.Queue = queue.Queue()
+        self._remaining = 0
+        self._first_frame_marked = False
+        # Métricas
+        self.first_frame_ms: float | None = None
+        self.total_ms: float | None = None
+        self.loaded = 0
+        self.failed = 0
+        self.max_decode_ms = 0.0
+
+    def add(self, name: str, decode, finish) -> None:
+        """Añade una tarea; se lanzan en el orden en que se añaden."""
+        self._tasks.append((name, decode, finish))
+
+    def start(self) -> None:
+        """Lanza todas las tareas añadidas hasta ahora."""
+        tasks, self._tasks = self._tasks, []
+        if not tasks:
+            return
+        self._remaining += len(tasks)
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="carga-inicial")
+        for name, decode, finish in tasks:
+            pool.submit(self._run, name, decode, finish)
+        # Los hilos terminan solos cuando se vacía la cola del pool
+        pool.shutdown(wait=False)
+        self._schedule()
+
+    @property
+    def done(self) -> bool:
+        return self._remaining == 0
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000.0
+
+    def _run(self, name: str, decode, finish) -> None:
+        start = time.perf_counter()
+        try:
+            result, error = decode(), None
+        except Exception as e:
+            result, error = None, e
+        self._results.put((name, finish, result, error, (time.perf_counter() - start) * 1000.0))
+
+    def _schedule(self) -> None:
+        try:
+            self.widget.after(self.poll_ms, self._drain)
+        except Exception:
+            # La ventana ya no existe
+            pass
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                name, finish, result, error, decode_ms = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._remaining -= 1
+            self.max_decode_ms = max(self.max_decode_ms, decode_ms)
+            if error is None:
+                try:
+                    finish(result)
+                    self.loaded += 1
+                    continue
+                except Exception as e:
+                    error = e
+            self.failed += 1
+            print(f"Carga inicial: error en {name}: {error}")
+        if self._remaining:
+            self._schedule()
+        elif self.total_ms is None:
+            self.total_ms = self.elapsed_ms()
+            print(f"Carga inicial: {self.loaded} recursos en {self.total_ms:.0f} ms "
+                  f"con {self.workers} hilos (decodificación más lenta: {self.max_decode_ms:.0f} ms)")
+
+    def mark_first_frame(self) -> None:
+        """
+        Registra el primer fotograma de la mascota.  Se llama justo después
+        de configurar el canvas; la medida se toma con ``after_idle``, que se
+        ejecuta tras el repintado pendiente.
+        """
+        if self._first_frame_marked:
+            return
+        self._first_frame_marked = True
+
+        def _measure() -> None:
+            self.first_frame_ms = self.elapsed_ms()
+            print(f"Primer fotograma de la mascota en {self.first_frame_ms:.0f} ms")
+
+        try:
+            self.widget.after_idle(_measure)
+        except Exception:
+            _measure()
+
+    def stats(self) -> dict:
+        """Recursos cargados, fallos, pendientes y latencias en ms."""
+        return {
+            "loaded": self.loaded,
+            "failed": self.failed,
+            "pending": self._remaining + len(self._tasks),
+            "first_frame_ms": round(self.first_frame_ms, 1) if self.first_frame_ms is not None else None,
+            "total_ms": round(self.total_ms, 1) if self.total_ms is not None else None,
+            "max_decode_ms": round(self.max_decode_ms, 1),
+        }
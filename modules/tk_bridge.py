@@ -0,0 +1,185 @@
+"""
+Paso de imágenes PIL a Tk.
+
+``ImageTk.PhotoImage`` hace todo el trabajo en el hilo de Tk: asegura que
+la imagen esté cargada, la convierte si hace falta y copia los píxeles a la
+foto.  Con los fondos de 700×500 a 800×600 de la ruleta, los minijuegos y
+la pantalla de victoria ese coste se paga justo al abrir la ventana.
+
+Este módulo separa la conversión en dos pasos:
+
+- ``prepare(imagen)`` no toca Tk y puede ejecutarse en otro hilo (el
+  precalentador o el cargador de arranque).  Si la imagen es opaca genera
+  un bloque PPM binario (cabecera ``P6`` + píxeles RGB); si tiene
+  transparencia, la deja como imagen PIL.
+- ``photo(preparada)`` crea la foto en el hilo de Tk: con el bloque PPM
+  basta ``put -format ppm``, que Tk lee de una sola pasada sin guardar una
+  copia del bloque (``-data`` la conservaría); con transparencia se usa
+  ``ImageTk.PhotoImage`` como siempre.
+- ``update(foto, preparada)`` sustituye los píxeles de una foto ya creada
+  sin cambiar su identidad: todos los canvas que la muestran se actualizan
+  solos (lo usa la carga progresiva de ``modules/backgrounds.py``).
+- ``blank`` y ``put_rows`` crean la foto de un bloque PPM por franjas de
+  filas, para repartir un fondo grande en varios trozos del precalentador
+  (``modules/prewarm.py``).
+
+``TK_BRIDGE_PPM`` en ``modules/config.py`` permite volver siempre a
+``ImageTk.PhotoImage``.  Para comparar ambos caminos en cada tamaño de
+fondo (necesita pantalla)::
+
+    python -m modules.tk_bridge --bench
+"""
+
+import argparse
+import time
+import tkinter as tk
+from typing import Optional
+
+from modules.config import (
+    MINIGAME_BACKGROUND_SIZES,
+    ROULETTE_BACKGROUND_SIZE,
+    TK_BRIDGE_PPM,
+    VICTORY_BACKGROUND_SIZE,
+)
+
+try:
+    from PIL import Image, ImageTk  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+
+class PreparedImage:
+    """
+    Píxeles listos para ``photo``: un bloque PPM (``data``) o, si la imagen
+    tiene transparencia, la imagen PIL (``image``).  Expone ``width()`` y
+    ``height()`` como las fotos de Tk, para que la caché estime su tamaño.
+    """
+
+    __slots__ = ("data", "image", "size")
+
+    def __init__(self, size: tuple, data: Optional[bytes] = None, image=None):
+        self.size = size
+        self.data = data
+        self.image = image
+
+    def width(self) -> int:
+        return self.size[0]
+
+    def height(self) -> int:
+        return self.size[1]
+
+
+def _is_opaque(img) -> bool:
+    if img.mode in ("RGB", "L"):
+        return True
+    if img.mode != "RGBA":
+        return False
+    return img.getchannel("A").getextrema() == (255, 255)
+
+
+def prepare(img, use_ppm: bool = TK_BRIDGE_PPM) -> PreparedImage:
+    """Prepara ``img`` para Tk sin tocar Tk (puede llamarse desde otro hilo)."""
+    if use_ppm and _is_opaque(img):
+        rgb = img if img.mode == "RGB" else img.convert("RGB")
+        header = b"P6 %d %d 255\n" % rgb.size
+        return PreparedImage(rgb.size, data=header + rgb.tobytes())
+    return PreparedImage(img.size, image=img)
+
+
+def photo(prepared: PreparedImage, master=None):
+    """Crea la foto de Tk de ``prepared``.  Debe llamarse desde el hilo de Tk."""
+    if prepared.data is not None:
+        result = tk.PhotoImage(master=master, width=prepared.width(), height=prepared.height())
+        result.tk.call(result.name, "put", prepared.data, "-format", "ppm")
+        return result
+    return ImageTk.PhotoImage(prepared.image, master=master)
+
+
+def update(photo_obj, prepared: PreparedImage) -> bool:
+    """
+    Copia ``prepared`` sobre ``photo_obj`` (del mismo tamaño, creada con
+    ``photo``).  Devuelve ``False`` si no son compatibles y no se ha hecho
+    nada.  Debe llamarse desde el hilo de Tk.
+    """
+    if prepared.data is not None and isinstance(photo_obj, tk.PhotoImage):
+        photo_obj.tk.call(photo_obj.name, "put", prepared.data, "-format", "ppm")
+        return True
+    if prepared.image is not None and HAS_PIL and isinstance(photo_obj, ImageTk.PhotoImage):
+        photo_obj.paste(prepared.image)
+        return True
+    return False
+
+
+def blank(prepared: PreparedImage, master=None):
+    """Foto vacía del tamaño de ``prepared``, para rellenarla con ``put_rows``."""
+    return tk.PhotoImage(master=master, width=prepared.width(), height=prepared.height())
+
+
+def put_rows(photo_obj, prepared: PreparedImage, top: int, bottom: int) -> None:
+    """
+    Copia las filas ``top`` a ``bottom`` (sin incluir) del bloque PPM de
+    ``prepared`` en ``photo_obj``.  Debe llamarse desde el hilo de Tk.
+    """
+    width = prepared.width()
+    offset = len(prepared.data) - width * prepared.height() * 3
+    strip = (b"P6 %d %d 255\n" % (width, bottom - top)
+             + prepared.data[offset + top * width * 3:offset + bottom * width * 3])
+    photo_obj.tk.call(photo_obj.name, "put", strip, "-format", "ppm", "-to", 0, top)
+
+
+def photo_image(img, master=None):
+    """``prepare`` + ``photo`` en un solo paso, en el hilo de Tk."""
+    return photo(prepare(img), master)
+
+
+def _best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def benchmark(repeat: int = 10) -> None:
+    """Compara ``ImageTk.PhotoImage`` con el bloque PPM en cada tamaño de fondo."""
+    sizes = sorted({*MINIGAME_BACKGROUND_SIZES, ROULETTE_BACKGROUND_SIZE,
+                    VICTORY_BACKGROUND_SIZE, (800, 600)})
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except Exception as e:
+        root = None
+        print(f"Tk no disponible ({e}): sólo se mide la preparación fuera del hilo de Tk")
+    print(f"{'tamaño':>9} {'preparar':>9} {'ImageTk':>9} {'PPM':>9} {'total PPM':>10}  (ms, mejor de {repeat})")
+    for width, height in sizes:
+        img = Image.effect_noise((width, height), 64).convert("RGBA")
+        prep_ms = _best_ms(lambda: prepare(img, use_ppm=True), repeat)
+        if root is None:
+            print(f"{width}x{height:<5} {prep_ms:9.2f}")
+            continue
+        prepared = prepare(img, use_ppm=True)
+        imagetk_ms = _best_ms(lambda: ImageTk.PhotoImage(img, master=root), repeat)
+        ppm_ms = _best_ms(lambda: photo(prepared, root), repeat)
+        print(f"{width}x{height:<5} {prep_ms:9.2f} {imagetk_ms:9.2f} {ppm_ms:9.2f} {prep_ms + ppm_ms:10.2f}")
+    if root is not None:
+        root.destroy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Paso de imágenes PIL a Tk.")
+    parser.add_argument("--bench", action="store_true", help="comparar con ImageTk.PhotoImage")
+    parser.add_argument("--repeat", type=int, default=10, help="repeticiones por medida")
+    args = parser.parse_args()
+    if not HAS_PIL:
+        print("Pillow no está instalado")
+        return
+    if args.bench:
+        benchmark(args.repeat)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
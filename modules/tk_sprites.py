@@ -0,0 +1,254 @@
+"""
+Carga de sprites con el lector nativo de Tk, sin Pillow.
+
+Tk sabe leer cada fotograma de un GIF con ``format="gif -index N"`` y
+cambiar su tamaño con ``zoom``/``subsample``.  Este módulo usa eso para
+cargar los sprites animados de la mascota cuando Pillow no está instalado
+(antes sólo se mostraba el primer fotograma, sin reescalar) o cuando se
+elige expresamente con ``SPRITE_DECODER = "tk"`` en ``modules/config.py``.
+
+Tk no expone la duración ni el método de borrado de cada fotograma, así
+que se leen directamente de las extensiones de control gráfico del GIF
+(``gif_frame_info``).  Cada ``-index N`` se dibuja sobre un lienzo
+transparente del tamaño lógico del GIF, lo que ya equivale al borrado
+"restaurar al fondo" que usan los sprites de ``assets/sprites``; para los
+fotogramas que se dibujan sobre el anterior ("no borrar") se superponen
+con ``copy -compositingrule overlay``.
+
+El tamaño se ajusta con la fracción ``zoom/subsample`` más próxima al
+tamaño pedido (denominador máximo ``MAX_SCALE_DENOMINATOR``), por vecino
+más próximo: es más rápido que LANCZOS pero menos suave al reducir.
+
+Todo se ejecuta en el hilo de Tk.  Para comparar con el camino de Pillow
+(en frío, sin caché en disco, y en caliente; necesita pantalla)::
+
+    python -m modules.tk_sprites --bench
+"""
+
+import argparse
+import struct
+import subprocess
+import sys
+import time
+import tkinter as tk
+from fractions import Fraction
+from typing import Optional
+
+from modules.asset_pack import open_asset
+from modules.config import PET_SIZE, SPRITE_DECODER
+
+# Duración que se usa cuando el GIF no la indica (igual que en disk_cache)
+DEFAULT_DELAY_MS = 100
+MAX_SCALE_DENOMINATOR = 8
+DECODERS = ("pil", "tk")
+
+
+def sprite_decoder(name: str = SPRITE_DECODER) -> str:
+    """
+    Decodificador efectivo: ``"pil"`` o ``"tk"``.  Con ``"auto"`` se usa
+    Pillow si está instalado; ``"pil"`` sin Pillow también acaba en ``"tk"``.
+    """
+    if name in ("auto", "pil"):
+        try:
+            import PIL  # type: ignore  # noqa: F401
+            return "pil"
+        except Exception:
+            return "tk"
+    return "tk"
+
+
+def _skip_sub_blocks(data: bytes, pos: int) -> int:
+    while pos < len(data):
+        length = data[pos]
+        pos += 1
+        if length == 0:
+            break
+        pos += length
+    return pos
+
+
+def gif_frame_info(data: bytes) -> list:
+    """
+    Lista ``[(duración_ms, borrado), ...]`` con un elemento por fotograma
+    del GIF ``data``.  ``borrado`` es el método de la extensión de control
+    gráfico (0‑1: dejar, 2: restaurar al fondo, 3: restaurar al anterior).
+    """
+    if data[:3] != b"GIF" or len(data) < 13:
+        raise ValueError("no es un GIF")
+    packed = data[10]
+    pos = 13
+    if packed & 0x80:
+        pos += 3 << ((packed & 7) + 1)
+    frames = []
+    delay, disposal = DEFAULT_DELAY_MS, 0
+    while pos < len(data):
+        block = data[pos]
+        if block == 0x21 and pos + 1 < len(data):
+            label = data[pos + 1]
+            if label == 0xF9 and pos + 7 < len(data):
+                flags = data[pos + 3]
+                centiseconds = struct.unpack_from("<H", data, pos + 4)[0]
+                disposal = (flags >> 2) & 7
+                delay = centiseconds * 10 or DEFAULT_DELAY_MS
+            pos = _skip_sub_blocks(data, pos + 2)
+        elif block == 0x2C:
+            if pos + 10 > len(data):
+                break
+            local = data[pos + 9]
+            pos += 10
+            if local & 0x80:
+                pos += 3 << ((local & 7) + 1)
+            # Tamaño mínimo del código LZW y datos de la imagen
+            pos = _skip_sub_blocks(data, pos + 1)
+            frames.append((delay, disposal))
+            delay, disposal = DEFAULT_DELAY_MS, 0
+        else:
+            # 0x3B (fin) o datos no válidos
+            break
+    return frames
+
+
+def scale_factors(source: int, target: int) -> tuple:
+    """``(zoom, subsample)`` enteros cuyo cociente más se acerca a ``target / source``."""
+    ratio = Fraction(int(target), int(source)).limit_denominator(MAX_SCALE_DENOMINATOR)
+    if ratio <= 0:
+        ratio = Fraction(1, MAX_SCALE_DENOMINATOR)
+    return ratio.numerator, ratio.denominator
+
+
+def _resize(photo, size: tuple):
+    zoom_x, sub_x = scale_factors(photo.width(), size[0])
+    zoom_y, sub_y = scale_factors(photo.height(), size[1])
+    if zoom_x != 1 or zoom_y != 1:
+        photo = photo.zoom(zoom_x, zoom_y)
+    if sub_x != 1 or sub_y != 1:
+        photo = photo.subsample(sub_x, sub_y)
+    return photo
+
+
+def _overlay(base, frame, master):
+    """Copia de ``base`` con ``frame`` superpuesto (respetando su transparencia)."""
+    result = tk.PhotoImage(master=master, width=base.width(), height=base.height())
+    result.tk.call(result, "copy", base)
+    result.tk.call(result, "copy", frame, "-compositingrule", "overlay")
+    return result
+
+
+def load_tk_frames(path: str, size: tuple, max_frames: Optional[int] = None, master=None):
+    """
+    Fotogramas ``tk.PhotoImage`` de ``path`` ajustados a ``size`` y sus
+    duraciones en ms.  Los GIF conservan todos sus fotogramas (hasta
+    ``max_frames``); PNG y el resto de formatos que entienda Tk, sólo uno.
+    Debe llamarse desde el hilo de Tk.
+    """
+    with open_asset(path) as fh:
+        data = fh.read()
+    if not path.lower().endswith(".gif"):
+        return [_resize(tk.PhotoImage(master=master, data=data), size)], [DEFAULT_DELAY_MS]
+    info = gif_frame_info(data)
+    if max_frames is not None:
+        info = info[:max_frames]
+    frames, delays = [], []
+    shown = previous_base = None
+    previous_disposal = 2
+    for index, (delay, disposal) in enumerate(info):
+        frame = tk.PhotoImage(master=master, data=data, format=f"gif -index {index}")
+        # Lienzo sobre el que se dibuja, según cómo se borró el anterior:
+        # el anterior tal cual, el que había antes de él, o vacío
+        if previous_disposal in (0, 1):
+            base = shown
+        elif previous_disposal == 3:
+            base = previous_base
+        else:
+            base = None
+        if base is not None:
+            frame = _overlay(base, frame, master)
+        previous_base, shown, previous_disposal = base, frame, disposal
+        frames.append(_resize(frame, size))
+        delays.append(delay)
+    return frames, delays
+
+
+def _best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def _pil_import_ms() -> Optional[float]:
+    """Tiempo de importar Pillow en un intérprete limpio."""
+    code = ("import time; t = time.perf_counter(); import PIL.Image, PIL.ImageTk; "
+            "print((time.perf_counter() - t) * 1000)")
+    try:
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        return float(out.stdout.strip())
+    except Exception:
+        return None
+
+
+def benchmark(repeat: int = 5) -> None:
+    """
+    Compara el lector de Tk con Pillow para cada sprite.  En frío: la
+    primera carga con Tk y la decodificación completa con Pillow (sin caché
+    en disco); en caliente: la mejor de ``repeat`` con Tk y la lectura de la
+    caché en disco con Pillow.  Todas incluyen crear las fotos de Tk.
+    """
+    import_ms = _pil_import_ms()
+    if import_ms is not None:
+        print(f"Importar Pillow: {import_ms:.1f} ms (sólo la primera vez)")
+    from PIL import ImageTk  # type: ignore
+    from modules.disk_cache import decode_frames, load_frames
+    from modules.sprite_atlas import find_sprite_sources
+
+    root = tk.Tk()
+    root.withdraw()
+    size = (PET_SIZE, PET_SIZE)
+    print(f"{'estado':<16} {'tk frío':>8} {'tk caliente':>12} {'pil frío':>9} {'pil caliente':>13}"
+          f"  (ms, mejor de {repeat})")
+    totals = [0.0] * 4
+    for state, path in find_sprite_sources().items():
+        max_frames = None if path.lower().endswith(".gif") else 1
+
+        def tk_load():
+            return load_tk_frames(path, size, max_frames, root)
+
+        def pil_cold():
+            images, _ = decode_frames(path, size, max_frames=max_frames)
+            return [ImageTk.PhotoImage(img, master=root) for img in images]
+
+        def pil_warm():
+            images, _ = load_frames(path, size, max_frames=max_frames)
+            return [ImageTk.PhotoImage(img, master=root) for img in images]
+
+        row = [_best_ms(tk_load, 1), _best_ms(tk_load, repeat),
+               _best_ms(pil_cold, repeat), (pil_warm(), _best_ms(pil_warm, repeat))[1]]
+        totals = [t + r for t, r in zip(totals, row)]
+        print(f"{state:<16} {row[0]:8.2f} {row[1]:12.2f} {row[2]:9.2f} {row[3]:13.2f}")
+    print(f"{'total':<16} {totals[0]:8.2f} {totals[1]:12.2f} {totals[2]:9.2f} {totals[3]:13.2f}")
+    root.destroy()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sprites con el lector nativo de Tk.")
+    parser.add_argument("--bench", action="store_true", help="comparar con Pillow")
+    parser.add_argument("--repeat", type=int, default=5, help="repeticiones por medida")
+    parser.add_argument("--info", metavar="GIF", help="mostrar duración y borrado de cada fotograma")
+    args = parser.parse_args()
+    if args.info:
+        with open(args.info, "rb") as fh:
+            for index, (delay, disposal) in enumerate(gif_frame_info(fh.read())):
+                print(f"{index:>3} {delay:>5} ms  borrado {disposal}")
+    elif args.bench:
+        try:
+            benchmark(args.repeat)
+        except tk.TclError as e:
+            print(f"Tk no disponible: {e}")
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Fundidos precalculados entre estados de la mascota.
+
+Mezclar dos sprites fotograma a fotograma en el hilo de Tk durante el
+cambio de estado sería demasiado caro, así que el cambio era instantáneo.
+``render_crossfade`` prepara de antemano (en el hilo del precargador) una
+secuencia corta de fotogramas que funde el estado de origen con el de
+destino mediante ``Image.blend``.  Durante la reproducción ``GifAnimator``
+sólo tiene que intercambiar imágenes ya compuestas, como con cualquier
+otra animación.
+"""
+
+from modules.config import TRANSITION_FRAMES, TRANSITION_FRAME_MS
+
+try:
+    from PIL import Image  # type: ignore
+    HAS_PIL = True
+except Exception:
+    HAS_PIL = False
+
+
+def render_crossfade(src_frames: list, dst_frames: list, steps: int = TRANSITION_FRAMES,
+                     frame_ms: int = TRANSITION_FRAME_MS) -> tuple:
+    """
+    Funde ``src_frames`` con ``dst_frames`` (imágenes PIL) en ``steps``
+    fotogramas intermedios.  Ambas animaciones siguen avanzando durante el
+    fundido.  Devuelve ``(fotogramas, duraciones)``, con listas vacías si
+    alguno de los dos estados no tiene imágenes.
+    """
+    if not src_frames or not dst_frames:
+        return [], []
+    size = dst_frames[0].size
+    frames = []
+    for i in range(steps):
+        src = src_frames[i % len(src_frames)].convert("RGBA")
+        dst = dst_frames[i % len(dst_frames)].convert("RGBA")
+        if src.size != size:
+            src = src.resize(size, Image.Resampling.LANCZOS)
+        if dst.size != size:
+            dst = dst.resize(size, Image.Resampling.LANCZOS)
+        frames.append(Image.blend(src, dst, (i + 1) / (steps + 1)))
+    return frames, [frame_ms] * len(frames)
@@ -0,0 +1,139 @@
+"""Pruebas de ``modules/mixer.py`` con las salidas sin dispositivo (``NullSink`` y ``WavSink``)."""
+
+import math
+import threading
+import time
+import wave
+from array import array
+
+from modules import mixer as mixer_module
+from modules.mixer import Mixer, NullSink, WavSink
+
+RATE = 8000
+BLOCK = 256
+
+
+def _write_wav(path, samples: list, rate: int = RATE) -> str:
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(array("h", samples).tobytes())
+    return str(path)
+
+
+def _sine(frames: int, period: int, amplitude: int) -> list:
+    return [int(amplitude * math.sin(2 * math.pi * i / period)) for i in range(frames)]
+
+
+def _read_wav(path) -> tuple:
+    with wave.open(str(path), "rb") as wav:
+        params = (wav.getnchannels(), wav.getsampwidth(), wav.getframerate())
+        return params, list(array("h", wav.readframes(wav.getnframes())))
+
+
+def _wait(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _mixer(sink) -> Mixer:
+    return Mixer(sink, sample_rate=RATE, channels=1, block_frames=BLOCK)
+
+
+def test_null_sink_renders_a_clip_to_the_end(tmp_path):
+    clip = _write_wav(tmp_path / "a.wav", _sine(1000, 40, 8000))
+    sink = NullSink(realtime=False)
+    mixer = _mixer(sink)
+    voice = mixer.play(clip)
+    assert voice is not None
+    assert _wait(lambda: voice.poll() == 0 and mixer.active == 0)
+    mixer.close()
+    # Se escribe en bloques enteros: 1000 fotogramas ocupan 4 bloques
+    assert sink.bytes_written == 4 * BLOCK * 2
+    stats = mixer.stats()
+    assert stats["played"] == 1
+    assert stats["decoded"] == 1
+    assert stats["clips"] == 1
+
+
+def test_wav_sink_writes_the_clip_and_pads_with_silence(tmp_path):
+    samples = _sine(1000, 40, 8000)
+    clip = _write_wav(tmp_path / "a.wav", samples)
+    out = tmp_path / "mezcla.wav"
+    mixer = _mixer(WavSink(str(out), realtime=False))
+    voice = mixer.play(clip)
+    assert _wait(lambda: voice.poll() == 0 and mixer.active == 0)
+    mixer.close()
+    params, mixed = _read_wav(out)
+    assert params == (1, 2, RATE)
+    assert mixed == samples + [0] * (4 * BLOCK - len(samples))
+
+
+def test_wav_sink_mixes_overlapping_voices_with_saturation(tmp_path):
+    first = _sine(3000, 50, 20000)
+    second = _sine(1500, 30, 20000)
+    paths = [_write_wav(tmp_path / "a.wav", first), _write_wav(tmp_path / "b.wav", second)]
+    out = tmp_path / "mezcla.wav"
+    mixer = _mixer(WavSink(str(out), realtime=False))
+    assert mixer.preload(paths) == 2
+    voices = [mixer.play(path) for path in paths]
+    assert _wait(lambda: all(v.poll() == 0 for v in voices) and mixer.active == 0)
+    mixer.close()
+    _, mixed = _read_wav(out)
+
+    def expected(offset: int) -> list:
+        total = max(len(first), offset + len(second))
+        total += -total % BLOCK
+        result = first + [0] * (total - len(first))
+        for i, value in enumerate(second):
+            result[offset + i] = max(-32768, min(32767, result[offset + i] + value))
+        return result
+
+    # La segunda voz entra en la mezcla al principio de algún bloque
+    offsets = [k * BLOCK for k in range(len(first) // BLOCK + 1) if expected(k * BLOCK) == mixed]
+    assert offsets, "la mezcla no es la suma de las dos voces"
+    assert 32767 in mixed and -32768 in mixed
+
+
+def test_play_decodes_off_the_calling_thread(tmp_path, monkeypatch):
+    samples = _sine(600, 40, 8000)
+    clip = _write_wav(tmp_path / "a.wav", samples)
+    decoding = threading.Event()
+    real_decode = mixer_module.decode_clip
+
+    def slow_decode(*args, **kwargs):
+        decoding.set()
+        time.sleep(0.3)
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(mixer_module, "decode_clip", slow_decode)
+    out = tmp_path / "mezcla.wav"
+    mixer = _mixer(WavSink(str(out), realtime=False))
+    start = time.perf_counter()
+    voice = mixer.play(clip)
+    assert time.perf_counter() - start < 0.1
+    assert voice.poll() is None
+    assert decoding.wait(1.0)
+    assert _wait(lambda: voice.poll() == 0 and mixer.active == 0)
+    mixer.close()
+    _, mixed = _read_wav(out)
+    assert mixed[:len(samples)] == samples
+
+
+def test_undecodable_clip_ends_silently_and_is_not_retried(tmp_path):
+    broken = tmp_path / "roto.wav"
+    broken.write_bytes(b"esto no es un WAV")
+    sink = NullSink(realtime=False)
+    mixer = _mixer(sink)
+    voice = mixer.play(str(broken))
+    assert voice is not None
+    assert _wait(lambda: voice.poll() == 0)
+    assert not mixer.accepts(str(broken))
+    assert mixer.play(str(broken)) is None
+    mixer.close()
+    assert sink.bytes_written == 0
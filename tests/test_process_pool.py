@@ -0,0 +1,94 @@
+"""Pruebas de ``modules/process_pool.py`` con el reproductor falso (sólo Linux)."""
+
+import signal
+import sys
+import time
+
+import pytest
+
+from modules import process_pool as pool_module
+from modules.process_pool import ProcessPool, _zombies, write_fake_player
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"),
+                                reason="el reproductor falso y /proc necesitan Linux")
+
+
+@pytest.fixture
+def player(tmp_path):
+    return write_fake_player(str(tmp_path))
+
+
+@pytest.fixture
+def pool():
+    pool = ProcessPool(max_processes=3, reap_interval_ms=20, default_timeout=30.0)
+    yield pool
+    pool.terminate_all(grace=0.5)
+
+
+def _wait(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_spawn_respects_the_concurrency_cap(pool, player):
+    processes = [pool.spawn([player, "30"]) for _ in range(4)]
+    assert all(p is not None for p in processes[:3])
+    assert processes[3] is None
+    assert pool.full
+    stats = pool.stats()
+    assert stats["live"] == 3
+    assert stats["max_live"] == 3
+    assert stats["spawned"] == 3
+    assert stats["rejected"] == 1
+
+
+def test_finished_players_are_reaped_in_the_background(pool, player):
+    processes = [pool.spawn([player, "0.1"]) for _ in range(3)]
+    assert _wait(lambda: pool.live == 0)
+    assert [p.poll() for p in processes] == [0, 0, 0]
+    assert pool.stats()["reaped"] == 3
+    assert _zombies() == 0
+
+
+def test_spawn_reaps_finished_players_when_full(player):
+    # Sin recogida en segundo plano en la práctica: sólo la de ``spawn``
+    pool = ProcessPool(max_processes=1, reap_interval_ms=60_000)
+    first = pool.spawn([player, "0"])
+    first.popen.wait()
+    assert not pool.full
+    assert pool.spawn([player, "0"]) is not None
+    assert pool.stats()["rejected"] == 0
+    pool.terminate_all(grace=0.5)
+
+
+def test_overlong_player_is_terminated(pool, player):
+    process = pool.spawn([player, "30"], timeout=0.2)
+    assert _wait(lambda: pool.live == 0)
+    assert process.popen.returncode == -signal.SIGTERM
+    assert pool.stats()["killed"] == 1
+
+
+def test_player_ignoring_sigterm_is_killed(pool, player, monkeypatch):
+    monkeypatch.setattr(pool_module, "KILL_GRACE_SECONDS", 0.2)
+    process = pool.spawn([player, "30", "--ignore-term"], timeout=0.5)
+    assert _wait(lambda: pool.live == 0)
+    assert process.popen.returncode == -signal.SIGKILL
+    assert pool.stats()["killed"] == 1
+
+
+def test_terminate_all_kills_what_ignores_sigterm(pool, player):
+    polite = pool.spawn([player, "30"])
+    stubborn = pool.spawn([player, "30", "--ignore-term"])
+    # Dar tiempo al reproductor a instalar el manejador de señales
+    time.sleep(0.5)
+    assert pool.terminate_all(grace=0.3) == 1
+    assert polite.popen.returncode == -signal.SIGTERM
+    assert stubborn.popen.returncode == -signal.SIGKILL
+    stats = pool.stats()
+    assert stats["live"] == 0
+    assert stats["reaped"] == 2
+    assert _zombies() == 0